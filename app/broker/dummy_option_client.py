@@ -1,61 +1,86 @@
-from typing import List
+import logging
+from dataclasses import asdict
+from typing import Dict, Final, Optional, Sequence, Tuple
+
+import orjson
+
 from app.core.config import settings
 from .option_client_base import OptionBrokerClient
 from .models import OptionPosition, UnderlyingPosition
 
+logger = logging.getLogger(__name__)
+
+# 演示环境不涉及期权：所有调用共享同一个不可变空序列
+_EMPTY_OPTION_POSITIONS: Final[Tuple[OptionPosition, ...]] = ()
+
+# 一些典型的科技股持仓，便于演示和测试（导入时构建一次；模型为 frozen，可安全共享）
+_DEMO_UNDERLYINGS: Final[Tuple[UnderlyingPosition, ...]] = (
+    UnderlyingPosition(
+        symbol="AAPL",
+        market="US",
+        quantity=100,
+        avg_price=150.50,
+        last_price=245.80,
+        currency="USD"
+    ),
+    UnderlyingPosition(
+        symbol="MSFT",
+        market="US",
+        quantity=50,
+        avg_price=280.00,
+        last_price=420.50,
+        currency="USD"
+    ),
+    UnderlyingPosition(
+        symbol="GOOGL",
+        market="US",
+        quantity=75,
+        avg_price=120.00,
+        last_price=175.30,
+        currency="USD"
+    ),
+    UnderlyingPosition(
+        symbol="NVDA",
+        market="US",
+        quantity=30,
+        avg_price=450.00,
+        last_price=880.75,
+        currency="USD"
+    ),
+    UnderlyingPosition(
+        symbol="TSLA",
+        market="US",
+        quantity=40,
+        avg_price=200.00,
+        last_price=342.80,
+        currency="USD"
+    ),
+)
+
+# 演示持仓的 JSON 序列化结果同样恒定：导入时生成一次，接口直接返回字节
+_DEMO_UNDERLYINGS_JSON: Final[bytes] = orjson.dumps([asdict(p) for p in _DEMO_UNDERLYINGS])
+
 
 class DummyOptionClient(OptionBrokerClient):
     """模拟实现：返回示例持仓数据，适用于未配置 Tiger API 的场景"""
 
-    async def list_underlying_positions(self, account_id: str) -> List[UnderlyingPosition]:
-        """返回模拟的股票持仓数据"""
-        # 返回一些典型的科技股持仓，便于演示和测试
-        return [
-            UnderlyingPosition(
-                symbol="AAPL",
-                market="US",
-                quantity=100,
-                avg_price=150.50,
-                last_price=245.80,
-                currency="USD"
-            ),
-            UnderlyingPosition(
-                symbol="MSFT",
-                market="US",
-                quantity=50,
-                avg_price=280.00,
-                last_price=420.50,
-                currency="USD"
-            ),
-            UnderlyingPosition(
-                symbol="GOOGL",
-                market="US",
-                quantity=75,
-                avg_price=120.00,
-                last_price=175.30,
-                currency="USD"
-            ),
-            UnderlyingPosition(
-                symbol="NVDA",
-                market="US",
-                quantity=30,
-                avg_price=450.00,
-                last_price=880.75,
-                currency="USD"
-            ),
-            UnderlyingPosition(
-                symbol="TSLA",
-                market="US",
-                quantity=40,
-                avg_price=200.00,
-                last_price=342.80,
-                currency="USD"
-            )
-        ]
-
-    async def list_option_positions(self, account_id: str) -> List[OptionPosition]:
-        """返回空的期权持仓列表（演示环境不涉及期权）"""
-        return []
+    async def list_underlying_positions(self, account_id: str) -> Sequence[UnderlyingPosition]:
+        """返回模拟的股票持仓数据（模块级常量，调用间共享）"""
+        return _DEMO_UNDERLYINGS
+
+    def underlying_positions_json(self) -> bytes:
+        """返回预序列化的演示股票持仓（JSON 字节，供接口快速路径使用）"""
+        return _DEMO_UNDERLYINGS_JSON
+
+    async def list_option_positions(self, account_id: str) -> Sequence[OptionPosition]:
+        """返回空的期权持仓（演示环境不涉及期权）"""
+        return _EMPTY_OPTION_POSITIONS
+
+    async def snapshot(
+        self, account_id: str
+    ) -> Tuple[Sequence[UnderlyingPosition], Sequence[OptionPosition], Optional[float]]:
+        """返回模拟的 (股票持仓, 期权持仓, 账户权益)"""
+        return _DEMO_UNDERLYINGS, _EMPTY_OPTION_POSITIONS, await self.get_account_equity(account_id)
 
     async def get_account_id(self) -> str:
         """返回配置的账户ID或默认ID"""
@@ -69,7 +94,7 @@ class DummyOptionClient(OptionBrokerClient):
         """模拟下单"""
         from uuid import uuid4
         order_id = f"DUMMY_{uuid4()}"
-        print(f"[DummyBroker] Received order: {order_params}")
+        logger.info("Received order: %s", order_params)
         return {
             "success": True,
             "order_id": order_id,
@@ -78,7 +103,9 @@ class DummyOptionClient(OptionBrokerClient):
             "message": "Order simulated successfully (Dummy mode)"
         }
 
-    async def get_order_status(self, account_id: str, order_id: str) -> dict:
+    async def get_order_status(
+        self, account_id: str, order_id: str, since_ts: Optional[int] = None
+    ) -> dict:
         """模拟获取订单状态"""
         return {
             "status": "FILLED",
@@ -87,3 +114,12 @@ class DummyOptionClient(OptionBrokerClient):
             "message": "Simulation fill"
         }
 
+    async def get_order_status_map(
+        self, account_id: str, since_ts: Optional[int] = None
+    ) -> Dict[str, dict]:
+        """模拟环境没有订单簿，返回空映射（调用方回退到逐笔查询）"""
+        return {}
+
+    async def close(self) -> None:
+        """模拟客户端无需释放资源"""
+        return None
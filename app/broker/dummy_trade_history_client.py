@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, List
 
 from .trade_history_client_base import TradeHistoryClient
 from .history_models import TradeRecord, DailyPnlRecord
@@ -19,6 +19,15 @@ class DummyTradeHistoryClient(TradeHistoryClient):
     ) -> List[TradeRecord]:
         return []
 
+    async def list_trades_stream(
+        self,
+        account_id: str,
+        start: datetime,
+        end: datetime,
+    ) -> AsyncIterator[TradeRecord]:
+        return
+        yield
+
     async def list_daily_pnl(
         self,
         account_id: str,
@@ -1,11 +1,18 @@
+import logging
+from contextlib import AsyncExitStack
+
 from app.core.config import settings
 from .option_client_base import OptionBrokerClient
 from .dummy_option_client import DummyOptionClient
 from .tiger_option_client import TigerOptionClient
 
+logger = logging.getLogger(__name__)
+
 # ---------- Singleton cache ----------
 _broker_instance: OptionBrokerClient | None = None
 _tiger_instance: TigerOptionClient | None = None
+# 登记已创建客户端的 close()，应用关闭时统一释放
+_exit_stack = AsyncExitStack()
 
 
 def make_option_broker_client() -> OptionBrokerClient:
@@ -19,16 +26,17 @@ def make_option_broker_client() -> OptionBrokerClient:
         return _broker_instance
 
     if settings.TIGER_PRIVATE_KEY_PATH and settings.TIGER_ID:
-        print(f"[BrokerFactory] Creating TigerOptionClient singleton (account={settings.TIGER_ACCOUNT})")
+        logger.info("Creating TigerOptionClient singleton (account=%s)", settings.TIGER_ACCOUNT)
         _broker_instance = TigerOptionClient(
             private_key_path=settings.TIGER_PRIVATE_KEY_PATH,
             tiger_id=settings.TIGER_ID,
             account=settings.TIGER_ACCOUNT,
         )
     else:
-        print("[BrokerFactory] No Tiger API config found, using DummyOptionClient")
+        logger.info("No Tiger API config found, using DummyOptionClient")
         _broker_instance = DummyOptionClient()
 
+    _exit_stack.push_async_callback(_broker_instance.close)
     return _broker_instance
 
 
@@ -49,5 +57,15 @@ def get_tiger_client() -> TigerOptionClient | None:
                 tiger_id=settings.TIGER_ID,
                 account=settings.TIGER_ACCOUNT,
             )
+            _exit_stack.push_async_callback(_tiger_instance.close)
         return _tiger_instance
     return None
+
+
+async def close_broker_clients() -> None:
+    """关闭所有已创建的券商客户端并重置单例（在应用 lifespan 关闭阶段调用）。"""
+    global _broker_instance, _tiger_instance, _exit_stack
+    await _exit_stack.aclose()
+    _exit_stack = AsyncExitStack()
+    _broker_instance = None
+    _tiger_instance = None
@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Literal
+from typing import TYPE_CHECKING, Optional, Literal, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 TradeSide = Literal["BUY", "SELL"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeRecord:
     """单笔成交记录（从老虎历史成交或对账单中抽象出来）"""
     symbol: str
@@ -18,7 +21,7 @@ class TradeRecord:
     order_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DailyPnlRecord:
     """可选：用于日度行为和风险分析的 PnL 汇总"""
     symbol: str
@@ -26,3 +29,43 @@ class DailyPnlRecord:
     realized_pnl: float
     unrealized_pnl: float
     net_pnl: float
+
+
+def _require_pyarrow():
+    """按需导入 pyarrow（可选依赖，仅列式导出时需要）"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError("pyarrow package not installed, run: pip install pyarrow") from e
+    return pa
+
+
+def trades_to_arrow(trades: Sequence[TradeRecord]) -> "pa.RecordBatch":
+    """将成交记录列表转换为 Arrow RecordBatch（按列连续存储）
+
+    大批量回测成交可直接交给 Arrow/Parquet 处理，避免逐对象序列化。
+    """
+    pa = _require_pyarrow()
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([t.symbol for t in trades], type=pa.string()),
+            pa.array([t.side for t in trades], type=pa.string()),
+            pa.array([t.quantity for t in trades], type=pa.float64()),
+            pa.array([t.price for t in trades], type=pa.float64()),
+            pa.array([t.timestamp for t in trades], type=pa.timestamp("us")),
+            pa.array([t.realized_pnl for t in trades], type=pa.float64()),
+            pa.array([t.order_id for t in trades], type=pa.string()),
+        ],
+        names=["symbol", "side", "quantity", "price", "timestamp", "realized_pnl", "order_id"],
+    )
+
+
+def write_trades_parquet(trades: Sequence[TradeRecord], path: str) -> None:
+    """将成交记录写入 Parquet 文件（snappy 压缩）
+
+    下游分析可用 pyarrow.parquet.read_table(path, columns=[...]) 只读取所需列。
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(pa.Table.from_batches([trades_to_arrow(trades)]), path, compression="snappy")
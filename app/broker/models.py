@@ -1,9 +1,15 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Greeks:
     delta: float
     gamma: float
@@ -11,7 +17,7 @@ class Greeks:
     theta: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OptionContract:
     """单个期权合约的静态信息"""
     broker_symbol: str          # 券商内部合约代码 / contract_id
@@ -24,7 +30,7 @@ class OptionContract:
     currency: str               # "USD" / "HKD" 等
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OptionPosition:
     """账户当前持有的某个期权合约仓位"""
     contract: OptionContract
@@ -50,7 +56,7 @@ class OptionPosition:
         return (self.last_price / self.avg_price - 1) * 100
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnderlyingPosition:
     """标的股票 / ETF 仓位（用于合并期权 Delta）"""
     symbol: str                 # META / TSLA / 1810.HK
@@ -74,3 +80,110 @@ class UnderlyingPosition:
         if self.avg_price == 0:
             return 0.0
         return (self.last_price / self.avg_price - 1) * 100
+
+
+def positions_to_arrays(
+    positions: Sequence[OptionPosition], dtype=None
+) -> Dict[str, np.ndarray]:
+    """将期权仓位列表（AoS）转换为按字段连续存储的数组（SoA），便于向量化聚合
+
+    dtype 默认 np.float64；超大规模组合可传入 np.float32 以减半内存带宽（Greeks 汇总精度足够）。
+    numpy 在调用时才导入，只使用仓位数据类的模块不承担其导入开销。
+
+    Returns:
+        {"quantity", "multiplier", "delta", "gamma", "vega", "theta", "underlying_price"} -> ndarray
+    """
+    import numpy as np
+
+    if dtype is None:
+        dtype = np.float64
+    n = len(positions)
+    arrays = {
+        name: np.empty(n, dtype=dtype)
+        for name in ("quantity", "multiplier", "delta", "gamma", "vega", "theta", "underlying_price")
+    }
+    quantity = arrays["quantity"]
+    multiplier = arrays["multiplier"]
+    delta = arrays["delta"]
+    gamma = arrays["gamma"]
+    vega = arrays["vega"]
+    theta = arrays["theta"]
+    underlying_price = arrays["underlying_price"]
+    for i, pos in enumerate(positions):
+        g = pos.greeks
+        quantity[i] = pos.quantity
+        multiplier[i] = pos.contract.multiplier
+        delta[i] = g.delta
+        gamma[i] = g.gamma
+        vega[i] = g.vega
+        theta[i] = g.theta
+        underlying_price[i] = pos.underlying_price
+    return arrays
+
+
+def _portfolio_greeks_loop(quantity, multiplier, delta, gamma, vega, theta, underlying_price):
+    """单次遍历累加组合 Greeks（供 numba 编译为 SIMD 归约）"""
+    d = 0.0
+    g = 0.0
+    v = 0.0
+    t = 0.0
+    for i in range(quantity.shape[0]):
+        q = quantity[i] * multiplier[i]
+        abs_q = abs(q)
+        s = underlying_price[i]
+        d += delta[i] * q * s
+        g += gamma[i] * abs_q * s * s
+        v += vega[i] * abs_q
+        t += theta[i] * abs_q
+    return d, g, v, t
+
+
+def _portfolio_greeks_numpy(quantity, multiplier, delta, gamma, vega, theta, underlying_price):
+    """未安装 numba 时的向量化实现"""
+    import numpy as np
+
+    q = quantity * multiplier
+    abs_q = np.abs(q)
+    return (
+        float(np.dot(delta * q, underlying_price)),
+        float(np.dot(gamma * abs_q, underlying_price * underlying_price)),
+        float(np.dot(vega, abs_q)),
+        float(np.dot(theta, abs_q)),
+    )
+
+
+@lru_cache(maxsize=None)
+def _portfolio_greeks_kernel():
+    """首次调用时选择聚合实现：安装了 numba 时 JIT 编译单次遍历归约，否则使用 numpy 实现"""
+    try:
+        from numba import njit
+    except ImportError:
+        return _portfolio_greeks_numpy
+    return njit(fastmath=True, cache=True)(_portfolio_greeks_loop)
+
+
+def portfolio_greeks(
+    quantity: np.ndarray,
+    multiplier: np.ndarray,
+    delta: np.ndarray,
+    gamma: np.ndarray,
+    vega: np.ndarray,
+    theta: np.ndarray,
+    underlying_price: np.ndarray,
+) -> Tuple[float, float, float, float]:
+    """汇总整个期权组合的美元 Greeks，参数与 positions_to_arrays 的返回值一一对应
+
+    口径与 OptionExposureService 一致：
+    - Delta：delta * qty * multiplier * S（多头正、空头负）
+    - Gamma：gamma * |qty| * multiplier * S^2
+    - Vega / Theta：greek * |qty| * multiplier
+
+    安装了 numba 时使用 JIT 编译的单次遍历归约（编译在首次调用时进行，cache=True
+    使编译结果落盘复用），否则退回 numpy 实现。
+    用法：d, g, v, t = portfolio_greeks(**positions_to_arrays(positions))
+
+    Returns:
+        (delta_notional_usd, gamma_usd, vega_usd, theta_usd)
+    """
+    d, g, v, t = _portfolio_greeks_kernel()(quantity, multiplier, delta, gamma, vega, theta, underlying_price)
+    return float(d), float(g), float(v), float(t)
@@ -1,18 +1,24 @@
-from typing import List, Protocol
+from typing import Dict, Optional, Protocol, Sequence, Tuple
 from .models import OptionPosition, UnderlyingPosition
 
 
 class OptionBrokerClient(Protocol):
     """期权敞口数据的统一接口（面向 OptionExposureService）"""
 
-    async def list_underlying_positions(self, account_id: str) -> List[UnderlyingPosition]:
+    async def list_underlying_positions(self, account_id: str) -> Sequence[UnderlyingPosition]:
         """列出当前股票/ETF 仓位，用于合并现货 Delta"""
         ...
 
-    async def list_option_positions(self, account_id: str) -> List[OptionPosition]:
+    async def list_option_positions(self, account_id: str) -> Sequence[OptionPosition]:
         """列出当前期权仓位（含 Greeks），US/HK 通用"""
         ...
 
+    async def snapshot(
+        self, account_id: str
+    ) -> Tuple[Sequence[UnderlyingPosition], Sequence[OptionPosition], Optional[float]]:
+        """一次性获取 (股票持仓, 期权持仓, 账户权益)，实现方应并发发起三项请求"""
+        ...
+
     async def get_account_id(self) -> str:
         """获取真实的券商账户ID"""
         ...
@@ -39,8 +45,13 @@ class OptionBrokerClient(Protocol):
         """
         ...
 
-    async def get_order_status(self, account_id: str, order_id: str) -> dict:
+    async def get_order_status(
+        self, account_id: str, order_id: str, since_ts: Optional[int] = None
+    ) -> dict:
         """获取订单状态
+
+        Args:
+            since_ts: 可选，订单提交时间下界（毫秒时间戳），用于缩小查询范围
         
         Returns:
             {
@@ -52,3 +63,12 @@ class OptionBrokerClient(Protocol):
         """
         ...
 
+    async def get_order_status_map(
+        self, account_id: str, since_ts: Optional[int] = None
+    ) -> Dict[str, dict]:
+        """一次性获取最近订单状态 {order_id: get_order_status 同结构的字典}，用于批量同步"""
+        ...
+
+    async def close(self) -> None:
+        """释放客户端持有的资源（应用关闭时调用）"""
+        ...
@@ -1,15 +1,15 @@
-from typing import List, Dict
+from typing import Any, Awaitable, Callable, Coroutine, List, Dict, NamedTuple, Optional, Set, Tuple
 from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
 from datetime import datetime, date
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
-
-from tigeropen.tiger_open_config import get_client_config
-from tigeropen.trade.trade_client import TradeClient
-from tigeropen.quote.quote_client import QuoteClient
-from tigeropen.common.consts import SecurityType, Market, OrderStatus
-from tigeropen.trade.domain.order import Order
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from functools import lru_cache
 
 from .option_client_base import OptionBrokerClient
 from .models import OptionPosition, UnderlyingPosition, OptionContract, Greeks
@@ -17,6 +17,332 @@ from app.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# 期权合约字段一次性批量读取（模块加载时编译）
+_CONTRACT_ATTRS = operator.attrgetter('underlying', 'right', 'strike', 'expiry', 'multiplier', 'currency')
+
+
+def _contract_fields(contract_obj, symbol: str) -> tuple:
+    """读取期权合约字段，返回 (underlying, right, strike, expiry, multiplier, currency)
+
+    常见情况下一次 attrgetter 即可取全；SDK 对象缺字段时才逐个回退到默认值。
+    """
+    try:
+        return _CONTRACT_ATTRS(contract_obj)
+    except AttributeError:
+        return (
+            getattr(contract_obj, 'underlying', symbol.split()[0] if ' ' in symbol else symbol),
+            getattr(contract_obj, 'right', 'CALL'),
+            getattr(contract_obj, 'strike', 0),
+            getattr(contract_obj, 'expiry', None),
+            getattr(contract_obj, 'multiplier', 100),
+            getattr(contract_obj, 'currency', 'USD'),
+        )
+
+
+# 期权行情 brief 上的 Greeks 字段一次性批量读取
+_BRIEF_FIELDS = ('delta', 'gamma', 'vega', 'theta', 'underlying_price', 'latest_price')
+_BRIEF_GETTER = operator.attrgetter(*_BRIEF_FIELDS)
+
+
+def _extract_greeks(brief, default_last_price) -> Tuple[Greeks, float, float]:
+    """读取 brief 的 Greeks、标的价格和最新价
+
+    常见情况下一次 attrgetter 取全；缺字段时才逐个回退（Greeks/标的价格为 0，
+    最新价为 default_last_price）。
+    """
+    try:
+        delta, gamma, vega, theta, underlying_price, last_price = _BRIEF_GETTER(brief)
+    except AttributeError:
+        delta, gamma, vega, theta, underlying_price = (getattr(brief, name, 0) for name in _BRIEF_FIELDS[:5])
+        last_price = getattr(brief, 'latest_price', default_last_price)
+    greeks = Greeks(delta=float(delta), gamma=float(gamma), vega=float(vega), theta=float(theta))
+    return greeks, float(underlying_price), float(last_price)
+
+
+# brief 上标识合约的字段（按优先级）
+_BRIEF_KEYS = ('identifier', 'symbol')
+
+
+def _index_option_briefs(briefs) -> Dict[str, object]:
+    """把一个批次的 get_option_briefs 结果整理为 {合约标识: brief}
+
+    tigeropen 返回 DataFrame，每行转为具名元组（字段名即列名，可直接交给 _extract_greeks）；
+    测试替身 / 旧版 SDK 可能返回对象列表。
+    """
+    if briefs is None:
+        return {}
+    if hasattr(briefs, 'columns'):
+        # DataFrame：键字段从列名判断（briefs[0] 在 DataFrame 上是取列，不能用来探测）
+        columns = briefs.columns
+        key = next((k for k in _BRIEF_KEYS if k in columns), None)
+        if briefs.empty or key is None:
+            return {}
+        getter = operator.attrgetter(key)
+        return {
+            ident: row
+            for row in briefs.itertuples(index=False)
+            if isinstance(ident := getter(row), str) and ident
+        }
+    if not briefs:
+        return {}
+    # 对象序列：同一批次的 brief 结构一致，只探测第一个元素的键字段
+    first = briefs[0]
+    key = next((k for k in _BRIEF_KEYS if hasattr(first, k)), _BRIEF_KEYS[-1])
+    return {getattr(b, key): b for b in briefs if getattr(b, key, None)}
+
+
+# 合约上可能携带最小价格增量的字段（按优先级），取不到时使用默认 tick
+_TICK_ATTRS = ('tick_size', 'min_price_increment', 'min_tick', 'price_tick')
+_DEFAULT_TICK = 0.01
+_QUANT_ONE = Decimal('1')
+_DECIMAL_ZERO = Decimal('0')
+
+
+class _Uncached(NamedTuple):
+    """loader 的降级结果：照常返回给调用方，但不写入任何缓存层（如港股请求失败时只有美股持仓）"""
+    value: Any
+
+
+class _ContractInfo(NamedTuple):
+    """下单用的合约缓存条目：get_contracts 结果及预先解析好的 tick"""
+    contracts: Any
+    tick: float
+    d_tick: Decimal
+
+
+def _contract_info(contracts: Any) -> _ContractInfo:
+    """解析合约的最小价格增量（每个合约只做一次）"""
+    tick = None
+    for attr in _TICK_ATTRS:
+        if hasattr(contracts[0], attr):
+            tick = getattr(contracts[0], attr)
+            break
+    try:
+        tick = float(tick) if tick else _DEFAULT_TICK
+    except (TypeError, ValueError):
+        tick = _DEFAULT_TICK
+    return _ContractInfo(contracts, tick, Decimal(str(tick)))
+
+
+@lru_cache(maxsize=None)
+def _order_status_map() -> Dict[Any, str]:
+    """Tiger OrderStatus -> 内部通用状态（首次使用时构建，避免模块导入时加载 SDK）
+
+    Tiger OrderStatus: PENDING_NEW, NEW, PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED, EXPIRED, INACTIVE
+    """
+    from tigeropen.common.consts import OrderStatus
+
+    return {
+        OrderStatus.FILLED: "FILLED",
+        OrderStatus.CANCELLED: "CANCELLED",
+        OrderStatus.REJECTED: "REJECTED",
+        OrderStatus.EXPIRED: "CANCELLED",
+        OrderStatus.PARTIALLY_FILLED: "EXECUTING",
+        OrderStatus.NEW: "PENDING",
+        OrderStatus.PENDING_NEW: "PENDING",
+    }
+
+
+def _order_status_payload(order: Any) -> Dict[str, Any]:
+    """Tiger Order -> 内部通用订单状态字典"""
+    status = order.status
+
+    # 映射 Tiger 状态到内部通用状态
+    internal_status = _order_status_map().get(status, "EXECUTING")
+
+    # 获取原因消息（如资金不足）
+    reason = getattr(order, 'reason', '')
+    if not reason and hasattr(order, 'status_msg') and order.status_msg:
+        reason = order.status_msg
+    if not reason and hasattr(order, 'attr_desc') and order.attr_desc:
+        reason = order.attr_desc
+
+    # 如果是撤单状态，补充一个描述
+    if internal_status == "CANCELLED" and not reason:
+        reason = "订单已被系统或用户撤销"
+    elif internal_status == "REJECTED" and not reason:
+        reason = "订单被券商拒绝"
+
+    return {
+        "status": internal_status,
+        "filled_quantity": float(getattr(order, 'filled_quantity', 0)),
+        "avg_fill_price": float(getattr(order, 'avg_fill_price', 0)),
+        "message": reason or (status.name if hasattr(status, 'name') else str(status))
+    }
+
+
+# 价格已是 tick 整数倍的判定容差（以 tick 为单位）
+_TICK_EPSILON = 1e-9
+
+
+def _align_to_tick(price: float, info: _ContractInfo, buy: bool) -> float:
+    """将限价对齐到 tick 整数倍：买单向下取整，卖单向上取整，避免被拒绝
+
+    调用方通常已按 tick 报价，先在 float 空间判断，已对齐时直接返回原价；
+    只有确实需要取整时才走 Decimal 精确计算。
+    """
+    steps = price / info.tick
+    nearest = round(steps)
+    if nearest >= 1 and abs(steps - nearest) < _TICK_EPSILON:
+        return float(price)
+
+    d_tick = info.d_tick
+    rounding = ROUND_FLOOR if buy else ROUND_CEILING
+    aligned = (Decimal(str(price)) / d_tick).quantize(_QUANT_ONE, rounding=rounding) * d_tick
+    # 防止对齐后为 0
+    if aligned <= _DECIMAL_ZERO:
+        aligned = d_tick
+    return float(aligned)
+
+
+# summary.net_liquidation 缺失时依次尝试的资产字段
+_EQUITY_ATTRS = ('net_liquidation', 'equity_with_loan', 'total_cash_balance')
+
+
+def _valid_equity(value: Any) -> Optional[float]:
+    """资产字段转为 float；缺失、为 0 或非有限值（Tiger API 可能返回 inf）时返回 None"""
+    if not value:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+# 港股简况中可作为名称的字段，按优先级排列（中文名称优先）
+_HK_NAME_COLUMNS = ('nameCN', 'name_cn', 'localSymbol', 'name')
+
+# API 查不到名称的港股（退市/不支持）在缓存中的占位值，短期内不再重复请求
+_HK_NAME_MISSING = "__NONE__"
+_HK_NAME_MISSING_TTL = 3600
+
+# 无行情数据时的默认 Greeks（frozen，可在所有持仓间共享同一实例）
+_ZERO_GREEKS = Greeks(delta=0, gamma=0, vega=0, theta=0)
+
+
+@lru_cache(maxsize=1024)
+def _parse_expiry(raw_expiry: str) -> date:
+    """解析 'YYYY-MM-DD' 到期日；同一期权链大量合约共享到期日，每个字符串只解析一次"""
+    return datetime.strptime(raw_expiry, '%Y-%m-%d').date()
+
+
+def _encode_underlyings(positions: List[UnderlyingPosition]) -> list:
+    return [asdict(p) for p in positions]
+
+
+def _decode_underlyings(data: list) -> List[UnderlyingPosition]:
+    return [UnderlyingPosition(**d) for d in data]
+
+
+def _encode_options(positions: List[OptionPosition]) -> list:
+    encoded = []
+    for p in positions:
+        d = asdict(p)
+        d['contract']['expiry'] = p.contract.expiry.isoformat()
+        encoded.append(d)
+    return encoded
+
+
+def _decode_options(data: list) -> List[OptionPosition]:
+    decoded = []
+    for d in data:
+        contract = dict(d['contract'], expiry=date.fromisoformat(d['contract']['expiry']))
+        decoded.append(OptionPosition(**dict(d, contract=OptionContract(**contract), greeks=Greeks(**d['greeks']))))
+    return decoded
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Redis 共享缓存层的 (编码, 解码) 函数：持仓需转换为 JSON 可序列化结构
+_UNDERLYINGS_CODEC = (_encode_underlyings, _decode_underlyings)
+_OPTIONS_CODEC = (_encode_options, _decode_options)
+_EQUITY_CODEC = (_identity, _identity)
+
+
+# 后台缓存写入任务（保留强引用防止任务被回收）；超过上限时改为同步等待，形成背压
+_BACKGROUND_WRITES: Set[asyncio.Task] = set()
+_BACKGROUND_WRITE_LIMIT = 256
+
+
+async def _write_in_background(coro: Coroutine[Any, Any, Any]) -> None:
+    """缓存写入不在请求关键路径上：后台执行，失败只记录日志"""
+    if len(_BACKGROUND_WRITES) >= _BACKGROUND_WRITE_LIMIT:
+        await coro
+        return
+
+    task = asyncio.create_task(coro)
+    _BACKGROUND_WRITES.add(task)
+    task.add_done_callback(_on_background_write_done)
+
+
+def _on_background_write_done(task: asyncio.Task) -> None:
+    _BACKGROUND_WRITES.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache write failed: %s", task.exception())
+
+
+# {(private_key_path, tiger_id): (client_config, TradeClient, QuoteClient)}
+_SDK_CLIENTS: Dict[Tuple[str, str], Tuple[Any, Any, Any]] = {}
+_SDK_CLIENTS_LOCK = threading.Lock()
+
+# tigeropen 所有 HTTP 请求共用 web_utils 模块级 PoolManager，默认每个 host 只保留 1 条
+# 连接：线程池并发调用时多出的连接用完即丢，下次请求重新 TCP + TLS 握手。
+# 连接池大小与应用默认线程池（app.main._DEFAULT_EXECUTOR_WORKERS）保持一致
+_SDK_HTTP_POOL_MAXSIZE = 16
+_sdk_http_pool_ready = False
+
+
+def ensure_sdk_http_pool() -> None:
+    """将 tigeropen 的模块级连接池替换为可保持多条长连接的 PoolManager（进程内只做一次）
+
+    不开启自动重试：下单等 POST 请求不是幂等的，失败后是否重试由调用方决定。
+    """
+    global _sdk_http_pool_ready
+    if _sdk_http_pool_ready:
+        return
+    with _SDK_CLIENTS_LOCK:
+        if _sdk_http_pool_ready:
+            return
+        from urllib3 import PoolManager
+        from tigeropen.common.util import web_utils
+
+        web_utils.http_pool = PoolManager(maxsize=_SDK_HTTP_POOL_MAXSIZE)
+        _sdk_http_pool_ready = True
+
+
+def _get_sdk_clients(private_key_path: str, tiger_id: str, account: str) -> Tuple[Any, Any, Any]:
+    """获取（必要时创建）共享的 SDK 客户端
+
+    多账户部署中各 TigerOptionClient 复用同一组 TradeClient/QuoteClient，
+    不再各自建立连接与 TLS 握手。所有按账户区分的调用都显式传入 account。
+    """
+    ensure_sdk_http_pool()
+    key = (private_key_path, tiger_id)
+    with _SDK_CLIENTS_LOCK:
+        clients = _SDK_CLIENTS.get(key)
+        if clients is None:
+            # tigeropen 会连带导入 pandas 等重依赖，延迟到真正创建客户端时再加载，
+            # 使用 DummyOptionClient 的部署不承担这部分启动耗时与内存
+            from tigeropen.tiger_open_config import get_client_config
+            from tigeropen.trade.trade_client import TradeClient
+            from tigeropen.quote.quote_client import QuoteClient
+
+            # 使用官方 SDK 配置
+            client_config = get_client_config(
+                private_key_path=private_key_path,
+                tiger_id=tiger_id,
+                account=account
+            )
+            clients = (client_config, TradeClient(client_config), QuoteClient(client_config))
+            _SDK_CLIENTS[key] = clients
+        return clients
+
+
+def get_shared_quote_client(private_key_path: str, tiger_id: str, account: str) -> Any:
+    """获取进程内共享的 QuoteClient（与券商客户端共用同一 SDK 配置与 HTTP 连接池）"""
+    return _get_sdk_clients(private_key_path, tiger_id, account)[2]
+
+
 class TigerOptionClient(OptionBrokerClient):
     """老虎证券期权敞口客户端（基于官方 tigeropen SDK）
 
@@ -25,6 +351,27 @@ class TigerOptionClient(OptionBrokerClient):
     - QuoteClient：获取期权 Greeks 和实时行情
     """
 
+    # 期权行情批量查询：每批合约数 / 最大并发批次数
+    OPTION_BRIEF_CHUNK_SIZE = 50
+    OPTION_BRIEF_CONCURRENCY = 10
+
+    # TTL 缓存有效期（秒）：持仓/权益变化以秒到分钟计，短时间内的重复请求直接命中
+    # 进程内与 Redis 共享层使用相同的有效期
+    POSITIONS_CACHE_TTL = 10
+    EQUITY_CACHE_TTL = 15
+    OPTION_BRIEF_CACHE_TTL = 10
+    # 进程内期权 brief 缓存容量（按合约计，超出时淘汰最久未用的）
+    OPTION_BRIEF_CACHE_SIZE = 4096
+
+    # 进程内港股名称 LRU 容量（名称几乎不变，命中时无需访问 Redis）
+    HK_NAME_LOCAL_CACHE_SIZE = 2048
+    # 股票合约信息基本不变，进程内按 symbol 缓存，重复下单可省去一次 get_contracts 往返
+    CONTRACT_CACHE_SIZE = 512
+    # get_order_status 每次拉取的最近订单数
+    ORDER_STATUS_LOOKUP_LIMIT = 50
+    # get_order_status_map 批量同步时拉取的最近订单数
+    ORDER_BOOK_LOOKUP_LIMIT = 300
+
     def __init__(self, private_key_path: str, tiger_id: str, account: str):
         """初始化 Tiger 客户端
 
@@ -34,15 +381,109 @@ class TigerOptionClient(OptionBrokerClient):
             account: 交易账户号
         """
         self.account = account
-        # 使用官方 SDK 配置
-        self.client_config = get_client_config(
-            private_key_path=private_key_path,
-            tiger_id=tiger_id,
-            account=account
+        # 同一开发者凭证的 TradeClient/QuoteClient 在进程内共享（账户号在调用时显式传入）
+        self.client_config, self.trade_client, self.quote_client = _get_sdk_clients(
+            private_key_path, tiger_id, account
         )
-        self.trade_client = TradeClient(self.client_config)
-        self.quote_client = QuoteClient(self.client_config)
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        # {cache_key: (写入时间, 结果)}，每个 key 一把锁保证并发请求只回源一次
+        self._ttl_cache: Dict[str, Tuple[float, Any]] = {}
+        self._ttl_locks: Dict[str, asyncio.Lock] = {}
+        # {合约标识: (写入时间, brief)}，多次组合快照共享 Greeks；按最近使用排序，读到过期项即删除
+        self._brief_cache: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        # 真实账户号在客户端生命周期内不变：首次成功获取后永久复用
+        self._account_id_cache: Optional[str] = None
+        # {symbol: 港股名称}，按最近使用排序，超出容量时淘汰最久未用的
+        self._hk_name_local: "OrderedDict[str, str]" = OrderedDict()
+        # {symbol: 合约及 tick}，按最近使用排序
+        self._contract_cache: "OrderedDict[str, _ContractInfo]" = OrderedDict()
+        # {account_id: 上次的期权合约列表}，用于与持仓请求并发预取 Greeks
+        self._last_option_symbols: Dict[str, List[str]] = {}
+
+    async def _cached(
+        self,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        codec: Optional[Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = None,
+        force_refresh: bool = False,
+    ) -> Any:
+        """带 TTL 的单飞缓存：命中直接返回，未命中时同一 key 只有一个请求回源
+
+        - loader 返回 None 视为失败，不写入缓存
+        - loader 返回 _Uncached(value) 表示不完整的降级结果：返回 value，但不写入缓存
+        - 传入 codec=(encode, decode) 时，额外以 Redis（app.core.cache）作为跨进程共享层，
+          多个 worker 在同一 TTL 窗口内只回源一次
+        - force_refresh=True 跳过两层缓存直接回源，并用新结果覆盖缓存
+        """
+        if not force_refresh:
+            entry = self._ttl_cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+
+        lock = self._ttl_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if not force_refresh:
+                entry = self._ttl_cache.get(key)
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    return entry[1]
+                if codec is not None:
+                    shared = await self._shared_cache_get(key)
+                    if shared is not None:
+                        value = codec[1](shared)
+                        self._ttl_cache[key] = (time.monotonic(), value)
+                        return value
+            value = await loader()
+            if isinstance(value, _Uncached):
+                return value.value
+            if value is not None:
+                self._ttl_cache[key] = (time.monotonic(), value)
+                if codec is not None:
+                    await self._shared_cache_set(key, codec[0](value), ttl)
+            return value
+
+    @staticmethod
+    async def _shared_cache_get(key: str) -> Any:
+        """读取 Redis 共享缓存；Redis 不可用时视为未命中"""
+        try:
+            return await cache.get(f"tiger:{key}")
+        except Exception as e:
+            logger.debug("Shared cache get failed for %s: %s", key, e)
+            return None
+
+    @staticmethod
+    async def _shared_cache_set(key: str, value: Any, ttl: float) -> None:
+        """写入 Redis 共享缓存；失败只记录日志，不影响返回结果"""
+        try:
+            await cache.set(f"tiger:{key}", value, expire=int(ttl))
+        except Exception as e:
+            logger.debug("Shared cache set failed for %s: %s", key, e)
+
+    async def close(self) -> None:
+        """释放客户端资源
+
+        SDK 调用使用事件循环的默认线程池（随事件循环关闭），SDK 客户端在进程内共享
+        （连接池由 tigeropen 模块级管理），这里只清理本实例的缓存。
+        """
+        self._ttl_cache.clear()
+        self._ttl_locks.clear()
+        self._brief_cache.clear()
+        self._hk_name_local.clear()
+        self._contract_cache.clear()
+        self._last_option_symbols.clear()
+
+    async def invalidate(self, account_id: str) -> None:
+        """使账户的持仓/权益缓存失效（下单后调用，同时清除 Redis 共享层）"""
+        keys = [
+            f"{prefix}:{account_id}"
+            for prefix in ("underlying_positions", "option_positions", "account_equity")
+        ]
+        for key in keys:
+            self._ttl_cache.pop(key, None)
+        try:
+            # 一条 DEL 清除全部共享缓存，一次 Redis 往返
+            await cache.delete_many([f"tiger:{key}" for key in keys])
+        except Exception as e:
+            logger.debug("Shared cache delete failed for %s: %s", account_id, e)
     
     async def _get_hk_stock_names_from_cache(self, symbols: List[str]) -> Dict[str, str]:
         """从缓存获取港股名称
@@ -51,16 +492,62 @@ class TigerOptionClient(OptionBrokerClient):
             symbols: 股票代码列表
             
         Returns:
-            {symbol: name} 字典，只返回缓存中有的
+            {symbol: name} 字典，只返回缓存中有的；已知查不到名称的 symbol
+            值为 _HK_NAME_MISSING
         """
+        # 先查进程内 LRU，只有未命中的才访问 Redis
+        local = self._hk_name_local
         result = {}
+        remote_symbols = []
         for symbol in symbols:
-            cache_key = f"hk_stock_name:{symbol}"
-            name = await cache.get(cache_key)
+            name = local.get(symbol)
             if name:
+                local.move_to_end(symbol)
                 result[symbol] = name
-                logger.info(f" Got HK stock name from cache: {symbol} -> {name}")
+            else:
+                remote_symbols.append(symbol)
+
+        if remote_symbols:
+            # 一次 MGET 取回全部未命中的名称
+            names = await cache.mget([f"hk_stock_name:{symbol}" for symbol in remote_symbols])
+            remote = {symbol: name for symbol, name in zip(remote_symbols, names) if name}
+            self._remember_hk_stock_names(remote)
+            result.update(remote)
+
+        logger.debug("Got %s/%s HK stock names from cache", len(result), len(symbols))
         return result
+
+    async def _prefetch_hk_stock_names(self, account_id: str) -> Tuple[List[str], Dict[str, str]]:
+        """按账户上次出现过的港股代码预取名称（与持仓请求并发执行）
+
+        Returns:
+            (上次的港股代码列表, {symbol: name})
+        """
+        try:
+            last_symbols = await cache.get(f"hk_last_symbols:{account_id}") or []
+        except Exception as e:
+            logger.debug("Failed to load last HK symbols for %s: %s", account_id, e)
+            return [], {}
+        if not last_symbols:
+            return [], {}
+        return last_symbols, await self._get_hk_stock_names_from_cache(last_symbols)
+
+    async def _remember_hk_symbols(self, account_id: str, symbols: List[str]) -> None:
+        """记录账户当前的港股代码集合，供下次预取名称"""
+        try:
+            await cache.set(f"hk_last_symbols:{account_id}", symbols, expire=30*24*3600)
+        except Exception as e:
+            logger.debug("Failed to store last HK symbols for %s: %s", account_id, e)
+
+    def _remember_hk_stock_names(self, stock_names: Dict[str, str]) -> None:
+        """写入进程内港股名称 LRU（占位值只保存在 Redis，随 TTL 过期）"""
+        local = self._hk_name_local
+        for symbol, name in stock_names.items():
+            if name and name != _HK_NAME_MISSING:
+                local[symbol] = name
+                local.move_to_end(symbol)
+        while len(local) > self.HK_NAME_LOCAL_CACHE_SIZE:
+            local.popitem(last=False)
     
     async def _set_hk_stock_names_to_cache(self, stock_names: Dict[str, str]):
         """将港股名称存入缓存
@@ -68,21 +555,30 @@ class TigerOptionClient(OptionBrokerClient):
         Args:
             stock_names: {symbol: name} 字典
         """
-        for symbol, name in stock_names.items():
-            if name:
-                cache_key = f"hk_stock_name:{symbol}"
-                # 缓存 30 天（股票名称几乎不变）
-                await cache.set(cache_key, name, expire=30*24*3600)
-                logger.info(f" Cached HK stock name: {symbol} -> {name}")
+        self._remember_hk_stock_names(stock_names)
+        # 缓存 30 天（股票名称几乎不变），一个 pipeline 批量写入
+        await cache.mset(
+            {f"hk_stock_name:{symbol}": name for symbol, name in stock_names.items() if name},
+            expire=30*24*3600,
+        )
+        logger.debug("Cached %s HK stock names", len(stock_names))
+
+    async def _set_hk_stock_names_missing(self, symbols: List[str]) -> None:
+        """记录 API 查不到名称的港股，_HK_NAME_MISSING_TTL 内跳过 API 请求"""
+        await cache.mset(
+            {f"hk_stock_name:{symbol}": _HK_NAME_MISSING for symbol in symbols},
+            expire=_HK_NAME_MISSING_TTL,
+        )
+        logger.debug("Cached %s unresolved HK symbols", len(symbols))
     
-    async def _fetch_hk_stock_names(self, symbols: List[str]) -> Dict[str, str]:
+    async def _fetch_hk_stock_names(self, symbols: List[str]) -> Optional[Dict[str, str]]:
         """从 Tiger API 批量获取港股名称
         
         Args:
             symbols: 股票代码列表
             
         Returns:
-            {symbol: name} 字典
+            {symbol: name} 字典；API 调用失败时返回 None（与"查不到名称"区分）
         """
         stock_names = {}
         if not symbols:
@@ -93,61 +589,166 @@ class TigerOptionClient(OptionBrokerClient):
                 self.quote_client.get_stock_briefs,
                 symbols
             )
-            if briefs is not None and len(briefs) > 0:
-                for i, row in briefs.iterrows():
-                    sym = row.get('symbol')
-                    # 尝试多个字段获取名称（优先使用中文名称）
-                    name = row.get('nameCN') or row.get('name_cn') or row.get('localSymbol') or row.get('name')
-                    if sym and name:
-                        stock_names[sym] = name
-                        logger.info(f" Fetched HK stock name from API: {sym} -> {name}")
+            if briefs is not None and len(briefs) > 0 and 'symbol' in briefs.columns:
+                # 按列向量化取名称：依次用后备字段填补空值（优先使用中文名称）
+                names = None
+                for col in _HK_NAME_COLUMNS:
+                    if col not in briefs.columns:
+                        continue
+                    values = briefs[col].mask(briefs[col] == '')
+                    names = values if names is None else names.combine_first(values)
+                if names is not None:
+                    valid = names.notna() & briefs['symbol'].notna() & (briefs['symbol'] != '')
+                    stock_names = dict(zip(briefs['symbol'][valid].tolist(), names[valid].tolist()))
+                    logger.debug("Fetched %s HK stock names from API", len(stock_names))
         except Exception as e:
-            logger.info(f" Error fetching HK stock names from API: {e}")
+            logger.warning("Error fetching HK stock names from API: %s", e)
+            return None
         
         return stock_names
     
     async def _run_in_executor(self, func, *args, **kwargs):
-        """在线程池中运行同步的 SDK 调用"""
-        loop = asyncio.get_event_loop()
-        if kwargs:
-            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
-        return await loop.run_in_executor(self._executor, func, *args)
+        """在事件循环默认线程池中运行同步的 SDK 调用（线程池在应用启动时统一配置）"""
+        return await asyncio.to_thread(func, *args, **kwargs)
 
-    async def list_underlying_positions(self, account_id: str) -> List[UnderlyingPosition]:
+    async def _fetch_option_briefs(self, symbols: List[str]) -> Dict[str, object]:
+        """分批并发获取期权行情和 Greeks
+
+        按 OPTION_BRIEF_CHUNK_SIZE 切分合约列表，最多 OPTION_BRIEF_CONCURRENCY
+        个批次同时请求；单个批次失败只影响该批次的合约（降级为默认 Greeks）。
+
+        Returns:
+            {合约标识: brief} 字典
+        """
+        option_briefs = {}
+        if not symbols:
+            return option_briefs
+
+        # 先取未过期的缓存，只请求缺失的合约；过期项直接删除，已到期的合约不会常驻内存
+        now = time.monotonic()
+        ttl = self.OPTION_BRIEF_CACHE_TTL
+        brief_cache = self._brief_cache
+        missing = []
+        for sym in symbols:
+            entry = brief_cache.get(sym)
+            if entry is not None and now - entry[0] < ttl:
+                brief_cache.move_to_end(sym)
+                option_briefs[sym] = entry[1]
+            else:
+                if entry is not None:
+                    del brief_cache[sym]
+                missing.append(sym)
+        if not missing:
+            return option_briefs
+        symbols = missing
+
+        size = self.OPTION_BRIEF_CHUNK_SIZE
+        chunks = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+        sem = asyncio.Semaphore(self.OPTION_BRIEF_CONCURRENCY)
+
+        async def fetch(chunk: List[str]):
+            async with sem:
+                return await self._run_in_executor(self.quote_client.get_option_briefs, chunk)
+
+        chunk_results = await asyncio.gather(*(fetch(c) for c in chunks), return_exceptions=True)
+        for briefs in chunk_results:
+            if isinstance(briefs, Exception):
+                err_str = str(briefs).lower()
+                if "permission denied" in err_str or "rate limit" in err_str:
+                    logger.warning("Option quote permission not available, using default greeks. %s", briefs)
+                else:
+                    logger.warning("Error fetching option Greeks: %s", briefs)
+                continue
+            # 解析失败同样只影响该批次
+            try:
+                option_briefs.update(_index_option_briefs(briefs))
+            except Exception as e:
+                logger.warning("Error parsing option Greeks: %s", e)
+        fetched_at = time.monotonic()
+        for sym in symbols:
+            brief = option_briefs.get(sym)
+            if brief is not None:
+                brief_cache[sym] = (fetched_at, brief)
+                brief_cache.move_to_end(sym)
+        while len(brief_cache) > self.OPTION_BRIEF_CACHE_SIZE:
+            brief_cache.popitem(last=False)
+        return option_briefs
+
+    async def list_underlying_positions(
+        self, account_id: str, force_refresh: bool = False
+    ) -> List[UnderlyingPosition]:
+        """获取股票/ETF 仓位（POSITIONS_CACHE_TTL 秒内复用结果，force_refresh 强制回源）
+
+        券商接口失败时返回空列表，且该结果不写入任何缓存层，下次调用立即重试。
+        """
+        positions = await self._cached(
+            f"underlying_positions:{account_id}",
+            self.POSITIONS_CACHE_TTL,
+            lambda: self._load_underlying_positions(account_id),
+            codec=_UNDERLYINGS_CODEC,
+            force_refresh=force_refresh,
+        )
+        return positions if positions is not None else []
+
+    async def _load_underlying_positions(self, account_id: str) -> Any:
         """获取股票/ETF 仓位
 
-        使用 TradeClient.get_positions() 获取股票持仓
+        使用 TradeClient.get_positions() 获取股票持仓。
+        美股请求失败时返回 None；港股失败时返回 _Uncached(仅美股持仓)。两者都不写入缓存，
+        避免把失败或不完整的持仓当作真实结果缓存；空列表只表示账户确实没有持仓。
         """
+        from tigeropen.common.consts import SecurityType, Market
+
         results: List[UnderlyingPosition] = []
 
-        try:
-            logger.info(f" Fetching underlying positions for account: {account_id}")
-            
-            # 获取美股持仓
-            us_positions = await self._run_in_executor(
+        logger.debug("Fetching underlying positions for account: %s", account_id)
+
+        # 美股/港股持仓互不依赖，并发请求：耗时从 t_US + t_HK 降为 max(t_US, t_HK)；
+        # 同时按上次出现过的港股代码预取名称，缓存往返隐藏在持仓请求之后
+        us_positions, hk_positions, hk_name_hint = await asyncio.gather(
+            self._run_in_executor(
                 self.trade_client.get_positions,
                 sec_type=SecurityType.STK,
                 market=Market.US,
                 account=account_id
-            )
-            
-            logger.info(f" Got {len(us_positions) if us_positions else 0} US underlying positions")
+            ),
+            self._run_in_executor(
+                self.trade_client.get_positions,
+                sec_type=SecurityType.STK,
+                market=Market.HK,
+                account=account_id
+            ),
+            self._prefetch_hk_stock_names(account_id),
+            return_exceptions=True,
+        )
+        if isinstance(hk_name_hint, Exception):
+            hk_name_hint = ([], {})
+
+        if isinstance(us_positions, Exception):
+            logger.warning("Error fetching underlying positions: %s", us_positions)
+            return None
+
+        try:
+            logger.debug("Got %s US underlying positions", len(us_positions) if us_positions else 0)
 
+            # 循环内频繁调用的绑定方法提前取出
+            append = results.append
             if us_positions:
                 for pos in us_positions:
-                    if not pos.contract or not pos.contract.symbol:
-                        logger.info(f" Skipping position without contract/symbol")
+                    contract = pos.contract
+                    if not contract or not contract.symbol:
+                        logger.debug("Skipping position without contract/symbol")
                         continue
                     
-                    symbol = pos.contract.symbol
+                    symbol = contract.symbol
                     quantity = int(pos.quantity or 0)
                     
                     # 跳过数量为0的持仓
                     if quantity == 0:
-                        logger.info(f" Skipping {symbol} with zero quantity")
+                        logger.debug("Skipping %s with zero quantity", symbol)
                         continue
 
-                    logger.info(f" US Position: {symbol}, qty={quantity}")
+                    logger.debug("US Position: %s, qty=%s", symbol, quantity)
                     
                     underlying = UnderlyingPosition(
                         symbol=symbol,
@@ -155,69 +756,74 @@ class TigerOptionClient(OptionBrokerClient):
                         quantity=quantity,
                         avg_price=float(pos.average_cost or 0),
                         last_price=float(pos.market_price or 0),
-                        currency=pos.contract.currency or "USD",
+                        currency=contract.currency or "USD",
                     )
-                    results.append(underlying)
+                    append(underlying)
 
-            # 获取港股持仓
+            # 处理港股持仓
             try:
-                hk_positions = await self._run_in_executor(
-                    self.trade_client.get_positions,
-                    sec_type=SecurityType.STK,
-                    market=Market.HK,
-                    account=account_id
-                )
-                
-                logger.info(f" Got {len(hk_positions) if hk_positions else 0} HK underlying positions")
+                if isinstance(hk_positions, Exception):
+                    raise hk_positions
+
+                logger.debug("Got %s HK underlying positions", len(hk_positions) if hk_positions else 0)
                 
                 if hk_positions:
-                    # 收集所有港股symbol，批量获取股票信息
-                    hk_symbols = []
-                    hk_position_map = {}
+                    # 一次遍历筛出有效持仓 (symbol, pos, quantity)，数量只转换一次
+                    hk_valid = []
+                    hk_valid_append = hk_valid.append
                     for pos in hk_positions:
                         if not pos.contract or not pos.contract.symbol:
                             continue
-                        symbol = pos.contract.symbol
                         quantity = int(pos.quantity or 0)
-                        if quantity == 0:
-                            continue
-                        hk_symbols.append(symbol)
-                        hk_position_map[symbol] = pos
+                        if quantity != 0:
+                            hk_valid_append((pos.contract.symbol, pos, quantity))
+                    # 收集所有港股symbol（去重保序），批量获取股票信息
+                    hk_symbols = list(dict.fromkeys(symbol for symbol, _, _ in hk_valid))
                     
-                    # 首先从缓存获取股票名称
-                    stock_names = await self._get_hk_stock_names_from_cache(hk_symbols)
+                    # 首先使用预取结果，预取未覆盖的再查缓存
+                    last_symbols, prefetched = hk_name_hint
+                    stock_names = {sym: prefetched[sym] for sym in hk_symbols if sym in prefetched}
+                    unseen_symbols = [sym for sym in hk_symbols if sym not in prefetched]
+                    if unseen_symbols:
+                        stock_names.update(await self._get_hk_stock_names_from_cache(unseen_symbols))
+                    if set(hk_symbols) != set(last_symbols):
+                        await _write_in_background(self._remember_hk_symbols(account_id, hk_symbols))
                     
-                    # 找出缓存中没有的symbol
+                    # 找出缓存中没有的symbol（已知查不到名称的不再请求 API）
                     missing_symbols = [sym for sym in hk_symbols if sym not in stock_names]
                     
                     # 如果有缺失的，从 API 获取
                     if missing_symbols:
-                        logger.info(f" Fetching {len(missing_symbols)} HK stock names from API")
+                        logger.debug("Fetching %s HK stock names from API", len(missing_symbols))
                         new_names = await self._fetch_hk_stock_names(missing_symbols)
                         
-                        # 合并结果
-                        stock_names.update(new_names)
-                        
-                        # 将新获取的名称存入缓存
-                        if new_names:
-                            await self._set_hk_stock_names_to_cache(new_names)
+                        # API 调用失败时不做任何缓存，下次重试
+                        if new_names is not None:
+                            # 合并结果
+                            stock_names.update(new_names)
+                            
+                            # 将新获取的名称存入缓存（后台写入，不占用本次请求的 Redis 往返）
+                            if new_names:
+                                await _write_in_background(self._set_hk_stock_names_to_cache(new_names))
+                            unresolved = [sym for sym in missing_symbols if sym not in new_names]
+                            if unresolved:
+                                await _write_in_background(self._set_hk_stock_names_missing(unresolved))
                     else:
-                        logger.info(f" All {len(hk_symbols)} HK stock names found in cache")
+                        logger.debug("All %s HK stock names found in cache", len(hk_symbols))
                     
                     # 构建持仓对象
-                    for symbol, pos in hk_position_map.items():
-                        quantity = int(pos.quantity or 0)
-                        
+                    for symbol, pos, quantity in hk_valid:
+                        contract = pos.contract
                         # 尝试获取股票名称（优先从contract，其次从缓存/API）
-                        stock_name = None
-                        if hasattr(pos.contract, 'name') and pos.contract.name:
-                            stock_name = pos.contract.name
-                        elif hasattr(pos.contract, 'local_symbol') and pos.contract.local_symbol:
-                            stock_name = pos.contract.local_symbol
-                        elif symbol in stock_names:
-                            stock_name = stock_names[symbol]
+                        stock_name = (
+                            getattr(contract, 'name', None)
+                            or getattr(contract, 'local_symbol', None)
+                            or stock_names.get(symbol)
+                        )
+                        if stock_name == _HK_NAME_MISSING:
+                            stock_name = None
                         
-                        logger.info(f" HK Position: {symbol} ({stock_name}), qty={quantity}")
+                        logger.debug("HK Position: %s (%s), qty=%s", symbol, stock_name, quantity)
                         
                         underlying = UnderlyingPosition(
                             symbol=symbol,
@@ -225,138 +831,206 @@ class TigerOptionClient(OptionBrokerClient):
                             quantity=quantity,
                             avg_price=float(pos.average_cost or 0),
                             last_price=float(pos.market_price or 0),
-                            currency=pos.contract.currency or "HKD",
+                            currency=contract.currency or "HKD",
                             name=stock_name,
                         )
-                        results.append(underlying)
+                        append(underlying)
             except Exception as hk_error:
-                logger.info(f" Error fetching HK positions: {hk_error}")
+                logger.warning("Error fetching HK positions: %s", hk_error)
+                return _Uncached(results)
             
-            logger.info(f" Total positions to return: {len(results)}")
+            logger.debug("Total positions to return: %s", len(results))
 
         except Exception as e:
-            logger.info(f" Error fetching underlying positions: {e}")
+            logger.warning("Error fetching underlying positions: %s", e)
+            return None
 
         return results
 
-    async def list_option_positions(self, account_id: str) -> List[OptionPosition]:
+    async def list_option_positions(
+        self, account_id: str, force_refresh: bool = False
+    ) -> List[OptionPosition]:
+        """获取期权仓位 + Greeks（POSITIONS_CACHE_TTL 秒内复用结果，force_refresh 强制回源）
+
+        券商接口失败时返回空列表，且该结果不写入任何缓存层，下次调用立即重试。
+        """
+        positions = await self._cached(
+            f"option_positions:{account_id}",
+            self.POSITIONS_CACHE_TTL,
+            lambda: self._load_option_positions(account_id),
+            codec=_OPTIONS_CODEC,
+            force_refresh=force_refresh,
+        )
+        return positions if positions is not None else []
+
+    async def _load_option_positions(self, account_id: str) -> Optional[List[OptionPosition]]:
         """获取期权仓位 + Greeks
 
         使用 TradeClient.get_positions() 获取期权持仓，
-        然后用 QuoteClient.get_option_briefs() 获取 Greeks
+        然后用 QuoteClient.get_option_briefs() 获取 Greeks。
+        持仓请求失败时返回 None（不缓存）；空列表只表示账户确实没有期权持仓。
         """
+        from tigeropen.common.consts import SecurityType, Market
+
         results: List[OptionPosition] = []
 
         try:
-            logger.info(f" Fetching option positions for account: {account_id}")
-            # 获取期权持仓
-            positions = await self._run_in_executor(
-                self.trade_client.get_positions,
-                sec_type=SecurityType.OPT,
-                market=Market.US,
-                account=account_id
+            logger.debug("Fetching option positions for account: %s", account_id)
+            # 获取期权持仓；同时按上次的合约列表预取 Greeks（写入 brief 缓存），
+            # 持仓未变化时下面的 _fetch_option_briefs 直接命中缓存，省去一次串行往返。
+            # 预取只是尽力而为：它的异常被吞掉，不影响持仓加载
+            positions, prefetched = await asyncio.gather(
+                self._run_in_executor(
+                    self.trade_client.get_positions,
+                    sec_type=SecurityType.OPT,
+                    market=Market.US,
+                    account=account_id
+                ),
+                self._fetch_option_briefs(self._last_option_symbols.get(account_id, [])),
+                return_exceptions=True,
             )
+            if isinstance(prefetched, BaseException):
+                logger.debug("Option brief prefetch failed: %s", prefetched)
+            if isinstance(positions, BaseException):
+                raise positions
             
-            logger.info(f" Got {len(positions) if positions else 0} option positions")
+            logger.debug("Got %s option positions", len(positions) if positions else 0)
 
             if not positions:
                 return results
 
-            # 构建期权合约标识列表，用于批量查询 Greeks
-            symbols = [pos.contract.symbol for pos in positions if pos.contract]
+            # 构建期权合约标识列表（同一合约多笔持仓只查一次，去重保序），用于批量查询 Greeks
+            symbols = list(dict.fromkeys(pos.contract.symbol for pos in positions if pos.contract))
+            self._last_option_symbols[account_id] = symbols
 
             # 批量获取期权行情和 Greeks
-            option_briefs = {}
-            if symbols:
-                try:
-                    briefs = await self._run_in_executor(
-                        self.quote_client.get_option_briefs,
-                        symbols
-                    )
-                    if briefs:
-                        for brief in briefs:
-                            if hasattr(brief, 'identifier'):
-                                option_briefs[brief.identifier] = brief
-                            elif hasattr(brief, 'symbol'):
-                                option_briefs[brief.symbol] = brief
-                except Exception as e:
-                    err_str = str(e)
-                    if "permission denied" in err_str.lower() or "rate limit" in err_str.lower():
-                        logger.info(f" Option quote permission not available, using default greeks. {e}")
-                    else:
-                        logger.info(f" Error fetching option Greeks: {e}")
+            option_briefs = await self._fetch_option_briefs(symbols)
 
-            ts = datetime.utcnow().timestamp()
+            # 循环不变量：时间戳与 expiry 无法解析时的默认日期，对整批持仓只计算一次
+            ts = time.time()
+            today = date.today()
 
+            # 循环内频繁调用的绑定方法提前取出
+            append = results.append
+            get_brief = option_briefs.get
+            parse = self._parse_option_position
             for pos in positions:
-                if not pos.contract:
-                    continue
-
-                contract_obj = pos.contract
-                symbol = contract_obj.symbol
-
-                # 解析 expiry - Tiger API 可能返回字符串或 date 对象
-                raw_expiry = getattr(contract_obj, 'expiry', None)
-                if isinstance(raw_expiry, str):
-                    try:
-                        expiry_date = datetime.strptime(raw_expiry, '%Y-%m-%d').date()
-                    except ValueError:
-                        # 如果格式不匹配，使用当前日期作为默认值
-                        expiry_date = datetime.now().date()
-                elif isinstance(raw_expiry, date):
-                    expiry_date = raw_expiry
-                else:
-                    expiry_date = datetime.now().date()
-
-                # 解析期权合约信息
-                contract = OptionContract(
-                    broker_symbol=symbol,
-                    underlying=getattr(contract_obj, 'underlying', symbol.split()[0] if ' ' in symbol else symbol),
-                    market="US",
-                    right=getattr(contract_obj, 'right', 'CALL'),
-                    strike=float(getattr(contract_obj, 'strike', 0)),
-                    expiry=expiry_date,
-                    multiplier=int(getattr(contract_obj, 'multiplier', 100)),
-                    currency=getattr(contract_obj, 'currency', 'USD'),
-                )
-
-                # 获取 Greeks（从行情数据或持仓数据）
-                brief = option_briefs.get(symbol)
-                if brief:
-                    greeks = Greeks(
-                        delta=float(getattr(brief, 'delta', 0)),
-                        gamma=float(getattr(brief, 'gamma', 0)),
-                        vega=float(getattr(brief, 'vega', 0)),
-                        theta=float(getattr(brief, 'theta', 0)),
-                    )
-                    underlying_price = float(getattr(brief, 'underlying_price', 0))
-                    last_price = float(getattr(brief, 'latest_price', getattr(pos, 'market_price', 0)))
-                else:
-                    # 如果没有行情数据，使用默认值
-                    greeks = Greeks(delta=0, gamma=0, vega=0, theta=0)
-                    # 对于期权仓位，pos.market_price 是期权的价格，而非标的价格
-                    last_price = float(getattr(pos, 'market_price', 0))
-                    # 尝试从 pos 获取标的价格（如果 SDK 提供）
-                    underlying_price = float(getattr(pos, 'underlying_price', last_price))
-
-                option_pos = OptionPosition(
-                    contract=contract,
-                    quantity=int(pos.quantity or 0),
-                    avg_price=float(pos.average_cost or 0),
-                    last_price=last_price,
-                    underlying_price=underlying_price,
-                    greeks=greeks,
-                    last_update_ts=ts,
-                )
-                results.append(option_pos)
+                brief = get_brief(pos.contract.symbol) if pos.contract else None
+                parsed = parse(pos, brief, ts, today)
+                if parsed is not None:
+                    append(parsed)
 
         except Exception as e:
-            logger.info(f" Error fetching option positions: {e}")
+            logger.warning("Error fetching option positions: %s", e)
+            return None
 
         return results
 
+    @staticmethod
+    def _parse_option_position(pos: Any, brief: Any, ts: float, today: date) -> Optional[OptionPosition]:
+        """将单条 Tiger 期权持仓解析为 OptionPosition
+
+        单条数据异常（如 Greeks 字段无法转为 float）时记录警告并返回 None，
+        不影响同批次其余持仓，也不浪费已完成的批量 Greeks 查询。
+        """
+        if not pos.contract:
+            return None
+
+        contract_obj = pos.contract
+        symbol = contract_obj.symbol
+        try:
+            underlying, right, strike, raw_expiry, multiplier, currency = _contract_fields(contract_obj, symbol)
+
+            # 解析 expiry - Tiger API 可能返回字符串或 date 对象
+            if isinstance(raw_expiry, str):
+                try:
+                    expiry_date = _parse_expiry(raw_expiry)
+                except ValueError:
+                    # 如果格式不匹配，使用当前日期作为默认值
+                    expiry_date = today
+            elif isinstance(raw_expiry, date):
+                expiry_date = raw_expiry
+            else:
+                expiry_date = today
+
+            # 解析期权合约信息
+            contract = OptionContract(
+                broker_symbol=symbol,
+                underlying=underlying,
+                market="US",
+                right=right,
+                strike=float(strike),
+                expiry=expiry_date,
+                multiplier=int(multiplier),
+                currency=currency,
+            )
+
+            # 获取 Greeks（从行情数据或持仓数据）
+            if brief:
+                greeks, underlying_price, last_price = _extract_greeks(brief, getattr(pos, 'market_price', 0))
+            else:
+                # 如果没有行情数据，使用默认值
+                greeks = _ZERO_GREEKS
+                # 对于期权仓位，pos.market_price 是期权的价格，而非标的价格
+                last_price = float(getattr(pos, 'market_price', 0))
+                # 尝试从 pos 获取标的价格（如果 SDK 提供）
+                underlying_price = float(getattr(pos, 'underlying_price', last_price))
+
+            return OptionPosition(
+                contract=contract,
+                quantity=int(pos.quantity or 0),
+                avg_price=float(pos.average_cost or 0),
+                last_price=last_price,
+                underlying_price=underlying_price,
+                greeks=greeks,
+                last_update_ts=ts,
+            )
+        except Exception as e:
+            logger.warning("Skipping malformed option position %s: %s", symbol, e)
+            return None
+
+    async def snapshot(
+        self, account_id: str
+    ) -> Tuple[List[UnderlyingPosition], List[OptionPosition], Optional[float]]:
+        """并发获取股票持仓、期权持仓和账户权益
+
+        三者互相独立，并发执行后总耗时取决于最慢的一次调用；
+        单项失败时降级为空结果，不影响其余结果。
+
+        Returns:
+            (underlyings, options, equity)
+        """
+        underlyings, options, equity = await asyncio.gather(
+            self.list_underlying_positions(account_id),
+            self.list_option_positions(account_id),
+            self.get_account_equity(account_id),
+            return_exceptions=True,
+        )
+        if isinstance(underlyings, BaseException):
+            logger.warning("Snapshot underlying positions failed: %s", underlyings)
+            underlyings = []
+        if isinstance(options, BaseException):
+            logger.warning("Snapshot option positions failed: %s", options)
+            options = []
+        if isinstance(equity, BaseException):
+            logger.warning("Snapshot account equity failed: %s", equity)
+            equity = None
+        return underlyings, options, equity
+
     async def get_account_id(self) -> str:
-        """获取真实的券商账户ID（从 API 返回的实际账户号）"""
+        """获取真实的券商账户ID（从 API 返回的实际账户号）
+
+        首次成功获取后在本实例内永久复用；获取失败时返回配置的账户名但不缓存，下次调用重试。
+        并发的首次调用只请求一次 get_assets。
+        """
+        if self._account_id_cache:
+            return self._account_id_cache
+        async with self._ttl_locks.setdefault("account_id", asyncio.Lock()):
+            if self._account_id_cache:
+                return self._account_id_cache
+            return await self._load_account_id()
+
+    async def _load_account_id(self) -> str:
         try:
             # 尝试获取账户资产，从中提取真实账户ID
             assets = await self._run_in_executor(
@@ -364,65 +1038,137 @@ class TigerOptionClient(OptionBrokerClient):
                 account=self.account
             )
             if assets and hasattr(assets, 'account'):
-                return str(assets.account)
+                self._account_id_cache = str(assets.account)
+                return self._account_id_cache
         except Exception as e:
-            logger.info(f" Error fetching account ID: {e}")
+            logger.warning("Error fetching account ID: %s", e)
         
         # 降级返回配置的账户名
         return self.account
 
-    async def get_account_equity(self, account_id: str) -> float:
+    def invalidate_account_id(self) -> None:
+        """清除已缓存的账户ID（重新登录/切换账户时调用）"""
+        self._account_id_cache = None
+
+    async def get_account_equity(self, account_id: str, force_refresh: bool = False) -> float:
         """获取账户权益（净清算价值）
         
-        返回账户的总资产价值（USD）
+        返回账户的总资产价值（USD），EQUITY_CACHE_TTL 秒内复用结果，force_refresh 强制回源
         """
+        return await self._cached(
+            f"account_equity:{account_id}",
+            self.EQUITY_CACHE_TTL,
+            lambda: self._load_account_equity(account_id),
+            codec=_EQUITY_CODEC,
+            force_refresh=force_refresh,
+        )
+
+    async def _load_account_equity(self, account_id: str) -> float:
         try:
-            logger.info(f" Fetching account equity for: {account_id}")
+            logger.debug("Fetching account equity for: %s", account_id)
             assets = await self._run_in_executor(
                 self.trade_client.get_assets,
                 account=account_id
             )
             
             if assets:
-                logger.info(f" Got assets object: {type(assets)}")
+                logger.debug("Got assets object: %s", type(assets))
                 
                 # 如果是列表，取第一个元素
                 if isinstance(assets, list) and len(assets) > 0:
                     asset = assets[0]
-                    logger.info(f" Using first asset from list")
+                    logger.debug("Using first asset from list")
                 else:
                     asset = assets
                 
                 # 优先使用 summary.net_liquidation（净清算价值）
-                if hasattr(asset, 'summary') and asset.summary:
-                    # summary 是一个对象，不是字典
-                    if hasattr(asset.summary, 'net_liquidation'):
-                        net_liq = asset.summary.net_liquidation
-                        # Tiger API 可能返回 inf，需要检查
-                        if net_liq and net_liq != float('inf'):
-                            logger.info(f" Net liquidation: {net_liq}")
-                            return float(net_liq)
+                # summary 是一个对象，不是字典；缺失时 getattr 直接得到 None
+                net_liq = _valid_equity(getattr(getattr(asset, 'summary', None), 'net_liquidation', None))
+                if net_liq is not None:
+                    logger.debug("Net liquidation: %s", net_liq)
+                    return net_liq
                 
                 # 降级尝试其他字段
-                for attr in ['net_liquidation', 'equity_with_loan', 'total_cash_balance']:
-                    value = getattr(asset, attr, None)
-                    if value and value != float('inf'):
-                        logger.info(f" Using {attr}: {value}")
-                        return float(value)
+                for attr in _EQUITY_ATTRS:
+                    value = _valid_equity(getattr(asset, attr, None))
+                    if value is not None:
+                        logger.debug("Using %s: %s", attr, value)
+                        return value
                 
-                logger.info(f" Warning: Could not find valid equity value in assets")
+                logger.warning("Could not find valid equity value in assets")
             else:
-                logger.info(f" Warning: assets is None")
+                logger.warning("assets is None")
                         
         except Exception as e:
-            logger.info(f" Error fetching account equity: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error fetching account equity: %s", e)
         
         # 如果获取失败，返回 None（由调用方决定默认值）
-        logger.info(f" Returning None for equity")
+        logger.debug("Returning None for equity")
         return None
 
+    def _lookup_contract_info(self, symbol: str) -> Optional[_ContractInfo]:
+        """从本地 LRU 取股票合约及 tick（命中时刷新使用顺序）"""
+        info = self._contract_cache.get(symbol)
+        if info is not None:
+            self._contract_cache.move_to_end(symbol)
+        return info
+
+    def _remember_contract_info(self, symbol: str, info: _ContractInfo) -> None:
+        """写入合约 LRU（只在事件循环线程中调用），超出容量时淘汰最久未用的"""
+        self._contract_cache[symbol] = info
+        if len(self._contract_cache) > self.CONTRACT_CACHE_SIZE:
+            self._contract_cache.popitem(last=False)
+
+    def _prepare_and_place(
+        self,
+        account_id: str,
+        symbol: str,
+        info: Optional[_ContractInfo],
+        action: str,
+        sdk_order_type: str,
+        quantity: Any,
+        price: Any,
+    ) -> Tuple[Optional[_ContractInfo], Any, Any]:
+        """在线程池中同步完成：查询合约（未缓存时）、tick 对齐、构造并提交订单
+
+        合约查询与下单合并为一次线程池调用，缓存未命中时也只有一次线程切换。
+
+        Returns:
+            (合约信息, 实际提交的限价, order_id)；查不到合约时均为 None
+        """
+        from tigeropen.common.consts import SecurityType
+        from tigeropen.trade.domain.order import Order
+
+        # 1. 获取合约（空结果不缓存）
+        if info is None:
+            contracts = self.trade_client.get_contracts(symbol, SecurityType.STK)
+            if not contracts:
+                return None, None, None
+            info = _contract_info(contracts)
+
+        # 2. 构造订单
+        # tigeropen SDK 示例通常是:
+        # order = Order(account, contract[0], action, order_type, quantity, limit_price=price)
+        # 对价位进行 tick 对齐（Tiger 要求 price 必须是 tick 的整数倍）
+        limit_price = price if sdk_order_type in ("LMT",) else None
+        if limit_price is not None:
+            # 最小价格增量随合约缓存，只在首次获取合约时解析
+            aligned_price = _align_to_tick(limit_price, info, action == 'BUY')
+            if aligned_price != limit_price:
+                logger.info("Aligning price %s -> %s using tick %s", limit_price, aligned_price, info.tick)
+            limit_price = aligned_price
+        tiger_order = Order(
+            account_id,
+            info.contracts[0],
+            action,
+            sdk_order_type,
+            quantity,
+            limit_price=limit_price
+        )
+
+        # 3. 提交订单
+        return info, limit_price, self.trade_client.place_order(tiger_order)
+
     async def place_order(self, account_id: str, order_params: dict) -> dict:
         """真实下单到老虎证券"""
         symbol = order_params.get("symbol")
@@ -448,76 +1194,22 @@ class TigerOptionClient(OptionBrokerClient):
             order_type_upper = (order_type or "").upper()
             sdk_order_type = mapping.get(order_type_upper, order_type_upper)
 
-            logger.info(f" Placing {sdk_order_type} order for {symbol}: {action} {quantity} @ {price}")
+            logger.info("Placing %s order for %s: %s %s @ %s", sdk_order_type, symbol, action, quantity, price)
             
-            # 1. 创建订单对象
-            # 注意: tigeropen API 创建订单通常使用 TradeClient.create_order
-            # 获取合约信息可能需要, 但对于简单股票可以直接创建
-            contract = await self._run_in_executor(
-                self.trade_client.get_contracts,
-                symbol,
-                SecurityType.STK
+            cached_info = self._lookup_contract_info(symbol)
+            info, limit_price, order_id = await self._run_in_executor(
+                self._prepare_and_place,
+                account_id, symbol, cached_info, action, sdk_order_type, quantity, price,
             )
             
-            if not contract:
+            if info is None:
                 return {"success": False, "message": f"Could not find contract for {symbol}"}
-            
-            # 2. 构造订单
-            # tigeropen SDK 示例通常是:
-            # order = Order(account, contract[0], action, order_type, quantity, limit_price=price)
-            # 构造 tiger SDK 期望的 Order 对象，使用映射后的 order_type
-            # 对价位进行 tick 对齐（Tiger 要求 price 必须是 tick 的整数倍）
-            limit_price = price if sdk_order_type in ("LMT",) else None
-            if limit_price is not None:
-                # 先尝试从合约对象获取最小价格增量字段
-                tick = None
-                try:
-                    possible_attrs = ['tick_size', 'min_price_increment', 'min_tick', 'price_tick']
-                    for a in possible_attrs:
-                        if hasattr(contract[0], a):
-                            tick = getattr(contract[0], a)
-                            break
-                except Exception:
-                    tick = None
-
-                try:
-                    tick = float(tick) if tick else 0.01
-                except Exception:
-                    tick = 0.01
-
-                # 使用 Decimal 精确对齐：买单向下取整，卖单向上取整，避免被拒绝
-                d_price = Decimal(str(limit_price))
-                d_tick = Decimal(str(tick))
-                if action == 'BUY':
-                    aligned = (d_price / d_tick).quantize(Decimal('1'), rounding=ROUND_FLOOR) * d_tick
-                else:
-                    aligned = (d_price / d_tick).quantize(Decimal('1'), rounding=ROUND_CEILING) * d_tick
-
-                # 防止对齐后为 0
-                if aligned <= Decimal('0'):
-                    aligned = d_tick
-
-                aligned_price = float(aligned)
-                if aligned_price != limit_price:
-                    logger.info(f" Aligning price {limit_price} -> {aligned_price} using tick {tick}")
-                limit_price = aligned_price
-            tiger_order = Order(
-                account_id,
-                contract[0],
-                action,
-                sdk_order_type,
-                quantity,
-                limit_price=limit_price
-            )
-            
-            # 3. 提交订单
-            order_id = await self._run_in_executor(
-                self.trade_client.place_order,
-                tiger_order
-            )
+            if cached_info is None:
+                self._remember_contract_info(symbol, info)
             
             if order_id:
-                logger.info(f" Order placed successfully, id: {order_id}")
+                logger.info("Order placed successfully, id: %s", order_id)
+                await self.invalidate(account_id)
                 return {
                     "success": True,
                     "order_id": str(order_id),
@@ -534,88 +1226,102 @@ class TigerOptionClient(OptionBrokerClient):
                 }
                 
         except Exception as e:
-            logger.info(f" Place order failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Place order failed: %s", e)
             return {
                 "success": False,
                 "message": f"Tiger API error: {str(e)}"
             }
 
-    async def get_order_status(self, account_id: str, order_id: str) -> dict:
-        """获取老虎证券订单状态"""
+    async def get_order_status(
+        self, account_id: str, order_id: str, since_ts: Optional[int] = None
+    ) -> dict:
+        """获取老虎证券订单状态
+
+        优先使用单笔订单查询（get_order）；查不到时回退为拉取最近订单列表并在本地匹配。
+
+        Args:
+            since_ts: 可选，订单提交时间下界（毫秒时间戳）。已知下单时间时传入，
+                由服务端按时间过滤，减少回退路径返回的订单数量
+        """
         try:
-            # 兼容性处理：当前版本的 get_orders 不支持直接传 id 参数
-            # 我们获取最近的订单列表并在本地过滤
+            target_order = await self._fetch_single_order(account_id, order_id)
+            if target_order is not None:
+                return _order_status_payload(target_order)
+
+            # 回退：获取最近的订单列表并在本地过滤
             orders = await self._run_in_executor(
                 self.trade_client.get_orders,
                 account=account_id,
-                limit=50  # 获取最近50笔，覆盖当前活跃订单
+                start_time=since_ts,
+                limit=self.ORDER_STATUS_LOOKUP_LIMIT
             )
             
             if not orders:
-                logger.info(f" No orders returned for account {account_id}")
+                logger.warning("No orders returned for account %s", account_id)
                 return {"status": "NOT_FOUND", "message": "No orders found"}
             
-            # 本地按 ID 过滤
-            target_order = None
-            search_ids = [str(order_id)]
-            logger.info(f" Searching for order_id: {order_id} in {len(orders)} recent orders")
-            
-            for o in orders:
-                # Tiger SDK 的 Order 对象通常有 id 和 order_id，且可能包含外部 ID
-                # 我们同时检查并打印前几个订单的 ID 结构以便调试
-                o_id = str(getattr(o, 'id', ''))
-                o_order_id = str(getattr(o, 'order_id', ''))
-                
-                if o_id in search_ids or o_order_id in search_ids:
-                    target_order = o
-                    break
+            # 本地按 ID 过滤（Tiger SDK 的 Order 对象通常有 id 和 order_id，两者都匹配）
+            search_id = str(order_id)
+            logger.debug("Searching for order_id: %s in %s recent orders", order_id, len(orders))
+            target_order = next(
+                (
+                    o for o in orders
+                    if str(getattr(o, 'id', '')) == search_id or str(getattr(o, 'order_id', '')) == search_id
+                ),
+                None,
+            )
             
             if not target_order:
                 # 记录调试信息：打印最近三个订单的 ID
                 debug_info = []
                 for o in orders[:3]:
                     debug_info.append(f"id={getattr(o,'id','?')}, order_id={getattr(o,'order_id','?')}")
-                logger.info(f" Order {order_id} not found. Recent orders: {', '.join(debug_info)}")
+                logger.warning("Order %s not found. Recent orders: %s", order_id, ', '.join(debug_info))
                 return {"status": "NOT_FOUND", "message": "Order not found in recent history"}
             
-            status = target_order.status
-            
-            # 映射 Tiger 状态到内部通用状态
-            # Tiger OrderStatus: PENDING_NEW, NEW, PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED, EXPIRED, INACTIVE
-            status_map = {
-                OrderStatus.FILLED: "FILLED",
-                OrderStatus.CANCELLED: "CANCELLED",
-                OrderStatus.REJECTED: "REJECTED",
-                OrderStatus.EXPIRED: "CANCELLED",
-                OrderStatus.PARTIALLY_FILLED: "EXECUTING",
-                OrderStatus.NEW: "PENDING",
-                OrderStatus.PENDING_NEW: "PENDING",
-            }
-            
-            internal_status = status_map.get(status, "EXECUTING")
-            
-            # 获取原因消息（如资金不足）
-            reason = getattr(target_order, 'reason', '')
-            if not reason and hasattr(target_order, 'status_msg') and target_order.status_msg:
-                reason = target_order.status_msg
-            if not reason and hasattr(target_order, 'attr_desc') and target_order.attr_desc:
-                reason = target_order.attr_desc
-            
-            # 如果是撤单状态，补充一个描述
-            if internal_status == "CANCELLED" and not reason:
-                reason = "订单已被系统或用户撤销"
-            elif internal_status == "REJECTED" and not reason:
-                reason = "订单被券商拒绝"
-            
-            return {
-                "status": internal_status,
-                "filled_quantity": float(getattr(target_order, 'filled_quantity', 0)),
-                "avg_fill_price": float(getattr(target_order, 'avg_fill_price', 0)),
-                "message": reason or (status.name if hasattr(status, 'name') else str(status))
-            }
+            return _order_status_payload(target_order)
             
         except Exception as e:
-            logger.info(f" Error getting order status: {e}")
+            logger.warning("Error getting order status: %s", e)
             return {"status": "ERROR", "message": str(e)}
+
+    async def _fetch_single_order(self, account_id: str, order_id: str) -> Optional[Any]:
+        """按全局订单 ID 单笔查询；SDK 不支持、ID 非数字或查询失败时返回 None（由调用方回退）"""
+        get_order = getattr(self.trade_client, "get_order", None)
+        if get_order is None:
+            return None
+        try:
+            order_key = int(order_id)
+        except (TypeError, ValueError):
+            return None
+        try:
+            return await self._run_in_executor(get_order, account=account_id, id=order_key)
+        except Exception as e:
+            logger.debug("Single order query failed for %s, falling back to order list: %s", order_id, e)
+            return None
+
+    async def get_order_status_map(
+        self, account_id: str, since_ts: Optional[int] = None
+    ) -> Dict[str, dict]:
+        """一次拉取最近订单，返回 {订单ID: 状态字典}（id 与 order_id 均可作键）
+
+        供批量同步使用：N 个订单只需一次订单列表请求。查询失败时返回空字典，由调用方逐笔回退。
+        """
+        try:
+            orders = await self._run_in_executor(
+                self.trade_client.get_orders,
+                account=account_id,
+                start_time=since_ts,
+                limit=self.ORDER_BOOK_LOOKUP_LIMIT
+            )
+        except Exception as e:
+            logger.warning("Error getting order list: %s", e)
+            return {}
+
+        book: Dict[str, dict] = {}
+        for order in orders or ():
+            payload = _order_status_payload(order)
+            for key in (getattr(order, 'id', None), getattr(order, 'order_id', None)):
+                if key not in (None, ''):
+                    book[str(key)] = payload
+        return book
@@ -1,16 +1,60 @@
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, List, Optional
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import logging
+import operator
 
 from tigeropen.tiger_open_config import get_client_config
 from tigeropen.trade.trade_client import TradeClient
 from tigeropen.common.consts import SecurityType, Market
 
 from app.core.config import settings
+from app.core.cache import cache
+from .tiger_option_client import ensure_sdk_http_pool
 from .trade_history_client_base import TradeHistoryClient
 from .history_models import TradeRecord, DailyPnlRecord, TradeSide
 
+logger = logging.getLogger(__name__)
+
+# 历史成交缓存：已结束的日期成交不再变化，缓存一天；包含今天的区间只缓存一分钟
+_TRADES_CACHE_TTL_CLOSED = 24 * 3600
+_TRADES_CACHE_TTL_OPEN = 60
+
+
+# 已成交订单上用到的字段一次性批量读取；测试替身/旧版 SDK 缺字段时逐个回退
+_ORDER_FIELDS = ('contract', 'action', 'order_time', 'filled', 'avg_fill_price', 'realized_pnl', 'id')
+_ORDER_GETTER = operator.attrgetter(*_ORDER_FIELDS)
+_ORDER_DEFAULTS = (None, 'BUY', None, 0, 0, None, '')
+
+
+_BY_TIMESTAMP = operator.attrgetter('timestamp')
+
+
+def _order_fields(order) -> tuple:
+    try:
+        return _ORDER_GETTER(order)
+    except AttributeError:
+        return tuple(getattr(order, name, default) for name, default in zip(_ORDER_FIELDS, _ORDER_DEFAULTS))
+
+
+def _encode_trades(trades: List[TradeRecord]) -> list:
+    """成交记录转为紧凑的 JSON 行（按 TradeRecord 字段顺序，时间转为 ISO 字符串）"""
+    return [
+        [t.symbol, t.side, t.quantity, t.price, t.timestamp.isoformat(), t.realized_pnl, t.order_id]
+        for t in trades
+    ]
+
+
+def _decode_trades(rows: list) -> List[TradeRecord]:
+    return [
+        TradeRecord(symbol, side, quantity, price, datetime.fromisoformat(ts), realized_pnl, order_id)
+        for symbol, side, quantity, price, ts, realized_pnl, order_id in rows
+    ]
+
+
+def _trades_cache_ttl(last_day: date) -> int:
+    return _TRADES_CACHE_TTL_CLOSED if last_day < date.today() else _TRADES_CACHE_TTL_OPEN
+
 
 class TigerTradeHistoryClient(TradeHistoryClient):
     """老虎证券历史成交 / PnL 客户端（基于官方 tigeropen SDK）
@@ -18,6 +62,9 @@ class TigerTradeHistoryClient(TradeHistoryClient):
     使用 TradeClient 获取历史成交数据和盈亏记录。
     """
 
+    # list_trades_stream 每次请求覆盖的时间窗口（天，按固定网格对齐）
+    STREAM_WINDOW_DAYS = 7
+
     def __init__(self, private_key_path: str, tiger_id: str, account: str):
         """初始化 Tiger 客户端
 
@@ -27,18 +74,114 @@ class TigerTradeHistoryClient(TradeHistoryClient):
             account: 交易账户号
         """
         self.account = account
+        ensure_sdk_http_pool()
         self.client_config = get_client_config(
             private_key_path=private_key_path,
             tiger_id=tiger_id,
             account=account
         )
         self.trade_client = TradeClient(self.client_config)
-        self._executor = ThreadPoolExecutor(max_workers=2)
 
     async def _run_in_executor(self, func, *args, **kwargs):
-        """在线程池中运行同步的 SDK 调用"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+        """在事件循环默认线程池中运行同步的 SDK 调用（线程池在应用启动时统一配置）"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    @staticmethod
+    def _to_trade_record(order) -> Optional[TradeRecord]:
+        """将 Tiger 已成交订单转换为 TradeRecord（无合约或未成交时返回 None）"""
+        contract, action, order_time, filled_qty, avg_fill_price, realized_pnl, order_id = _order_fields(order)
+        # 先过滤，未成交的订单不做方向/时间解析
+        if not contract or not (filled_qty > 0 and avg_fill_price > 0):
+            return None
+
+        # 确定买卖方向
+        side: TradeSide = "BUY" if action.upper() == "BUY" else "SELL"
+
+        # 解析时间戳
+        if order_time:
+            ts = datetime.fromtimestamp(order_time / 1000.0)
+        else:
+            ts = datetime.utcnow()
+
+        return TradeRecord(
+            symbol=contract.symbol,
+            side=side,
+            quantity=float(filled_qty),
+            price=float(avg_fill_price),
+            timestamp=ts,
+            realized_pnl=float(realized_pnl) if realized_pnl is not None else None,
+            order_id=str(order_id),
+        )
+
+    async def _fetch_filled_trades(
+        self,
+        account_id: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[TradeRecord]:
+        """获取 [start, end] 区间内的美股股票 + 期权成交记录（按时间升序）
+
+        股票与期权成交分两次查询、并发执行，耗时为 max(t_stk, t_opt)。
+        股票查询失败时抛出异常；期权查询失败只记录警告，返回股票成交。
+        """
+        # 将 datetime 转为毫秒时间戳
+        start_time = int(start.timestamp() * 1000)
+        end_time = int(end.timestamp() * 1000)
+
+        stock_orders, option_orders = await asyncio.gather(
+            *(
+                self._run_in_executor(
+                    self.trade_client.get_filled_orders,
+                    account=account_id,
+                    sec_type=sec_type,
+                    market=Market.US,
+                    start_time=start_time,
+                    end_time=end_time
+                )
+                for sec_type in (SecurityType.STK, SecurityType.OPT)
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(stock_orders, BaseException):
+            raise stock_orders
+        if isinstance(option_orders, BaseException):
+            logger.warning("Error fetching option trade history: %s", option_orders)
+            option_orders = None
+
+        to_record = self._to_trade_record
+        results: List[TradeRecord] = [
+            tr
+            for orders in (stock_orders, option_orders)
+            for order in orders or ()
+            if (tr := to_record(order)) is not None
+        ]
+
+        # 按时间排序：SDK 返回的股票/期权成交各自基本有序，timsort 对这种由有序段
+        # 拼接的输入接近线性；排序键用 C 实现的 attrgetter
+        results.sort(key=_BY_TIMESTAMP)
+        return results
+
+    async def _cached_trades(
+        self,
+        account_id: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[TradeRecord]:
+        """按 (账户, 自然日区间) 读取 Redis 缓存，未命中时回源（并发的相同查询只回源一次）
+
+        缓存键只取起止日期，回源时拉取覆盖整天的区间再在内存中裁剪到 [start, end]，
+        滚动的 "截至现在" 查询因此复用同一个键，而不是每次换一个新键。
+        """
+        first_day, last_day = start.date(), end.date()
+        key = f"tiger_trades:{account_id}:{first_day.isoformat()}:{last_day.isoformat()}"
+
+        async def load() -> list:
+            day_start = datetime.combine(first_day, datetime.min.time())
+            day_end = datetime.combine(last_day, datetime.max.time())
+            return _encode_trades(await self._fetch_filled_trades(account_id, day_start, day_end))
+
+        rows = await cache.get_or_set(key, load, expire=_trades_cache_ttl(last_day))
+        return [t for t in _decode_trades(rows) if start <= t.timestamp <= end]
 
     async def list_trades(
         self,
@@ -48,77 +191,56 @@ class TigerTradeHistoryClient(TradeHistoryClient):
     ) -> List[TradeRecord]:
         """获取历史成交记录
 
-        使用 TradeClient.get_filled_orders() 获取已成交订单
+        使用 TradeClient.get_filled_orders() 获取已成交订单；结果按 (账户, 区间) 缓存在
+        Redis 中，重复查询同一区间时不再请求 SDK。跨越今天的区间拆成两段：
+        今天之前的部分区间固定、按天缓存，轮询 "截至现在" 的窗口时只有今天的成交需要回源。
+        查询失败的结果不缓存。
         """
-        results: List[TradeRecord] = []
-
         try:
-            # 将 datetime 转为毫秒时间戳
-            start_time = int(start.timestamp() * 1000)
-            end_time = int(end.timestamp() * 1000)
-
-            # 获取美股成交记录
-            filled_orders = await self._run_in_executor(
-                self.trade_client.get_filled_orders,
-                account=account_id,
-                sec_type=SecurityType.STK,
-                market=Market.US,
-                start_time=start_time,
-                end_time=end_time
-            )
+            today_start = datetime.combine(date.today(), datetime.min.time())
+            if start < today_start <= end:
+                # 两段查询区间两端均包含，已结束部分截止到今天零点前 1ms，避免边界成交重复
+                closed, recent = await asyncio.gather(
+                    self._cached_trades(account_id, start, today_start - timedelta(milliseconds=1)),
+                    self._cached_trades(account_id, today_start, end),
+                )
+                return closed + recent
+            return await self._cached_trades(account_id, start, end)
+        except Exception as e:
+            logger.warning("Error fetching trade history: %s", e)
+            return []
 
-            if filled_orders:
-                for order in filled_orders:
-                    if not order.contract:
-                        continue
-
-                    # 确定买卖方向
-                    side_str = getattr(order, 'action', 'BUY').upper()
-                    side: TradeSide = "BUY" if side_str == "BUY" else "SELL"
-
-                    # 解析时间戳
-                    order_time = getattr(order, 'order_time', None)
-                    if order_time:
-                        ts = datetime.fromtimestamp(order_time / 1000.0)
-                    else:
-                        ts = datetime.utcnow()
-
-                    # 获取已成交数量和平均成交价
-                    filled_qty = getattr(order, 'filled', 0)
-                    avg_fill_price = getattr(order, 'avg_fill_price', 0)
-
-                    # 获取已实现盈亏（如果有）
-                    realized_pnl = getattr(order, 'realized_pnl', None)
-
-                    if filled_qty > 0 and avg_fill_price > 0:
-                        tr = TradeRecord(
-                            symbol=order.contract.symbol,
-                            side=side,
-                            quantity=float(filled_qty),
-                            price=float(avg_fill_price),
-                            timestamp=ts,
-                            realized_pnl=float(realized_pnl) if realized_pnl is not None else None,
-                            order_id=str(getattr(order, 'id', '')),
-                        )
-                        results.append(tr)
-
-            # 如果需要添加期权成交记录，可以再查询一次
-            # option_orders = await self._run_in_executor(
-            #     self.trade_client.get_filled_orders,
-            #     account=account_id,
-            #     sec_type=SecurityType.OPT,
-            #     market=Market.US,
-            #     start_time=start_time,
-            #     end_time=end_time
-            # )
-            # ... 类似处理 ...
+    async def list_trades_stream(
+        self,
+        account_id: str,
+        start: datetime,
+        end: datetime,
+    ) -> AsyncIterator[TradeRecord]:
+        """流式获取历史成交记录
 
-        except Exception as e:
-            print(f"[TigerTradeHistoryClient] Error fetching trade history: {e}")
+        get_filled_orders 不提供分页参数，这里按 STREAM_WINDOW_DAYS 切分时间区间
+        逐段拉取，内存中最多只保留一个时间窗口的成交。窗口按固定的自然日网格对齐
+        （与查询起止时间无关），每个窗口与 list_trades 一样按日期缓存，
+        重复或滚动的流式查询复用相同的缓存键。
 
-        # 按时间排序
-        results.sort(key=lambda t: t.timestamp)
-        return results
+        某个窗口拉取失败时异常直接抛给调用方，不会静默截断；已产出的成交不撤回，
+        调用方应把整次结果视为不完整。
+        """
+        span = self.STREAM_WINDOW_DAYS
+        day = start.date()
+        while day <= end.date():
+            # 以公元序数日划分网格，窗口起止日期只取决于所在网格
+            grid_first = date.fromordinal((day.toordinal() - 1) // span * span + 1)
+            grid_last = grid_first + timedelta(days=span - 1)
+            trades = await self._cached_trades(
+                account_id,
+                datetime.combine(grid_first, datetime.min.time()),
+                datetime.combine(grid_last, datetime.max.time()),
+            )
+            for tr in trades:
+                if start <= tr.timestamp <= end:
+                    yield tr
+            day = grid_last + timedelta(days=1)
 
     async def list_daily_pnl(
         self,
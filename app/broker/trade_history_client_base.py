@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Protocol
+from typing import AsyncIterator, List, Protocol
 
 from .history_models import TradeRecord, DailyPnlRecord
 
@@ -23,6 +23,20 @@ class TradeHistoryClient(Protocol):
         """
         ...
 
+    def list_trades_stream(
+        self,
+        account_id: str,
+        start: datetime,
+        end: datetime,
+    ) -> AsyncIterator[TradeRecord]:
+        """list_trades 的流式版本：分页拉取并逐条产出成交记录。
+
+        - 只做聚合统计的调用方用 `async for` 消费，无需在内存中保留完整列表
+        - 产出顺序同样按 timestamp 升序
+        - 拉取失败时抛出异常，而不是静默结束迭代（调用方需能区分 "没有成交" 与 "结果不完整"）
+        """
+        ...
+
     async def list_daily_pnl(
         self,
         account_id: str,
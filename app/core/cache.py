@@ -1,9 +1,29 @@
-import json
-import pickle
-from typing import Any, Optional, Union
+import asyncio
+import logging
+import random
+import time
+import uuid
+
+import orjson
+from redis.exceptions import RedisError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from datetime import timedelta
 from app.models.db import redis_client
 
+logger = logging.getLogger(__name__)
+
+# orjson 默认不接受非字符串 key；与标准库 json 一致，把数字 key 转成字符串
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# flush_all 每轮 SCAN 的提示数量及每条 UNLINK 的 key 数
+_FLUSH_BATCH_SIZE = 500
+
+# get_or_set：回源锁的最长持有时间（秒）/ 未抢到锁时轮询结果的间隔（秒）/ TTL 随机抖动比例
+_LOCK_TIMEOUT = 5.0
+_LOCK_POLL_INTERVAL = 0.05
+_TTL_JITTER = 0.1
+
+
 class RedisCache:
     """
     Redis 缓存封装类
@@ -14,37 +34,148 @@ class RedisCache:
     def _make_key(self, key: str) -> str:
         return f"{self.prefix}{key}"
 
+    @staticmethod
+    def _decode(data: Any, is_json: bool) -> Any:
+        if data is None or not is_json:
+            return data
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return data
+
+    @staticmethod
+    def _encode(value: Any, is_json: bool) -> Union[bytes, str]:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS) if is_json else str(value)
+
     async def get(self, key: str, is_json: bool = True) -> Any:
         if not redis_client:
             return None
         
         data = await redis_client.get(self._make_key(key))
-        if data is None:
-            return None
-        
-        if is_json:
-            try:
-                return json.loads(data)
-            except:
-                return data
-        return data
+        return self._decode(data, is_json)
+
+    async def mget(self, keys: List[str], is_json: bool = True) -> List[Any]:
+        """批量读取（一次 MGET 往返），返回值与 keys 一一对应，缺失的为 None"""
+        if not redis_client or not keys:
+            return [None] * len(keys)
+
+        values = await redis_client.mget([self._make_key(key) for key in keys])
+        return [self._decode(data, is_json) for data in values]
 
     async def set(self, key: str, value: Any, expire: Union[int, timedelta] = None, is_json: bool = True) -> bool:
         if not redis_client:
             return False
         
-        if is_json:
-            data = json.dumps(value)
-        else:
-            data = str(value)
-            
-        return await redis_client.set(self._make_key(key), data, ex=expire)
+        return await redis_client.set(self._make_key(key), self._encode(value, is_json), ex=expire)
+
+    async def mset(self, mapping: Dict[str, Any], expire: Union[int, timedelta] = None, is_json: bool = True) -> bool:
+        """批量写入（SET ... EX 放在同一个 pipeline 中，一次往返），expire 对每个 key 生效"""
+        if not redis_client or not mapping:
+            return False
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self._make_key(key), self._encode(value, is_json), ex=expire)
+            results = await pipe.execute()
+        return all(results)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire: int,
+        stale: Optional[int] = None,
+        lock_timeout: float = _LOCK_TIMEOUT,
+    ) -> Any:
+        """读取缓存，过期或缺失时只由一个调用方回源（single-flight + stale-while-revalidate）
+
+        - 未过期：直接返回
+        - 已过期但仍在 stale 窗口内：抢到锁（SET NX PX）的调用方回源刷新，其余调用方直接返回旧值
+        - 不存在：抢到锁的调用方回源，其余调用方轮询等待结果，lock_timeout 后仍无结果则自行回源
+
+        值包装为 {"v": 值, "t": 过期时间戳} 存储，Redis TTL 为 expire + stale（stale 默认等于
+        expire），expire 随机增加最多 10% 以错开过期时间。loader 抛出的异常原样抛出，不写缓存；
+        Redis 不可用时直接调用 loader。
+        """
+        if not redis_client:
+            return await loader()
+
+        full_key = self._make_key(key)
+        try:
+            entry = self._unwrap(await redis_client.get(full_key))
+        except RedisError as e:
+            logger.debug("Cache read failed for %s, loading directly: %s", key, e)
+            return await loader()
+        if entry is not None and entry["t"] > time.time():
+            return entry["v"]
+
+        lock_key = self._make_key(f"lock:{key}")
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(lock_key, token, nx=True, px=int(lock_timeout * 1000))
+        except RedisError as e:
+            logger.debug("Cache lock failed for %s, loading directly: %s", key, e)
+            return entry["v"] if entry is not None else await loader()
+
+        if acquired:
+            try:
+                value = await loader()
+                ttl = expire + random.randint(0, int(expire * _TTL_JITTER))
+                wrapped = {"v": value, "t": time.time() + ttl}
+                try:
+                    await redis_client.set(
+                        full_key, self._encode(wrapped, True), ex=ttl + (expire if stale is None else stale)
+                    )
+                except RedisError as e:
+                    logger.debug("Cache write failed for %s: %s", key, e)
+                return value
+            finally:
+                # loader 成功或失败都立即释放锁，等待方不必等到 lock_timeout
+                await self._release_lock(lock_key, token)
+
+        if entry is not None:
+            return entry["v"]
+
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            try:
+                entry = self._unwrap(await redis_client.get(full_key))
+                if entry is not None:
+                    return entry["v"]
+                if not await redis_client.exists(lock_key):
+                    # 持锁方已结束却没有写入结果（回源失败），不再等待
+                    break
+            except RedisError as e:
+                logger.debug("Cache poll failed for %s, loading directly: %s", key, e)
+                break
+        return await loader()
+
+    def _unwrap(self, data: Any) -> Optional[Dict[str, Any]]:
+        """解析 get_or_set 写入的 {"v", "t"} 包装值；其他格式（如旧格式或外部写入）按缺失处理"""
+        entry = self._decode(data, True)
+        return entry if isinstance(entry, dict) and "t" in entry and "v" in entry else None
+
+    @staticmethod
+    async def _release_lock(lock_key: str, token: str) -> None:
+        """只释放自己持有的锁（回源超过 lock_timeout 时锁可能已被其他调用方获取）"""
+        try:
+            if await redis_client.get(lock_key) == token:
+                await redis_client.delete(lock_key)
+        except RedisError as e:
+            logger.debug("Cache lock release failed for %s: %s", lock_key, e)
 
     async def delete(self, key: str) -> bool:
         if not redis_client:
             return False
         return await redis_client.delete(self._make_key(key)) > 0
 
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除（一条 DEL 命令），返回实际删除的 key 数"""
+        if not redis_client or not keys:
+            return 0
+        return await redis_client.delete(*(self._make_key(key) for key in keys))
+
     async def exists(self, key: str) -> bool:
         """检查键是否存在"""
         if not redis_client:
@@ -52,12 +183,21 @@ class RedisCache:
         return await redis_client.exists(self._make_key(key)) > 0
 
     async def flush_all(self) -> bool:
+        """清除所有带有前缀的 key（慎用）
+
+        用 SCAN 增量遍历代替 KEYS，避免大 keyspace 下阻塞 Redis；每 _FLUSH_BATCH_SIZE
+        个 key 发一次 UNLINK，由 Redis 在后台线程回收内存。
+        """
         if not redis_client:
             return False
-        # 慎用，这会清除所有带有前缀的 key
-        keys = await redis_client.keys(f"{self.prefix}*")
-        if keys:
-            return await redis_client.delete(*keys) > 0
+        batch: List[str] = []
+        async for key in redis_client.scan_iter(match=f"{self.prefix}*", count=_FLUSH_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= _FLUSH_BATCH_SIZE:
+                await redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            await redis_client.unlink(*batch)
         return True
 
 # 全局缓存实例
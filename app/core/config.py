@@ -1,10 +1,12 @@
+from functools import cached_property, lru_cache
 from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit, quote_plus
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-# Locate the nearest .env starting from this file's directory
+# Locate the nearest .env starting from this file's directory (walked once per process)
+@lru_cache(maxsize=1)
 def find_env_file() -> Path | None:
     current = Path(__file__).resolve()
     for parent in current.parents:
@@ -29,8 +31,13 @@ class Settings(BaseSettings):
     MYSQL_USER: str = "root"
     MYSQL_PASSWORD: str = "password"
     MYSQL_DB: str = "ai_trading"
+    # MySQL 连接池：批量下单时每个信号使用独立会话并发执行，需要足够的常驻连接
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # 秒，早于 MySQL wait_timeout 回收空闲连接
 
-    @property
+    # 连接串只依赖启动时确定的配置，首次访问后缓存（含 quote_plus / Path.resolve）
+    @cached_property
     def DATABASE_URL(self) -> str:
         if self.DB_TYPE == "mysql":
             # 去掉可能的包裹引号（single/double quote）并对用户名/密码进行 URL 编码
@@ -53,8 +60,11 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
     REDIS_ENABLED: bool = True
+    # 连接池上限；连接耗尽时等待 REDIS_POOL_TIMEOUT 秒而不是立即报错
+    REDIS_MAX_CONNECTIONS: int = 32
+    REDIS_POOL_TIMEOUT: float = 5.0
 
-    @property
+    @cached_property
     def REDIS_URL(self) -> str:
         password_str = f":{self.REDIS_PASSWORD}@" if self.REDIS_PASSWORD else ""
         return f"redis://{password_str}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
@@ -187,4 +197,10 @@ class Settings(BaseSettings):
         return str(resolved_path)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """进程内唯一的 Settings 实例（.env 只解析一次），可直接用作 FastAPI 依赖"""
+    return Settings()
+
+
+settings = get_settings()
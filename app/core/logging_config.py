@@ -1,31 +1,47 @@
+import atexit
 import logging
+import queue
 import sys
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
+
+# 后台写日志的监听线程：业务线程/事件循环只把记录放入队列，stdout 写入在监听线程完成
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(level=logging.INFO):
     """
     配置全局日志格式
     格式: 2024-03-21 10:00:00.123 | INFO    | module:function:line - message
     """
-    
+    global _listener
+
     # 定义基础格式
     # %(levelname)-7s 让级别对齐 (INFO, WARNING, ERROR)
     # %(name)s:%(funcName)s:%(lineno)d 提供代码位置
     log_format = "%(asctime)s.%(msecs)03d | %(levelname)-7s | %(name)s:%(funcName)s:%(lineno)d - %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
 
-    # 配置根日志
+    # 配置根日志：根 logger 只挂 QueueHandler（入队不做 I/O），
+    # 真正的 StreamHandler 由 QueueListener 在后台线程中调用，事件循环不会阻塞在 stdout 上
     handler = logging.StreamHandler(sys.stdout)
     formatter = logging.Formatter(fmt=log_format, datefmt=date_format)
     handler.setFormatter(formatter)
 
+    if _listener is not None:
+        _listener.stop()
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
     root_logger = logging.getLogger()
     
     # 清除现有的 handlers 避免重复打印
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
         
-    root_logger.addHandler(handler)
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(level)
 
     # 抑制一些过于啰嗦的库日志
@@ -41,7 +57,18 @@ def setup_logging(level=logging.INFO):
         if logging_logger.handlers:
             logging_logger.handlers[0].setFormatter(formatter)
         else:
-            logging_logger.addHandler(handler)
+            logging_logger.addHandler(queue_handler)
 
     logging.info("🚀 Logging system initialized with standardized format")
     return root_logger
+
+
+def stop_logging() -> None:
+    """停止后台日志线程并写出队列中剩余的记录（进程退出时自动调用，可重复调用）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
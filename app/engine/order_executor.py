@@ -10,32 +10,87 @@
 6. 与broker集成
 """
 import asyncio
+import copy
+import logging
+import time
 from datetime import datetime
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
 from decimal import Decimal
 
-from sqlalchemy import select, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models.trading_signal import TradingSignal, SignalStatus
+from app.models.trade_journal import TradeJournal
+from app.models.db import SessionLocal, engine
 from app.broker.factory import make_option_broker_client
 from app.services.account_service import AccountService
 from app.services.risk_event_logger import log_risk_event
+from app.services.journal_service import JournalService
+from app.engine.signal_engine import SignalEngine
 from app.providers.market_data_provider import MarketDataProvider
 from app.core.trade_mode import TradeMode
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 券商侧的订单终态
+_TERMINAL_ORDER_STATUSES = frozenset({"FILLED", "CANCELLED", "REJECTED"})
+# 下单后确认的轮询间隔（秒），总计不超过原先固定等待的 3 秒；订单提前进入终态时立即返回
+_CONFIRM_POLL_DELAYS = (0.5, 1.0, 1.5)
+# 等待终态确认的订单：order_id -> Future；任何同步路径拿到终态都会唤醒等待方（同一进程内共享）
+_order_confirmations: Dict[str, asyncio.Future] = {}
+
+
+def _resolve_order_confirmation(order_id: str, resp: Dict[str, Any]) -> None:
+    """订单进入终态时唤醒正在等待确认的下单协程"""
+    future = _order_confirmations.get(str(order_id))
+    if future is not None and not future.done():
+        future.set_result(resp)
+
 
 class OrderExecutor:
     """订单执行引擎 - 将信号转化为实际交易"""
     
-    def __init__(self, session: AsyncSession):
+    # 批量执行时同时在途的券商下单请求上限（与批次大小无关，用于遵守券商限流）
+    EXECUTOR_MAX_CONCURRENCY = 4
+    
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: Optional[async_sessionmaker] = None
+    ):
         self.session = session
         self.broker = make_option_broker_client()
         self.account_svc = AccountService(session, self.broker)
         self.market_provider = MarketDataProvider()
         self.dry_run_mode = False  # 可通过配置控制
+        # 批量并发执行时每个信号使用独立会话（AsyncSession 不能被多个协程同时使用）；
+        # 会话绑定应用引擎时直接复用全局 SessionLocal，共享同一连接池
+        if session_factory is None:
+            session_factory = SessionLocal if session.bind is engine else async_sessionmaker(
+                session.bind, expire_on_commit=False, class_=AsyncSession
+            )
+        self._session_factory = session_factory
+    
+    # 依赖会话的服务对象每个执行器只构造一次（首次使用时），不再每个信号重复创建
+    @cached_property
+    def _signal_engine(self) -> SignalEngine:
+        return SignalEngine(self.session)
+
+    @cached_property
+    def _journal_svc(self) -> JournalService:
+        return JournalService(self.session)
+
+    def _bind_session(self, session: AsyncSession) -> "OrderExecutor":
+        """返回绑定到另一会话的执行器副本（共享券商/行情客户端，会话相关服务重新构造）"""
+        worker = copy.copy(self)
+        worker.session = session
+        worker.__dict__.pop("_signal_engine", None)
+        worker.__dict__.pop("_journal_svc", None)
+        return worker
     
     async def execute_signal_batch(
         self,
@@ -53,10 +108,7 @@ class OrderExecutor:
         4. 跟踪执行状态
         """
         # 获取待执行信号
-        from app.engine.signal_engine import SignalEngine
-        signal_engine = SignalEngine(self.session)
-        
-        pending_signals = await signal_engine.get_pending_signals(
+        pending_signals = await self._signal_engine.get_pending_signals(
             account_id=account_id,
             status=SignalStatus.VALIDATED,
             limit=max_orders
@@ -71,62 +123,87 @@ class OrderExecutor:
             }
         
         # 🛡️ 执行阶段去重保护：按symbol去重，保留信号强度最高的
+        # 单次遍历、每条信号一次字典查找；强度相同时保留先出现（优先级更高）的信号
         symbol_signal_map: Dict[str, TradingSignal] = {}
         for signal in pending_signals:
-            if signal.symbol not in symbol_signal_map:
+            current = symbol_signal_map.get(signal.symbol)
+            if current is None or signal.signal_strength > current.signal_strength:
                 symbol_signal_map[signal.symbol] = signal
-            else:
-                # 保留信号强度更高的
-                if signal.signal_strength > symbol_signal_map[signal.symbol].signal_strength:
-                    symbol_signal_map[signal.symbol] = signal
         
         # 使用去重后的信号列表
         pending_signals = list(symbol_signal_map.values())
         
-        # 获取账户信息
-        account_equity = await self.account_svc.get_equity_usd(account_id)
+        # 账户权益与整批行情（价格、港股一手股数）并发获取，行情每类只一次批量请求
+        price_symbols = [s.symbol for s in pending_signals if not s.suggested_price]
+        hk_symbols = [s.symbol for s in pending_signals if s.symbol.endswith(".HK")]
+        account_equity, price_map, lot_map = await asyncio.gather(
+            self.account_svc.get_equity_usd(account_id),
+            self._prefetch_market_data(self.market_provider.get_current_prices, price_symbols),
+            self._prefetch_market_data(self.market_provider.get_lot_sizes, hk_symbols),
+        )
         
         executed_count = 0
         failed_count = 0
-        queued_count = 0
-        
+
         execution_results = []
-        
-        for signal in pending_signals:
-            try:
-                # 更新信号状态为执行中
-                signal.status = SignalStatus.QUEUED
-                await self.session.commit()
-                queued_count += 1
-                
-                # 执行订单
-                result = await self._execute_single_signal(
-                    signal=signal,
-                    account_equity=account_equity,
-                    trade_mode=trade_mode
+
+        # 整批信号一次 UPDATE 标记为 QUEUED，只提交一次（替代逐条 commit）
+        signal_ids = [signal.signal_id for signal in pending_signals]
+        await self.session.execute(
+            update(TradingSignal)
+            .where(TradingSignal.signal_id.in_(signal_ids))
+            .values(status=SignalStatus.QUEUED)
+        )
+        await self.session.commit()
+        queued_count = len(pending_signals)
+
+        # 执行异常的信号在循环结束后统一回退为 VALIDATED
+        reset_ids: List[str] = []
+
+        # 各信号的下单互不依赖：并发执行，信号量限制同时在途的券商请求数
+        semaphore = asyncio.Semaphore(self.EXECUTOR_MAX_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *(
+                self._execute_signal_isolated(
+                    signal, account_equity, trade_mode, semaphore,
+                    current_price=price_map.get(signal.symbol),
+                    lot_size=lot_map.get(signal.symbol)
                 )
-                
-                execution_results.append(result)
-                
-                if result["success"]:
-                    executed_count += 1
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
+                for signal in pending_signals
+            ),
+            return_exceptions=True
+        )
+
+        for signal, outcome in zip(pending_signals, outcomes):
+            if isinstance(outcome, BaseException):
                 failed_count += 1
-                # 保持 VALIDATED 状态，以便在待执行列表中保留
-                signal.status = SignalStatus.VALIDATED
-                await self.session.commit()
+                reset_ids.append(signal.signal_id)
                 
                 await log_risk_event(
                     self.session,
                     account_id=account_id,
                     event_type="ORDER_EXECUTION_ERROR",
                     level="ERROR",
-                    message=f"Failed to execute signal {signal.signal_id}: {str(e)}",
+                    message=f"Failed to execute signal {signal.signal_id}: {str(outcome)}",
                     symbol=signal.symbol
                 )
+                continue
+
+            execution_results.append(outcome)
+            
+            if outcome["success"]:
+                executed_count += 1
+            else:
+                failed_count += 1
+
+        if reset_ids:
+            # 保持 VALIDATED 状态，以便在待执行列表中保留
+            await self.session.execute(
+                update(TradingSignal)
+                .where(TradingSignal.signal_id.in_(reset_ids))
+                .values(status=SignalStatus.VALIDATED)
+            )
+            await self.session.commit()
         
         return {
             "executed": executed_count,
@@ -135,16 +212,52 @@ class OrderExecutor:
             "results": execution_results
         }
     
+    async def _execute_signal_isolated(
+        self,
+        signal: TradingSignal,
+        account_equity: float,
+        trade_mode: Optional[TradeMode],
+        semaphore: asyncio.Semaphore,
+        current_price: Optional[float] = None,
+        lot_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """在独立会话中执行单个信号（供批量并发执行使用）"""
+        async with semaphore:
+            async with self._session_factory() as session:
+                worker = self._bind_session(session)
+                local_signal = await session.merge(signal, load=False)
+                return await worker._execute_single_signal(
+                    signal=local_signal,
+                    account_equity=account_equity,
+                    trade_mode=trade_mode,
+                    current_price=current_price,
+                    lot_size=lot_size
+                )
+    
+    async def _prefetch_market_data(self, fetch, symbols: List[str]) -> Dict[str, Any]:
+        """批量预取行情；失败时返回空映射，由各信号回退到逐个查询"""
+        if not symbols:
+            return {}
+        try:
+            return await fetch(symbols)
+        except Exception as e:
+            logger.warning("Market data prefetch failed for %s: %s", symbols, e)
+            return {}
+    
     async def _execute_single_signal(
         self,
         signal: TradingSignal,
         account_equity: float,
-        trade_mode: Optional[TradeMode] = None
+        trade_mode: Optional[TradeMode] = None,
+        current_price: Optional[float] = None,
+        lot_size: Optional[int] = None
     ) -> Dict[str, Any]:
-        """执行单个信号"""
+        """执行单个信号（current_price / lot_size 为批量预取的行情，缺省时单独查询）"""
         
         # 计算订单参数
-        order_params = await self._calculate_order_params(signal, account_equity)
+        order_params = await self._calculate_order_params(
+            signal, account_equity, current_price=current_price, lot_size=lot_size
+        )
         
         # 检查是否为演练模式
         if trade_mode == TradeMode.DRY_RUN or self.dry_run_mode:
@@ -154,6 +267,8 @@ class OrderExecutor:
         try:
             # 🚀 集成实际的券商 API 下单
             print(f"[OrderExecutor] Calling broker.place_order for {signal.symbol}")
+            # 下单时间下界（毫秒，留 60 秒余量应对时钟偏差），供后续订单状态查询缩小范围
+            placed_since_ts = int(time.time() * 1000) - 60_000
             resp = await self.broker.place_order(signal.account_id, order_params)
             
             if not resp.get("success"):
@@ -180,20 +295,19 @@ class OrderExecutor:
             )
             
             # 更新信号执行信息
-            from app.engine.signal_engine import SignalEngine
-            signal_engine = SignalEngine(self.session)
-            await signal_engine.update_signal_execution(
+            await self._signal_engine.update_signal_execution(
                 signal_id=signal.signal_id,
                 order_id=order_id,
                 executed_price=executed_price,
                 executed_quantity=executed_quantity
             )
             
-            # 🔍 下单后延迟检查：等待3秒后验证券商的最终状态
+            # 🔍 下单后确认：最多等待 3 秒验证券商的最终状态，订单一旦进入终态立即返回
             # 避免订单因资金不足等原因被撤销但系统未感知
-            print(f"[OrderExecutor] Waiting 3s to verify final order status for {order_id}...")
-            await asyncio.sleep(3)
-            status_check = await self.monitor_order_status(signal.account_id, order_id)
+            print(f"[OrderExecutor] Waiting up to 3s to verify final order status for {order_id}...")
+            status_check = await self._await_order_confirmation(
+                signal.account_id, order_id, since_ts=placed_since_ts, signal=signal
+            )
             
             # 如果券商已撤销或拒绝订单，返回失败
             if status_check.get("status") in ["CANCELLED", "REJECTED"]:
@@ -234,16 +348,24 @@ class OrderExecutor:
     async def _calculate_order_params(
         self,
         signal: TradingSignal,
-        account_equity: float
+        account_equity: float,
+        current_price: Optional[float] = None,
+        lot_size: Optional[int] = None
     ) -> Dict[str, Any]:
-        """计算订单参数 (包含碎股/一手限制逻辑)"""
+        """计算订单参数 (包含碎股/一手限制逻辑)
+
+        current_price / lot_size 已预取时直接使用，否则向行情源查询。
+        """
         
         # 基于信号和账户权益计算实际交易数量
         position_size_pct = signal.suggested_quantity or 0.10
         position_value = account_equity * position_size_pct
         
         # 获取当前市价
-        current_price = signal.suggested_price or await self.market_provider.get_current_price(signal.symbol)
+        if signal.suggested_price:
+            current_price = signal.suggested_price
+        elif current_price is None:
+            current_price = await self.market_provider.get_current_price(signal.symbol)
         if not current_price or current_price <= 0:
             current_price = 100.0  # 安全回退值
         
@@ -251,7 +373,8 @@ class OrderExecutor:
         
         # --- 港股一手限制处理 ---
         if signal.symbol.endswith(".HK"):
-            lot_size = await self.market_provider.get_lot_size(signal.symbol)
+            if lot_size is None:
+                lot_size = await self.market_provider.get_lot_size(signal.symbol)
             if lot_size > 1:
                 # 向下取整到 lot_size 的倍数
                 original_qty = quantity
@@ -346,9 +469,7 @@ class OrderExecutor:
 
         # 2. 记录到交易日志 (Trade Journal - 供前端展示和复盘)
         try:
-            from app.services.journal_service import JournalService
-            journal_svc = JournalService(self.session)
-            await journal_svc.create_from_execution(
+            await self._journal_svc.create_from_execution(
                 account_id=signal.account_id,
                 symbol=signal.symbol,
                 direction=signal.direction,
@@ -362,9 +483,14 @@ class OrderExecutor:
     async def monitor_order_status(
         self,
         account_id: str,
-        order_id: str
+        order_id: str,
+        signal: Optional[TradingSignal] = None
     ) -> Dict[str, Any]:
-        """监控订单状态并同步到信号状态"""
+        """监控订单状态并同步到信号状态
+
+        Args:
+            signal: 可选，已加载的关联信号；传入时跳过按 order_id 的查询
+        """
         
         # 🛡️ 参数检查
         if not order_id:
@@ -373,14 +499,58 @@ class OrderExecutor:
         # 1. 从券商获取最新状态
         print(f"[OrderExecutor] Checking status for order {order_id}")
         resp = await self.broker.get_order_status(account_id, order_id)
+        return await self._apply_order_status(order_id, resp, signal=signal)
+
+    async def _await_order_confirmation(
+        self,
+        account_id: str,
+        order_id: str,
+        since_ts: Optional[int] = None,
+        signal: Optional[TradingSignal] = None
+    ) -> Dict[str, Any]:
+        """等待订单进入终态（替代固定 sleep）
+
+        在轮询间隔内等待确认 Future：若其他同步路径（如 sync_executing_orders）先拿到终态则立即唤醒；
+        否则按间隔查询券商单笔订单状态，终态即返回。超时后以最后一次查询结果同步信号状态。
+        """
+        if not order_id:
+            return {"status": "UNKNOWN", "message": "No order_id provided"}
+
+        key = str(order_id)
+        future = asyncio.get_running_loop().create_future()
+        _order_confirmations[key] = future
+        resp: Dict[str, Any] = {"status": "UNKNOWN", "message": "Order status not confirmed"}
+        try:
+            for delay in _CONFIRM_POLL_DELAYS:
+                try:
+                    # 终态已由其他路径写库，直接返回
+                    return await asyncio.wait_for(asyncio.shield(future), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                resp = await self.broker.get_order_status(account_id, order_id, since_ts=since_ts)
+                if resp.get("status") in _TERMINAL_ORDER_STATUSES:
+                    break
+            return await self._apply_order_status(order_id, resp, signal=signal)
+        finally:
+            if _order_confirmations.get(key) is future:
+                del _order_confirmations[key]
+                future.cancel()
+
+    async def _apply_order_status(
+        self,
+        order_id: str,
+        resp: Dict[str, Any],
+        signal: Optional[TradingSignal] = None
+    ) -> Dict[str, Any]:
+        """将券商返回的订单状态同步到信号与交易日志（signal 已加载时不再查询）"""
         status = resp.get("status")  # FILLED, CANCELLED, REJECTED, PENDING, EXECUTING
         
         # 2. 更新关联的信号状态
-        from app.models.trading_signal import TradingSignal, SignalStatus
-        # 精确匹配 order_id (string)
-        stmt = select(TradingSignal).where(TradingSignal.order_id == str(order_id))
-        result = await self.session.execute(stmt)
-        signal = result.scalars().first()
+        if signal is None:
+            # 精确匹配 order_id (string)
+            stmt = select(TradingSignal).where(TradingSignal.order_id == str(order_id))
+            result = await self.session.execute(stmt)
+            signal = result.scalars().first()
         
         if signal:
             # 状态映射
@@ -399,9 +569,6 @@ class OrderExecutor:
 
             # 3. 如果已成交或失败，更新交易日志
             try:
-                from app.services.journal_service import JournalService
-                journal_svc = JournalService(self.session)
-                
                 updates = {}
                 if status == "FILLED":
                     updates = {
@@ -416,12 +583,15 @@ class OrderExecutor:
                     }
                 
                 if updates:
-                    await journal_svc.update_journal_by_signal(signal.signal_id, updates)
+                    await self._journal_svc.update_journal_by_signal(signal.signal_id, updates)
             except Exception as e:
                 print(f"[OrderExecutor] Failed to update journal for signal {signal.signal_id}: {e}")
         else:
             print(f"[OrderExecutor] No signal found matching order_id: {order_id}")
         
+        if status in _TERMINAL_ORDER_STATUSES:
+            _resolve_order_confirmation(order_id, resp)
+        
         return resp
     
     async def cancel_signal(self, signal_id: str) -> bool:
@@ -452,9 +622,10 @@ class OrderExecutor:
         return True
 
     async def sync_executing_orders(self, account_id: str) -> Dict[str, Any]:
-        """批量同步执行中订单的状态"""
-        from app.models.trading_signal import TradingSignal, SignalStatus
-        
+        """批量同步执行中订单的状态
+
+        复用外层查询出的信号（不再逐单 SELECT），按目标状态分组批量 UPDATE，整批只提交一次。
+        """
         # 1. 查找所有处理中的信号
         stmt = select(TradingSignal).where(
             and_(
@@ -470,32 +641,111 @@ class OrderExecutor:
             
         print(f"[OrderExecutor] Syncing {len(active_signals)} executing orders for account {account_id}")
         
-        updates = 0
-        for signal in active_signals:
-            if not signal.order_id:
+        # 2. 一次拉取最近订单并按 order_id 建索引；订单簿中缺失的订单并发逐笔查询
+        try:
+            order_book = await self.broker.get_order_status_map(account_id)
+        except Exception as e:
+            print(f"[OrderExecutor] Failed to load order book, falling back to per-order queries: {e}")
+            order_book = {}
+        
+        tracked = [signal for signal in active_signals if signal.order_id]
+        missing = [signal for signal in tracked if str(signal.order_id) not in order_book]
+        if missing:
+            fetched = await asyncio.gather(
+                *(self.broker.get_order_status(account_id, signal.order_id) for signal in missing),
+                return_exceptions=True
+            )
+            for signal, resp in zip(missing, fetched):
+                if isinstance(resp, BaseException):
+                    print(f"[OrderExecutor] Error syncing signal {signal.signal_id}: {resp}")
+                    continue
+                order_book[str(signal.order_id)] = resp
+        
+        # 3. 按目标状态分组
+        now = datetime.utcnow()
+        filled_rows: List[Dict[str, Any]] = []
+        reset_rows: List[Dict[str, Any]] = []
+        filled_journals: List[Dict[str, Any]] = []
+        failed_journals: List[Dict[str, Any]] = []
+        terminal: List[tuple] = []
+        for signal in tracked:
+            resp = order_book.get(str(signal.order_id))
+            if resp is None:
                 continue
+            status = resp.get("status")
+            if status == "FILLED":
+                filled_rows.append({
+                    "id": signal.id,
+                    "status": SignalStatus.EXECUTED,
+                    "executed_price": resp.get("avg_fill_price"),
+                    "executed_quantity": resp.get("filled_quantity"),
+                    "executed_at": now,
+                })
+                filled_journals.append({
+                    "b_signal_id": signal.signal_id,
+                    "b_entry_price": resp.get("avg_fill_price"),
+                    "b_quantity": resp.get("filled_quantity"),
+                })
+            elif status in ["CANCELLED", "REJECTED"]:
+                # 用户要求执行失败不从待执行列表删除，因此重置为 VALIDATED，并清除已失效订单ID
+                reset_rows.append({"id": signal.id, "status": SignalStatus.VALIDATED, "order_id": None})
+                failed_journals.append({
+                    "b_signal_id": signal.signal_id,
+                    "b_lesson": f"交易执行失败: {resp.get('message')}",
+                })
+            else:
+                continue
+            terminal.append((signal.signal_id, signal.symbol, signal.order_id, resp))
+        
+        if not terminal:
+            return {"synced": len(active_signals), "updates": 0}
+        
+        # 4. 每种目标状态一条 executemany UPDATE，整批一次提交
+        if filled_rows:
+            await self.session.execute(update(TradingSignal), filled_rows)
+        if reset_rows:
+            await self.session.execute(update(TradingSignal), reset_rows)
+        try:
+            # 交易日志更新失败不影响信号状态（保存点内执行）
+            async with self.session.begin_nested():
+                journal = TradeJournal.__table__
+                if filled_journals:
+                    await self.session.execute(
+                        update(journal)
+                        .where(journal.c.signal_id == bindparam("b_signal_id"))
+                        .values(
+                            journal_status="COMPLETED",
+                            entry_price=bindparam("b_entry_price"),
+                            quantity=bindparam("b_quantity"),
+                        ),
+                        filled_journals
+                    )
+                if failed_journals:
+                    await self.session.execute(
+                        update(journal)
+                        .where(journal.c.signal_id == bindparam("b_signal_id"))
+                        .values(journal_status="FAILED", lesson_learned=bindparam("b_lesson")),
+                        failed_journals
+                    )
+        except Exception as e:
+            print(f"[OrderExecutor] Failed to update journals during order sync: {e}")
+        await self.session.commit()
+        
+        for signal_id, symbol, order_id, resp in terminal:
+            status = resp.get("status")
+            print(f"[OrderExecutor] Updated signal {signal_id} ({symbol}). Broker status: {status}")
+            _resolve_order_confirmation(order_id, resp)
+            
+            # 如果状态变为 FAILED，且是真实的下单，我们需要补充日志
+            if status in ["CANCELLED", "REJECTED"]:
+                # 记录风险事件描述失败原因
+                await log_risk_event(
+                    self.session,
+                    account_id=account_id,
+                    event_type="ORDER_FAILED",
+                    level="WARNING",
+                    message=f"Order {order_id} ({symbol}) failed at broker: {resp.get('message')}",
+                    symbol=symbol
+                )
                 
-            try:
-                # 获取券商侧状态
-                resp = await self.monitor_order_status(account_id, signal.order_id)
-                new_status = resp.get("status")
-                
-                # monitor_order_status 已经处理了 commit，我们这里记录更新数
-                if new_status in ["FILLED", "CANCELLED", "REJECTED"]:
-                    updates += 1
-                    
-                    # 如果状态变为 FAILED，且是真实的下单，我们需要补充日志
-                    if new_status in ["CANCELLED", "REJECTED"]:
-                        # 记录风险事件描述失败原因
-                        await log_risk_event(
-                            self.session,
-                            account_id=account_id,
-                            event_type="ORDER_FAILED",
-                            level="WARNING",
-                            message=f"Order {signal.order_id} ({signal.symbol}) failed at broker: {resp.get('message')}",
-                            symbol=signal.symbol
-                        )
-            except Exception as e:
-                print(f"[OrderExecutor] Error syncing signal {signal.signal_id}: {e}")
-                
-        return {"synced": len(active_signals), "updates": updates}
+        return {"synced": len(active_signals), "updates": len(terminal)}
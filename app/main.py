@@ -7,6 +7,7 @@ from typing import Optional, AsyncGenerator, Callable
 from app.i18n import get_translator
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import os
 
@@ -23,7 +24,7 @@ from app.services.trading_plan_service import TradingPlanService
 from app.providers.market_data_provider import MarketDataProvider
 from app.services.option_exposure_service import OptionExposureService
 from app.schemas.ai_state import AiStateView, LimitsView, SymbolBehaviorView, ExposureView
-from app.broker.factory import make_option_broker_client
+from app.broker.factory import make_option_broker_client, close_broker_clients
 from app.schemas.ai_advice import (
     AiAdviceRequest, 
     AiAdviceResponse, 
@@ -63,6 +64,10 @@ from app.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# 默认线程池容量：与 Tiger 接口并发上限匹配
+_DEFAULT_EXECUTOR_WORKERS = 16
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理：启动时初始化调度器，关闭时清理"""
@@ -76,6 +81,11 @@ async def lifespan(app: FastAPI):
         )
     )
 
+    # 统一配置默认线程池：券商 SDK 等阻塞调用（asyncio.to_thread / run_in_executor(None)）共享
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=_DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="app-io")
+    )
+
     scheduler = None
     if settings.ENABLE_SCHEDULER:
         scheduler = init_scheduler()
@@ -103,8 +113,11 @@ async def lifespan(app: FastAPI):
         shutdown_scheduler(wait=True)
         logger.info("Scheduler shut down")
     
+    await close_broker_clients()
+    logger.info("Broker clients closed")
+
     if redis_client:
-        await redis_client.close()
+        await redis_client.aclose()
         logger.info("Redis connection closed")
 
     # 显式释放数据库异步引擎，避免 aiomysql 在事件循环关闭时触发 __del__ 异常
@@ -402,13 +415,14 @@ async def rebuild_behavior_stats(
     svc = BehaviorScoringService(session)
     metrics_map = await svc.run_for_account(account_id, window_days)
 
-    return {
+    # 直接交给 orjson 序列化 dataclass，跳过 jsonable_encoder 的逐字段 Python 遍历
+    return ORJSONResponse({
         "status": "ok",
         "account_id": account_id,
         "window_days": window_days,
         "symbols_processed": list(metrics_map.keys()),
-        "metrics": {sym: m.__dict__ for sym, m in metrics_map.items()},
-    }
+        "metrics": metrics_map,
+    })
 
 
 @app.get("/api/v1/admin/scheduler/jobs")
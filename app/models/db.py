@@ -17,9 +17,9 @@ engine_kwargs = {
 if settings.DB_TYPE == "mysql":
     engine_kwargs.update({
         "pool_pre_ping": True,
-        "pool_recycle": 3600,
-        "pool_size": 10,
-        "max_overflow": 20,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
     })
 
 engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
@@ -34,10 +34,16 @@ SessionLocal = async_sessionmaker(
 # 创建 Redis 客户端
 redis_client = None
 if settings.REDIS_ENABLED:
-    redis_client = redis.from_url(
-        settings.REDIS_URL,
-        encoding="utf-8",
-        decode_responses=True
+    # 有界阻塞连接池：并发突发时排队等待空闲连接，不会无限新建连接；
+    # from_pool 让客户端接管连接池，关闭客户端时一并断开池中连接
+    redis_client = redis.Redis.from_pool(
+        redis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            encoding="utf-8",
+            decode_responses=True,
+        )
     )
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -70,6 +76,11 @@ async def ensure_mysql_indexes() -> None:
             "position_trend_snapshots",
             "CREATE INDEX ix_trend_account_symbol_timeframe_ts ON position_trend_snapshots (account_id, symbol, timeframe, timestamp)",
         ),
+        (
+            "ix_strategy_runs_created_at_id",
+            "strategy_runs",
+            "CREATE INDEX ix_strategy_runs_created_at_id ON strategy_runs (created_at, id)",
+        ),
     ]
 
     async with engine.begin() as conn:
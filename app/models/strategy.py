@@ -79,6 +79,7 @@ class StrategyRun(Base):
 
     __table_args__ = (
         Index("ix_strategy_runs_status", "status"),
+        Index("ix_strategy_runs_created_at_id", "created_at", "id"),
     )
 
 
@@ -15,12 +15,13 @@
 import pandas as pd
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
-from functools import lru_cache
+from functools import lru_cache, partial
 import time
 
 from app.core.config import settings
 from app.core.cache import cache
 from app.services.api_monitoring_service import api_monitor, APIProvider
+from app.broker.tiger_option_client import get_shared_quote_client
 
 try:
     import yfinance as yf
@@ -37,8 +38,16 @@ except Exception:  # pragma: no cover
     BarPeriod = None
 
 import asyncio
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 
+# 最小交易单位（lot size）日内基本不变：进程级缓存，所有 MarketDataProvider 实例共享
+# （执行器每次请求都会新建 provider，实例级缓存跨批次无法命中）
+# {symbol: (lot_size, 写入时间)}，按最近使用排序，超出容量淘汰最久未用的
+_LOT_SIZE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_LOT_SIZE_CACHE_SIZE = 4096
+_LOT_SIZE_CACHE_TTL = 3600 * 24  # 缓存1天
+
 
 class MarketDataProvider:
     """市场数据提供者"""
@@ -57,30 +66,27 @@ class MarketDataProvider:
         self._price_cache: Dict[str, tuple] = {}
         self._price_cache_ttl = 60  # 价格缓存1分钟
         
-        # Symbol信息缓存 (包含 lot_size)
-        self._symbol_info_cache: Dict[str, tuple] = {}
-        self._symbol_info_ttl = 3600 * 24  # 缓存1天
-        
         # 请求频率控制: 记录每个symbol的最后请求时间
         self._last_request_time: Dict[str, float] = {}
         self._request_min_interval = 1.0  # 每个symbol最少间隔1秒
 
         if settings.TIGER_PRIVATE_KEY_PATH and settings.TIGER_ID and get_client_config and QuoteClient:
             try:
-                client_config = get_client_config(
-                    private_key_path=settings.TIGER_PRIVATE_KEY_PATH,
-                    tiger_id=settings.TIGER_ID,
-                    account=settings.TIGER_ACCOUNT,
+                # 复用券商侧共享的 QuoteClient：不再每个实例重新读取私钥、建立新连接，
+                # 请求走进程内共享的长连接池
+                self._tiger_quote_client = get_shared_quote_client(
+                    settings.TIGER_PRIVATE_KEY_PATH,
+                    settings.TIGER_ID,
+                    settings.TIGER_ACCOUNT,
                 )
-                self._tiger_quote_client = QuoteClient(client_config)
             except Exception:
                 # 初始化失败则回退到 yfinance
                 self._tiger_quote_client = None
 
     async def _run_in_executor(self, func, *args, **kwargs):
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         if kwargs:
-            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
         return await loop.run_in_executor(self._executor, func, *args)
 
     async def _run_external(self, func, *args, **kwargs):
@@ -228,6 +234,43 @@ class MarketDataProvider:
             print(f"[MarketData] Yahoo Finance price failed for {symbol}: {e}")
             return 0.0
     
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """批量获取当前价格 - 缓存未命中的 symbol 合并为一次 Tiger briefs 请求
+
+        Tiger 未返回或未配置的 symbol 并发回退到 get_current_price（含 Yahoo 兜底）。
+        """
+        prices: Dict[str, float] = {}
+        missing: List[str] = []
+        for symbol in dict.fromkeys(symbols):
+            cached_price = self._get_cached_price(symbol)
+            if cached_price is not None:
+                prices[symbol] = cached_price
+            else:
+                missing.append(symbol)
+
+        if missing and self._tiger_quote_client:
+            try:
+                # 批量请求同样遵守每个 symbol 的最小请求间隔
+                await asyncio.gather(*(self._wait_for_rate_limit(symbol) for symbol in missing))
+                df = await self._run_external(self._tiger_quote_client.get_stock_briefs, missing)
+                if df is not None and len(df) > 0 and "symbol" in df.columns:
+                    keys = [key for key in ("latest_price", "latestPrice", "close", "pre_close") if key in df.columns]
+                    for symbol, *values in zip(df["symbol"], *(df[key] for key in keys)):
+                        for value in values:
+                            if value is not None and not pd.isna(value):
+                                price = float(value)
+                                prices[symbol] = price
+                                self._cache_price(symbol, price)
+                                break
+            except Exception as e:
+                print(f"[MarketData] Tiger batch price failed for {missing}: {e}")
+
+        remaining = [symbol for symbol in missing if symbol not in prices]
+        if remaining:
+            fetched = await asyncio.gather(*(self.get_current_price(symbol) for symbol in remaining))
+            prices.update(zip(remaining, fetched))
+        return prices
+
     async def get_quote(self, symbol: str) -> Dict:
         """获取实时报价"""
         if self._tiger_quote_client:
@@ -541,6 +584,62 @@ class MarketDataProvider:
             oldest_symbol = min(self._price_cache.items(), key=lambda x: x[1][1])[0]
             del self._price_cache[oldest_symbol]
 
+    def _get_cached_lot_size(self, symbol: str) -> Optional[int]:
+        """获取缓存的最小交易单位（命中时刷新 LRU 顺序，过期则删除）"""
+        entry = _LOT_SIZE_CACHE.get(symbol)
+        if entry is None:
+            return None
+        lot_size, timestamp = entry
+        if time.time() - timestamp >= _LOT_SIZE_CACHE_TTL:
+            del _LOT_SIZE_CACHE[symbol]
+            return None
+        _LOT_SIZE_CACHE.move_to_end(symbol)
+        return lot_size
+
+    def _cache_lot_size(self, symbol: str, lot_size: int):
+        """缓存最小交易单位（只缓存 API 返回值，不缓存兜底默认值）"""
+        _LOT_SIZE_CACHE[symbol] = (lot_size, time.time())
+        _LOT_SIZE_CACHE.move_to_end(symbol)
+        if len(_LOT_SIZE_CACHE) > _LOT_SIZE_CACHE_SIZE:
+            _LOT_SIZE_CACHE.popitem(last=False)
+
+    async def get_lot_sizes(self, symbols: List[str]) -> Dict[str, int]:
+        """批量获取最小交易单位 - 港股缓存未命中时合并为一次 Tiger briefs 请求
+
+        briefs 不含 lot_size 或请求失败的 symbol 并发回退到 get_lot_size。
+        """
+        lot_sizes: Dict[str, int] = {}
+        missing: List[str] = []
+        for symbol in dict.fromkeys(symbols):
+            if not symbol.endswith(".HK"):
+                lot_sizes[symbol] = await self.get_lot_size(symbol)
+                continue
+            cached_lot = self._get_cached_lot_size(symbol)
+            if cached_lot is not None:
+                lot_sizes[symbol] = cached_lot
+            else:
+                missing.append(symbol)
+
+        if missing and self._tiger_quote_client:
+            try:
+                await asyncio.gather(*(self._wait_for_rate_limit(symbol) for symbol in missing))
+                briefs = await self._run_external(self._tiger_quote_client.get_stock_briefs, missing)
+                if briefs is not None and not briefs.empty and {"symbol", "lot_size"} <= set(briefs.columns):
+                    for symbol, lot in zip(briefs["symbol"], briefs["lot_size"]):
+                        if pd.isna(lot):
+                            continue
+                        lot_size = int(lot)
+                        lot_sizes[symbol] = lot_size
+                        self._cache_lot_size(symbol, lot_size)
+            except Exception as e:
+                print(f"[MarketDataProvider] Error fetching lot sizes for {missing}: {e}")
+
+        remaining = [symbol for symbol in missing if symbol not in lot_sizes]
+        if remaining:
+            fetched = await asyncio.gather(*(self.get_lot_size(symbol) for symbol in remaining))
+            lot_sizes.update(zip(remaining, fetched))
+        return lot_sizes
+
     async def get_lot_size(self, symbol: str) -> int:
         """获取合约最小交易单位 (Lot Size)
         
@@ -555,10 +654,9 @@ class MarketDataProvider:
             return 1 # 美股大都支持1股或碎股，这里按最小1股计
             
         # 2. 缓存检查
-        if symbol in self._symbol_info_cache:
-            info, timestamp = self._symbol_info_cache[symbol]
-            if time.time() - timestamp < self._symbol_info_ttl:
-                return info.get("lot_size", 1)
+        cached_lot = self._get_cached_lot_size(symbol)
+        if cached_lot is not None:
+            return cached_lot
 
         # 3. 如果是港股，必须查 API 获取准确 lot_size
         if symbol.endswith(".HK"):
@@ -585,7 +683,7 @@ class MarketDataProvider:
                             if details is not None and not details.empty:
                                 lot_size = int(details.iloc[0].get('lot_size', 1))
                         
-                        self._symbol_info_cache[symbol] = ({"lot_size": lot_size}, time.time())
+                        self._cache_lot_size(symbol, lot_size)
                         return lot_size
                 except Exception as e:
                     print(f"[MarketDataProvider] Error fetching lot size for {symbol}: {e}")
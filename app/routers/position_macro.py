@@ -1,9 +1,12 @@
 """持仓评估和宏观风险分析API端点"""
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from dataclasses import asdict
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime, timedelta
 import asyncio
+import logging
 import time
 
 from app.schemas.position_assessment import (
@@ -22,12 +25,15 @@ from app.services.macro_risk_scoring_service import MacroRiskScoringService
 from app.services.geopolitical_events_service import GeopoliticalEventsService
 from app.services.ai_analysis_service import AIAnalysisService
 from app.broker.factory import make_option_broker_client
+from app.broker.dummy_option_client import DummyOptionClient
 from app.providers.market_data_provider import MarketDataProvider
 from app.core.cache import cache
 from app.core.config import settings
 from app.models.db import SessionLocal
 from app.jobs.scheduler import add_job
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -38,6 +44,24 @@ async def get_session():
         yield session
 
 
+@router.get("/positions/underlyings")
+async def get_underlying_positions():
+    """获取当前股票/ETF 持仓原始数据
+
+    演示客户端的数据恒定，直接返回导入时预序列化好的 JSON 字节。
+    """
+    trade_client = make_option_broker_client()
+    if isinstance(trade_client, DummyOptionClient):
+        return Response(trade_client.underlying_positions_json(), media_type="application/json")
+
+    try:
+        account_id = await trade_client.get_account_id()
+        positions = await trade_client.list_underlying_positions(account_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching underlying positions: {str(e)}")
+    return ORJSONResponse([asdict(p) for p in positions])
+
+
 @router.get("/positions/assessment", response_model=PositionsAssessmentResponse)
 async def get_positions_assessment(
     window_days: int = Query(7, description="窗口期（天）"),
@@ -71,7 +95,7 @@ async def get_positions_assessment(
         try:
             option_positions = await trade_client.list_option_positions(account_id)
         except Exception as e:
-            print(f"[PositionAssessment] Option positions unavailable, fallback to empty. reason={e}")
+            logger.warning("[PositionAssessment] Option positions unavailable, fallback to empty. reason=%s", e)
             option_positions = []
         
         # 按标的分组期权持仓
@@ -191,7 +215,7 @@ async def get_positions_assessment(
             elif symbol_options and len(symbol_options) > 0:
                 current_price = symbol_options[0].underlying_price
             else:
-                print(f"[PositionAssessment] Skipping {symbol}: no price available")
+                logger.debug("[PositionAssessment] Skipping %s: no price available", symbol)
                 continue
             
             # 计算综合市值和盈亏
@@ -229,7 +253,7 @@ async def get_positions_assessment(
                         only_today=True
                     )
                 except Exception as e:
-                    print(f"[PositionAssessment] Error generating snapshot for {symbol}: {e}")
+                    logger.warning("[PositionAssessment] Error generating snapshot for %s: %s", symbol, e)
                     # 记录错误，后续会自动尝试获取历史数据作为兜底
             
             # 关键优化：如果依然没有今日快照（生成失败或未开启强制刷新），则回退到历史最近的一次记录作为“降级展示”
@@ -241,7 +265,7 @@ async def get_positions_assessment(
                     only_today=False
                 )
                 if snapshot:
-                    print(f"[PositionAssessment] Found historical snapshot for {symbol}, using as fallback.")
+                    logger.debug("[PositionAssessment] Found historical snapshot for %s, using as fallback.", symbol)
             
             # 处理最终依然为空的情况
             if not snapshot:
@@ -394,7 +418,7 @@ async def get_positions_assessment(
                 portfolio_analysis["ai_summary"] = portfolio_ai.get("summary")
                 ai_recommendations = portfolio_ai.get("recommendations", [])
         except Exception as e:
-            print(f"[PositionAssessment] AI Portfolio analysis failed: {e}")
+            logger.warning("[PositionAssessment] AI Portfolio analysis failed: %s", e)
 
         avg_score = total_score / len(position_assessments) if position_assessments else 0.0
         
@@ -664,7 +688,7 @@ async def refresh_positions_assessment(
                         await cache.set(f"positions_refresh:timing:{run_account_id}:{sym}", {"technical_ms": elapsed, "timestamp": datetime.now().isoformat()}, expire=3600)
                         return sym, data
                     except Exception as e:
-                        print(f"Error refreshing technical for {sym}: {e}")
+                        logger.warning("Error refreshing technical for %s: %s", sym, e)
                         await cache.set(f"positions_refresh:timing:{run_account_id}:{sym}", {"technical_ms": -1, "error": str(e), "timestamp": datetime.now().isoformat()}, expire=3600)
                         return sym, None
 
@@ -686,7 +710,7 @@ async def refresh_positions_assessment(
                         await cache.set(f"positions_refresh:timing:{run_account_id}:{sym}", existing, expire=3600)
                         return sym, score_obj is not None
                     except Exception as e:
-                        print(f"Error refreshing score for {sym}: {e}")
+                        logger.warning("Error refreshing score for %s: %s", sym, e)
                         existing = await cache.get(f"positions_refresh:timing:{run_account_id}:{sym}") or {}
                         existing.update({"score_ms": -1, "error_score": str(e)})
                         await cache.set(f"positions_refresh:timing:{run_account_id}:{sym}", existing, expire=3600)
@@ -294,12 +294,26 @@ async def list_strategy_runs(
     strategy_id: Optional[str] = Query(None),
     account_id: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
+    after_created_at: Optional[datetime] = Query(None, description="keyset 游标：上一页最后一条的 created_at"),
+    after_id: Optional[str] = Query(None, description="keyset 游标：上一页最后一条的 run_id"),
     session: AsyncSession = Depends(get_session),
     current_user: str = Depends(get_current_user),
 ):
     svc = StrategyRunService(session)
-    runs = await svc.list_runs(limit=limit, offset=offset, strategy_id=strategy_id, account_id=account_id, status=status)
-    return StrategyRunHistoryResponse(runs=[_to_history_item(r) for r in runs])
+    runs = await svc.list_runs(
+        limit=limit,
+        offset=offset,
+        strategy_id=strategy_id,
+        account_id=account_id,
+        status=status,
+        after_created_at=after_created_at,
+        after_id=after_id,
+    )
+    response = StrategyRunHistoryResponse(runs=[_to_history_item(r) for r in runs])
+    if len(runs) == limit:
+        response.next_after_created_at = runs[-1].created_at
+        response.next_after_id = runs[-1].id
+    return response
 
 
 @router.get("/strategy-runs/{run_id}/results", response_model=StrategyRunResultsResponse)
@@ -104,6 +104,9 @@ class StrategyRunHistoryView(BaseModel):
 class StrategyRunHistoryResponse(BaseModel):
     status: str = "ok"
     runs: List[StrategyRunHistoryView] = Field(default_factory=list)
+    # keyset 分页游标：作为下一页请求的 after_created_at / after_id
+    next_after_created_at: Optional[datetime] = None
+    next_after_id: Optional[str] = None
 
 
 class StrategyRunAssetView(BaseModel):
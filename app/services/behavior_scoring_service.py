@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
@@ -11,6 +12,8 @@ from app.broker.history_factory import make_trade_history_client
 from app.broker.history_models import TradeRecord
 from app.models.symbol_behavior_stats import SymbolBehaviorStats
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SymbolBehaviorMetrics:
@@ -58,13 +61,17 @@ class BehaviorScoringService:
             as_of = datetime.utcnow()
         start = as_of - timedelta(days=window_days)
 
-        trades = await self.history_client.list_trades(account_id, start, as_of)
-        if not trades:
-            return {}
-
+        # 流式拉取，边读边按标的分组，不再额外保留一份完整的成交列表；
+        # 拉取中途失败时不落库部分结果（与 list_trades 失败时返回空一致）
         trades_by_symbol: Dict[str, List[TradeRecord]] = {}
-        for tr in trades:
-            trades_by_symbol.setdefault(tr.symbol, []).append(tr)
+        try:
+            async for tr in self.history_client.list_trades_stream(account_id, start, as_of):
+                trades_by_symbol.setdefault(tr.symbol, []).append(tr)
+        except Exception as e:
+            logger.warning("Error fetching trade history for %s: %s", account_id, e)
+            return {}
+        if not trades_by_symbol:
+            return {}
 
         metrics_map: Dict[str, SymbolBehaviorMetrics] = {}
         for symbol, symbol_trades in trades_by_symbol.items():
@@ -247,8 +247,10 @@ class DashboardV2Service:
         """获取盈亏归因（Top贡献者和亏损者）"""
         try:
             # 获取当前持仓的未实现盈亏作为归因参考
-            stk_positions = await self.broker.list_underlying_positions(account_id)
-            opt_positions = await self.broker.list_option_positions(account_id)
+            stk_positions, opt_positions = await asyncio.gather(
+                self.broker.list_underlying_positions(account_id),
+                self.broker.list_option_positions(account_id),
+            )
             
             all_attrs = []
             for p in stk_positions:
@@ -413,13 +415,9 @@ class DashboardV2Service:
     async def _get_positions_summary(self, account_id: str) -> List[PositionSummary]:
         """获取持仓摘要"""
         try:
-            # 1. 获取股票持仓
-            stk_positions = await self.broker.list_underlying_positions(account_id)
-            # 2. 获取期权持仓
-            opt_positions = await self.broker.list_option_positions(account_id)
-            
-            # 获取总权益用于计算权重
-            total_equity = await self._get_current_equity(account_id) or 1.0
+            # 股票持仓、期权持仓、总权益（用于计算权重）一次并发获取
+            stk_positions, opt_positions, equity = await self.broker.snapshot(account_id)
+            total_equity = float(equity or 0) or 1.0
             
             results = []
             
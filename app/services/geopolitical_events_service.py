@@ -13,6 +13,7 @@
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from enum import Enum
+import asyncio
 import re
 import time
 import logging
@@ -286,7 +287,7 @@ class GeopoliticalEventsService:
 
         try:
             from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            articles = await asyncio.get_event_loop().run_in_executor(
+            articles = await asyncio.get_running_loop().run_in_executor(
                 None,
                 lambda: self.news_api.get_everything(
                     q=query,
@@ -1,13 +1,16 @@
+import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, List
 
+import numpy as np
+
 from app.broker.option_client_base import OptionBrokerClient
-from app.broker.models import OptionPosition, UnderlyingPosition
+from app.broker.models import OptionPosition, UnderlyingPosition, portfolio_greeks, positions_to_arrays
 from app.services.account_service import AccountService
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolOptionExposure:
     symbol: str
     net_delta_shares: float = 0.0
@@ -20,7 +23,7 @@ class SymbolOptionExposure:
     short_dte_theta_usd: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountOptionExposure:
     equity_usd: float = 0.0
 
@@ -56,9 +59,12 @@ class OptionExposureService:
     # -------- 对外主接口 --------
 
     async def get_account_exposure(self, account_id: str) -> AccountOptionExposure:
-        equity_usd = await self.account_svc.get_equity_usd(account_id)
-        underlyings = await self.broker.list_underlying_positions(account_id)
-        options = await self.broker.list_option_positions(account_id)
+        # 权益与两类持仓互相独立，并发获取
+        equity_usd, underlyings, options = await asyncio.gather(
+            self.account_svc.get_equity_usd(account_id),
+            self.broker.list_underlying_positions(account_id),
+            self.broker.list_option_positions(account_id),
+        )
         return self._aggregate_exposure(equity_usd, underlyings, options)
 
     async def simulate_apply_actions(
@@ -150,44 +156,64 @@ class OptionExposureService:
             sym.delta_notional_usd += delta_notional
             exp.total_delta_notional_usd += delta_notional
 
-        # 2. 期权 Greeks（按标的聚合）
-        for pos in options:
-            c = pos.contract
-            g = pos.greeks
-            sym = get_sym(c.underlying)
-
-            direction = 1.0 if pos.quantity > 0 else -1.0  # 多头正，空头负
-            abs_contracts = abs(pos.quantity)
-            mult = c.multiplier
-            S = pos.underlying_price
-
-            # Delta
-            delta_shares = g.delta * abs_contracts * mult * direction
+        # 2. 期权 Greeks（SoA 向量化计算，按标的分组聚合）
+        if options:
+            n = len(options)
+            arr = positions_to_arrays(options)
+            qty = arr["quantity"]
+            mult = arr["multiplier"]
+            S = arr["underlying_price"]
+            abs_mult = np.abs(qty) * mult
+
+            # Delta：多头正，空头负
+            delta_shares = arr["delta"] * qty * mult
             delta_notional = delta_shares * S
 
             # Gamma/Vega/Theta
-            gamma_usd = g.gamma * abs_contracts * mult * S * S  # 常见近似：Gamma * S^2 * 合约数
-            vega_usd = g.vega * abs_contracts * mult
-            theta_usd = g.theta * abs_contracts * mult
-
-            sym.net_delta_shares += delta_shares
-            sym.delta_notional_usd += delta_notional
-            sym.gamma_usd += gamma_usd
-            sym.vega_usd += vega_usd
-            sym.theta_usd += theta_usd
-
-            exp.total_delta_notional_usd += delta_notional
-            exp.total_gamma_usd += gamma_usd
-            exp.total_vega_usd += vega_usd
-            exp.total_theta_usd += theta_usd
+            gamma_usd = arr["gamma"] * abs_mult * S * S  # 常见近似：Gamma * S^2 * 合约数
+            vega_usd = arr["vega"] * abs_mult
+            theta_usd = arr["theta"] * abs_mult
 
             # 短 DTE 暴露
-            dte = (c.expiry - now).days
-            if dte <= 7:
-                sym.short_dte_gamma_usd += gamma_usd
-                sym.short_dte_theta_usd += theta_usd
-                exp.short_dte_gamma_usd += gamma_usd
-                exp.short_dte_theta_usd += theta_usd
+            short_dte = np.fromiter(
+                ((pos.contract.expiry - now).days <= 7 for pos in options), dtype=bool, count=n
+            )
+
+            underlying_syms = [pos.contract.underlying for pos in options]
+            for symbol in underlying_syms:
+                get_sym(symbol)
+            slot = {symbol: i for i, symbol in enumerate(per_symbol)}
+            groups = np.fromiter((slot[symbol] for symbol in underlying_syms), dtype=np.intp, count=n)
+
+            def by_symbol(values: np.ndarray) -> List[float]:
+                return np.bincount(groups, weights=values, minlength=len(slot)).tolist()
+
+            sym_delta_shares = by_symbol(delta_shares)
+            sym_delta_notional = by_symbol(delta_notional)
+            sym_gamma = by_symbol(gamma_usd)
+            sym_vega = by_symbol(vega_usd)
+            sym_theta = by_symbol(theta_usd)
+            sym_short_gamma = by_symbol(np.where(short_dte, gamma_usd, 0.0))
+            sym_short_theta = by_symbol(np.where(short_dte, theta_usd, 0.0))
+
+            for symbol, i in slot.items():
+                sym = per_symbol[symbol]
+                sym.net_delta_shares += sym_delta_shares[i]
+                sym.delta_notional_usd += sym_delta_notional[i]
+                sym.gamma_usd += sym_gamma[i]
+                sym.vega_usd += sym_vega[i]
+                sym.theta_usd += sym_theta[i]
+                sym.short_dte_gamma_usd += sym_short_gamma[i]
+                sym.short_dte_theta_usd += sym_short_theta[i]
+
+            # 组合总量用单次遍历归约内核（安装 numba 时 JIT 编译），不再对各数组分别求和
+            total_delta, total_gamma, total_vega, total_theta = portfolio_greeks(**arr)
+            exp.total_delta_notional_usd += total_delta
+            exp.total_gamma_usd += total_gamma
+            exp.total_vega_usd += total_vega
+            exp.total_theta_usd += total_theta
+            exp.short_dte_gamma_usd += float(gamma_usd[short_dte].sum())
+            exp.short_dte_theta_usd += float(theta_usd[short_dte].sum())
 
         exp.per_symbol = per_symbol
         return exp
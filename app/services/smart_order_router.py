@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional, List
 from decimal import Decimal
 from datetime import datetime, timedelta
 from enum import Enum
+from types import MappingProxyType
 
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +18,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.benchmark_service import BenchmarkService
 
 
+# 执行质量解读模板（按质量等级预构建）
+_POOR_EXECUTION_TEMPLATE = "执行质量较差，实际滑点{:.3f}%，建议使用算法交易降低成本。"
+_EXECUTION_TEMPLATES = MappingProxyType({
+    "EXCELLENT": "执行质量优秀！实际滑点仅{:.3f}%，远低于市场平均水平。",
+    "GOOD": "执行质量良好，实际滑点{:.3f}%，在合理范围内。",
+    "FAIR": "执行质量一般，实际滑点{:.3f}%，考虑优化订单策略。",
+    "POOR": _POOR_EXECUTION_TEMPLATE,
+})
+
+
 class OrderType(str, Enum):
     """订单类型"""
     MARKET = "MKT"  # 市价单
@@ -382,13 +393,5 @@ class SmartOrderRouter:
     def _interpret_execution(self, quality: str, slippage: float) -> str:
         """解读执行质量"""
         
-        slippage_pct = slippage * 100
-        
-        if quality == "EXCELLENT":
-            return f"执行质量优秀！实际滑点仅{slippage_pct:.3f}%，远低于市场平均水平。"
-        elif quality == "GOOD":
-            return f"执行质量良好，实际滑点{slippage_pct:.3f}%，在合理范围内。"
-        elif quality == "FAIR":
-            return f"执行质量一般，实际滑点{slippage_pct:.3f}%，考虑优化订单策略。"
-        else:
-            return f"执行质量较差，实际滑点{slippage_pct:.3f}%，建议使用算法交易降低成本。"
+        template = _EXECUTION_TEMPLATES.get(quality, _POOR_EXECUTION_TEMPLATE)
+        return template.format(slippage * 100)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import select, desc, and_
+from sqlalchemy import select, desc, and_, tuple_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +19,11 @@ from app.models.strategy import (
 )
 
 
+def _now_utc() -> datetime:
+    """当前 UTC 时间（naive，与数据库列保持一致）"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class StrategyService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -60,7 +65,7 @@ class StrategyService:
             return None
         strategy.default_params = params
         strategy.version = (strategy.version or 1) + 1
-        strategy.updated_at = datetime.utcnow()
+        strategy.updated_at = _now_utc()
         await self.session.commit()
         await self.session.refresh(strategy)
         return strategy
@@ -71,7 +76,7 @@ class StrategyService:
         if not strategy:
             return None
         strategy.is_active = is_active
-        strategy.updated_at = datetime.utcnow()
+        strategy.updated_at = _now_utc()
         await self.session.commit()
         await self.session.refresh(strategy)
         return strategy
@@ -111,7 +116,7 @@ class StrategyRunService:
         self.session.add(run)
         if strategy:
             strategy.last_run_status = run.status
-            strategy.last_run_at = datetime.utcnow()
+            strategy.last_run_at = _now_utc()
         await self.session.commit()
         await self.session.refresh(run)
         return run
@@ -139,7 +144,14 @@ class StrategyRunService:
         strategy_id: Optional[str] = None,
         account_id: Optional[str] = None,
         status: Optional[str] = None,
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[str] = None,
     ) -> List[StrategyRun]:
+        """按创建时间倒序列出运行记录。
+
+        传入上一页最后一行的 (created_at, id) 作为游标时使用 keyset 分页，
+        查询代价与翻页深度无关；否则退回 offset 分页。
+        """
         stmt = select(StrategyRun).options(selectinload(StrategyRun.history))
         filters = []
         if strategy_id:
@@ -148,9 +160,15 @@ class StrategyRunService:
             filters.append(StrategyRun.account_id == account_id)
         if status:
             filters.append(StrategyRun.status == status)
+        keyset = after_created_at is not None and after_id is not None
+        if keyset:
+            filters.append(tuple_(StrategyRun.created_at, StrategyRun.id) < (after_created_at, after_id))
         if filters:
             stmt = stmt.where(and_(*filters))
-        stmt = stmt.order_by(desc(StrategyRun.created_at)).offset(offset).limit(limit)
+        stmt = stmt.order_by(desc(StrategyRun.created_at), desc(StrategyRun.id))
+        if not keyset:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
@@ -12,6 +12,7 @@ from decimal import Decimal
 import statistics
 import math
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,6 +21,26 @@ from app.models.equity_snapshot import EquitySnapshot
 from app.services.benchmark_service import BenchmarkService
 
 
+# 压力情景（模块级只读常量，避免每次调用重建字典）
+_STRESS_SCENARIOS = MappingProxyType({
+    "2008_crisis": MappingProxyType({
+        "name": "2008年金融危机",
+        "market_drop": -0.37,  # 市场跌37%
+        "volatility_spike": 3.0  # 波动率放大3倍
+    }),
+    "2020_covid": MappingProxyType({
+        "name": "2020年疫情暴跌",
+        "market_drop": -0.34,
+        "volatility_spike": 2.5
+    }),
+    "black_monday": MappingProxyType({
+        "name": "黑色星期一（单日暴跌）",
+        "market_drop": -0.20,  # 单日跌20%
+        "volatility_spike": 5.0
+    }),
+})
+
+
 class VaRCalculator:
     """VaR和风险指标计算器"""
     
@@ -325,26 +346,7 @@ class VaRCalculator:
         # 获取当前持仓
         current_equity = await self._get_current_equity(account_id)
         
-        # 定义压力情景
-        stress_scenarios = {
-            "2008_crisis": {
-                "name": "2008年金融危机",
-                "market_drop": -0.37,  # 市场跌37%
-                "volatility_spike": 3.0  # 波动率放大3倍
-            },
-            "2020_covid": {
-                "name": "2020年疫情暴跌",
-                "market_drop": -0.34,
-                "volatility_spike": 2.5
-            },
-            "black_monday": {
-                "name": "黑色星期一（单日暴跌）",
-                "market_drop": -0.20,  # 单日跌20%
-                "volatility_spike": 5.0
-            }
-        }
-        
-        scenario_config = stress_scenarios.get(scenario, stress_scenarios["2008_crisis"])
+        scenario_config = _STRESS_SCENARIOS.get(scenario) or _STRESS_SCENARIOS["2008_crisis"]
         
         # 获取当前Beta（假设组合Beta）
         # 简化处理：假设Beta = 0.8
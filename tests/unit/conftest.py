@@ -0,0 +1,52 @@
+import sys
+
+import pytest
+
+from app.core import cache as cache_module
+
+
+class FakeCache:
+    """内存版 app.core.cache，避免测试连接真实 Redis（接口与 RedisCache 保持一致）"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    async def get(self, key, is_json=True):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=None, is_json=True):
+        self.data[key] = value
+        self.expires[key] = expire
+        return True
+
+    async def mget(self, keys, is_json=True):
+        return [self.data.get(key) for key in keys]
+
+    async def mset(self, mapping, expire=None, is_json=True):
+        self.data.update(mapping)
+        self.expires.update(dict.fromkeys(mapping, expire))
+        return bool(mapping)
+
+    async def delete(self, key):
+        self.expires.pop(key, None)
+        return self.data.pop(key, None) is not None
+
+    async def delete_many(self, keys):
+        return sum([await self.delete(key) for key in keys])
+
+    async def get_or_set(self, key, loader, expire, stale=None):
+        if key not in self.data:
+            await self.set(key, await loader(), expire=expire)
+        return self.data[key]
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    """把已加载的 app 模块中 `from app.core.cache import cache` 绑定的实例替换为 FakeCache"""
+    fake = FakeCache()
+    real = cache_module.cache
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app.") and getattr(module, "cache", None) is real:
+            monkeypatch.setattr(module, "cache", fake)
+    return fake
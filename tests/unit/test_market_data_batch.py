@@ -0,0 +1,135 @@
+import pandas as pd
+import pytest
+
+from app.providers import market_data_provider as market_data_module
+from app.providers.market_data_provider import MarketDataProvider
+
+
+@pytest.fixture(autouse=True)
+def _clear_lot_size_cache():
+    market_data_module._LOT_SIZE_CACHE.clear()
+    yield
+    market_data_module._LOT_SIZE_CACHE.clear()
+
+
+class _FakeQuoteClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get_stock_briefs(self, symbols):
+        self.calls.append(list(symbols))
+        return pd.DataFrame([row for row in self.rows if row["symbol"] in symbols])
+
+
+def _provider(rows):
+    provider = MarketDataProvider()
+    provider._tiger_quote_client = _FakeQuoteClient(rows)
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_batches_cache_misses():
+    provider = _provider([
+        {"symbol": "AAPL", "latest_price": 190.5},
+        {"symbol": "MSFT", "latest_price": 410.0},
+    ])
+    provider._cache_price("TSLA", 250.0)
+
+    prices = await provider.get_current_prices(["AAPL", "TSLA", "MSFT", "AAPL"])
+
+    assert prices == {"TSLA": 250.0, "AAPL": 190.5, "MSFT": 410.0}
+    assert provider._tiger_quote_client.calls == [["AAPL", "MSFT"]]
+    # 批量结果写入价格缓存
+    assert provider._get_cached_price("MSFT") == 410.0
+
+
+@pytest.mark.asyncio
+async def test_get_lot_sizes_batches_hk_symbols_and_skips_us():
+    provider = _provider([
+        {"symbol": "00700.HK", "lot_size": 100},
+        {"symbol": "09988.HK", "lot_size": 500},
+    ])
+
+    lots = await provider.get_lot_sizes(["00700.HK", "AAPL", "09988.HK"])
+
+    assert lots == {"AAPL": 1, "00700.HK": 100, "09988.HK": 500}
+    assert provider._tiger_quote_client.calls == [["00700.HK", "09988.HK"]]
+    assert await provider.get_lot_sizes(["00700.HK"]) == {"00700.HK": 100}
+    assert len(provider._tiger_quote_client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_lot_size_cache_is_shared_across_providers_and_bounded(monkeypatch):
+    monkeypatch.setattr(market_data_module, "_LOT_SIZE_CACHE_SIZE", 2)
+    first = _provider([{"symbol": "00700.HK", "lot_size": 100}])
+    assert await first.get_lot_size("00700.HK") == 100
+
+    second = _provider([])
+    assert await second.get_lot_size("00700.HK") == 100
+    assert second._tiger_quote_client.calls == []
+
+    second._cache_lot_size("00005.HK", 400)
+    second._cache_lot_size("09988.HK", 500)
+    assert list(market_data_module._LOT_SIZE_CACHE) == ["00005.HK", "09988.HK"]
+
+
+@pytest.mark.asyncio
+async def test_lot_size_cache_expires(monkeypatch):
+    provider = _provider([])
+    provider._cache_lot_size("00700.HK", 100)
+    monkeypatch.setattr(market_data_module, "_LOT_SIZE_CACHE_TTL", 0)
+
+    assert provider._get_cached_lot_size("00700.HK") is None
+    assert "00700.HK" not in market_data_module._LOT_SIZE_CACHE
+
+
+def test_providers_share_the_broker_quote_client(monkeypatch):
+    shared = object()
+    calls = []
+
+    def fake_shared_client(*args):
+        calls.append(args)
+        return shared
+
+    monkeypatch.setattr(market_data_module.settings, "TIGER_PRIVATE_KEY_PATH", "/tmp/key.pem")
+    monkeypatch.setattr(market_data_module.settings, "TIGER_ID", "dev")
+    monkeypatch.setattr(market_data_module, "get_shared_quote_client", fake_shared_client)
+
+    assert MarketDataProvider()._tiger_quote_client is shared
+    assert MarketDataProvider()._tiger_quote_client is shared
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_falls_back_across_price_columns():
+    provider = _provider([
+        {"symbol": "AAPL", "latest_price": float("nan"), "close": 189.0},
+        {"symbol": "MSFT", "latest_price": 410.0, "close": 400.0},
+    ])
+
+    prices = await provider.get_current_prices(["AAPL", "MSFT"])
+
+    assert prices == {"AAPL": 189.0, "MSFT": 410.0}
+
+
+@pytest.mark.asyncio
+async def test_batch_requests_respect_per_symbol_rate_limit(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(market_data_module.asyncio, "sleep", fake_sleep)
+    provider = _provider([
+        {"symbol": "AAPL", "latest_price": 190.5},
+        {"symbol": "00700.HK", "lot_size": 100},
+    ])
+    provider._last_request_time["AAPL"] = market_data_module.time.time()
+
+    await provider.get_current_prices(["AAPL"])
+    await provider.get_lot_sizes(["00700.HK"])
+
+    # 刚请求过的 AAPL 需要等待；两个 symbol 的请求时间都被记录
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= provider._request_min_interval
+    assert {"AAPL", "00700.HK"} <= set(provider._last_request_time)
@@ -0,0 +1,92 @@
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.broker.models import (
+    Greeks,
+    OptionContract,
+    OptionPosition,
+    UnderlyingPosition,
+    portfolio_greeks,
+    positions_to_arrays,
+)
+from app.services.option_exposure_service import OptionExposureService
+
+
+def _option(underlying: str, quantity: int, delta: float, gamma: float, days_to_expiry: int) -> OptionPosition:
+    contract = OptionContract(
+        broker_symbol=f"{underlying} OPT",
+        underlying=underlying,
+        market="US",
+        right="CALL",
+        strike=100.0,
+        expiry=date.today() + timedelta(days=days_to_expiry),
+        multiplier=100,
+        currency="USD",
+    )
+    return OptionPosition(
+        contract=contract,
+        quantity=quantity,
+        avg_price=1.0,
+        last_price=1.5,
+        underlying_price=100.0,
+        greeks=Greeks(delta=delta, gamma=gamma, vega=0.1, theta=-0.05),
+        last_update_ts=0.0,
+    )
+
+
+def test_positions_to_arrays_layout():
+    arrays = positions_to_arrays([_option("AAPL", 2, 0.5, 0.01, 30), _option("MSFT", -1, 0.3, 0.02, 3)])
+    assert arrays["quantity"].tolist() == [2.0, -1.0]
+    assert arrays["delta"].tolist() == [0.5, 0.3]
+    assert arrays["multiplier"].tolist() == [100.0, 100.0]
+
+
+def test_aggregate_exposure_groups_by_underlying():
+    service = OptionExposureService.__new__(OptionExposureService)
+    underlyings = [UnderlyingPosition("AAPL", "US", 10, 90.0, 100.0, "USD")]
+    options = [
+        _option("AAPL", 2, 0.5, 0.01, 30),
+        _option("AAPL", -1, 0.4, 0.01, 3),
+        _option("MSFT", 1, 0.6, 0.02, 30),
+    ]
+
+    exp = service._aggregate_exposure(100_000.0, underlyings, options)
+
+    aapl = exp.per_symbol["AAPL"]
+    # 现货 10 股 + 2 张多头(0.5) - 1 张空头(0.4)
+    assert aapl.net_delta_shares == pytest.approx(10 + 100 - 40)
+    assert aapl.short_dte_gamma_usd == pytest.approx(0.01 * 100 * 100 * 100)
+    assert exp.per_symbol["MSFT"].delta_notional_usd == pytest.approx(60 * 100.0)
+    assert exp.total_delta_notional_usd == pytest.approx((70 + 60) * 100.0)
+    assert list(exp.per_symbol) == ["AAPL", "MSFT"]
+
+
+def test_portfolio_greeks_totals_match_per_symbol_sums():
+    options = [
+        _option("AAPL", 2, 0.5, 0.01, 30),
+        _option("AAPL", -1, 0.4, 0.01, 3),
+        _option("MSFT", 1, 0.6, 0.02, 30),
+    ]
+    service = OptionExposureService.__new__(OptionExposureService)
+    exp = service._aggregate_exposure(100_000.0, [], options)
+
+    # 组合总量来自 portfolio_greeks，按标的分组来自 bincount，两条路径口径一致
+    d, g, v, t = portfolio_greeks(**positions_to_arrays(options))
+    per_symbol = exp.per_symbol.values()
+
+    assert (d, g, v, t) == (
+        exp.total_delta_notional_usd, exp.total_gamma_usd, exp.total_vega_usd, exp.total_theta_usd,
+    )
+    assert d == pytest.approx(sum(s.delta_notional_usd for s in per_symbol))
+    assert g == pytest.approx(sum(s.gamma_usd for s in per_symbol))
+    assert v == pytest.approx(sum(s.vega_usd for s in per_symbol))
+    assert t == pytest.approx(sum(s.theta_usd for s in per_symbol))
+
+
+def test_broker_models_import_does_not_load_numpy():
+    code = "import sys, app.broker.models; assert 'numpy' not in sys.modules and 'numba' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[2])
@@ -0,0 +1,382 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import object_session as sqlalchemy_session
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.engine import order_executor as order_executor_module
+from app.engine.order_executor import OrderExecutor
+from app.models.db import Base
+from app.models.strategy import Strategy  # noqa: F401  注册外键目标表
+from app.models.trade_journal import TradeJournal
+from app.models.trading_signal import SignalSource, SignalStatus, SignalType, TradingSignal
+
+
+class _FakeAccountService:
+    async def get_equity_usd(self, account_id):
+        return 100000.0
+
+
+class _FakeMarketProvider:
+    def __init__(self):
+        self.price_calls = []
+        self.lot_calls = []
+
+    async def get_current_prices(self, symbols):
+        self.price_calls.append(list(symbols))
+        return {symbol: 10.0 for symbol in symbols}
+
+    async def get_lot_sizes(self, symbols):
+        self.lot_calls.append(list(symbols))
+        return {symbol: 500 for symbol in symbols}
+
+
+def _signal(signal_id, symbol, strength=50.0):
+    return TradingSignal(
+        signal_id=signal_id,
+        signal_type=SignalType.ENTRY,
+        signal_source=SignalSource.STRATEGY,
+        status=SignalStatus.VALIDATED,
+        symbol=symbol,
+        direction="LONG",
+        signal_strength=strength,
+        confidence=0.8,
+        account_id="acc",
+        user_id="u1",
+    )
+
+
+async def _session_factory(tmp_path):
+    # 并发执行时各信号使用独立连接，内存库无法共享，改用临时文件库
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'signals.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _make_executor(session, execute_single):
+    executor = OrderExecutor.__new__(OrderExecutor)
+    executor.session = session
+    executor._session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    executor.account_svc = _FakeAccountService()
+    executor.market_provider = _FakeMarketProvider()
+    executor.dry_run_mode = False
+    executor._execute_single_signal = execute_single
+    return executor
+
+
+def _count_commits(session):
+    counter = {"n": 0}
+    original = session.commit
+
+    async def commit():
+        counter["n"] += 1
+        await original()
+
+    session.commit = commit
+    return counter
+
+
+@pytest.mark.asyncio
+async def test_execute_signal_batch_batches_status_commits(tmp_path):
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        session.add_all([_signal("s1", "AAPL"), _signal("s2", "MSFT"), _signal("s3", "TSLA")])
+        await session.commit()
+
+        seen_status = {}
+
+        async def execute_single(signal, account_equity, trade_mode=None, **market):
+            seen_status[signal.signal_id] = signal.status
+            if signal.symbol == "TSLA":
+                raise RuntimeError("boom")
+            return {"success": True, "signal_id": signal.signal_id}
+
+        executor = _make_executor(session, execute_single)
+        commits = _count_commits(session)
+
+        summary = await executor.execute_signal_batch("acc", max_orders=5)
+
+        assert summary["queued"] == 3
+        assert summary["executed"] == 2
+        assert summary["failed"] == 1
+        # 执行前已整批标记为 QUEUED
+        assert set(seen_status.values()) == {SignalStatus.QUEUED}
+        # 一次 QUEUED 提交 + 一次异常回退提交
+        assert commits["n"] == 2
+
+        rows = (await session.execute(select(TradingSignal))).scalars().all()
+        statuses = {row.signal_id: row.status for row in rows}
+        assert statuses["s3"] == SignalStatus.VALIDATED
+        assert statuses["s1"] == SignalStatus.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_execute_signal_batch_runs_signals_concurrently(tmp_path):
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        session.add_all([_signal(f"s{i}", f"SYM{i}") for i in range(4)])
+        await session.commit()
+
+        in_flight = 0
+        peak = 0
+        sessions = set()
+
+        async def execute_single(signal, account_equity, trade_mode=None, **market):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            sessions.add(id(sqlalchemy_session(signal)))
+            return {"success": True, "signal_id": signal.signal_id}
+
+        executor = _make_executor(session, execute_single)
+
+        summary = await executor.execute_signal_batch("acc", max_orders=2)
+
+        assert summary["executed"] == 2
+        # 确实并发执行
+        assert peak == 2
+        # 每个信号在各自的会话中执行，不与批量会话共用
+        assert len(sessions) == 2
+        assert id(session.sync_session) not in sessions
+
+
+@pytest.mark.asyncio
+async def test_execute_signal_batch_bounds_in_flight_orders(tmp_path, monkeypatch):
+    monkeypatch.setattr(OrderExecutor, "EXECUTOR_MAX_CONCURRENCY", 2)
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        session.add_all([_signal(f"s{i}", f"SYM{i}") for i in range(6)])
+        await session.commit()
+
+        in_flight = 0
+        peak = 0
+
+        async def execute_single(signal, account_equity, trade_mode=None, **market):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return {"success": True, "signal_id": signal.signal_id}
+
+        executor = _make_executor(session, execute_single)
+
+        summary = await executor.execute_signal_batch("acc", max_orders=10)
+
+        assert summary["executed"] == 6
+        # 同时在途的下单数受 EXECUTOR_MAX_CONCURRENCY 约束，而不是批次大小
+        assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_signal_batch_keeps_strongest_signal_per_symbol(tmp_path):
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        session.add_all([
+            _signal("weak", "AAPL", strength=40.0),
+            _signal("strong", "AAPL", strength=90.0),
+            _signal("other", "MSFT", strength=10.0),
+        ])
+        await session.commit()
+
+        executed = []
+
+        async def execute_single(signal, account_equity, trade_mode=None, **market):
+            executed.append(signal.signal_id)
+            return {"success": True, "signal_id": signal.signal_id}
+
+        executor = _make_executor(session, execute_single)
+
+        summary = await executor.execute_signal_batch("acc", max_orders=10)
+
+        assert summary["queued"] == 2
+        assert sorted(executed) == ["other", "strong"]
+
+
+class _FakeBroker:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    async def get_order_status(self, account_id, order_id, since_ts=None):
+        self.calls.append(since_ts)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {"status": status, "avg_fill_price": 10.0, "filled_quantity": 5.0, "message": status}
+
+
+@pytest.mark.asyncio
+async def test_order_confirmation_returns_as_soon_as_order_is_terminal(tmp_path, monkeypatch):
+    monkeypatch.setattr(order_executor_module, "_CONFIRM_POLL_DELAYS", (0.001, 0.001, 5.0))
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        signal = _signal("s1", "AAPL")
+        signal.status = SignalStatus.EXECUTING
+        signal.order_id = "42"
+        session.add(signal)
+        await session.commit()
+
+        executor = _make_executor(session, None)
+        executor.broker = _FakeBroker(["PENDING", "FILLED"])
+
+        resp = await asyncio.wait_for(
+            executor._await_order_confirmation("acc", "42", since_ts=123), timeout=1
+        )
+
+        assert resp["status"] == "FILLED"
+        # 终态后不再继续轮询，且查询带上下单时间下界
+        assert executor.broker.calls == [123, 123]
+        assert signal.status == SignalStatus.EXECUTED
+        assert order_executor_module._order_confirmations == {}
+
+
+@pytest.mark.asyncio
+async def test_order_confirmation_wakes_up_when_another_sync_sees_terminal_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(order_executor_module, "_CONFIRM_POLL_DELAYS", (5.0,))
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        executor = _make_executor(session, None)
+        executor.broker = _FakeBroker(["PENDING"])
+
+        waiter = asyncio.create_task(executor._await_order_confirmation("acc", "7"))
+        await asyncio.sleep(0)
+        order_executor_module._resolve_order_confirmation("7", {"status": "REJECTED"})
+
+        resp = await asyncio.wait_for(waiter, timeout=1)
+
+        assert resp == {"status": "REJECTED"}
+        assert executor.broker.calls == []
+
+
+@pytest.mark.asyncio
+async def test_sync_executing_orders_reads_order_book_once(tmp_path):
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        filled = _signal("s1", "AAPL")
+        rejected = _signal("s2", "MSFT")
+        missing = _signal("s3", "TSLA")
+        for sig, order_id in ((filled, "1"), (rejected, "2"), (missing, "3")):
+            sig.status = SignalStatus.EXECUTING
+            sig.order_id = order_id
+        session.add_all([filled, rejected, missing])
+        await session.commit()
+
+        class _BookBroker(_FakeBroker):
+            book_calls = 0
+
+            async def get_order_status_map(self, account_id, since_ts=None):
+                self.book_calls += 1
+                return {
+                    "1": {"status": "FILLED", "avg_fill_price": 10.0, "filled_quantity": 5.0},
+                    "2": {"status": "REJECTED", "message": "no cash"},
+                }
+
+        session.add_all([
+            TradeJournal(id=1, account_id="acc", symbol="AAPL", direction="LONG", signal_id="s1"),
+            TradeJournal(id=2, account_id="acc", symbol="MSFT", direction="LONG", signal_id="s2"),
+        ])
+        await session.commit()
+
+        executor = _make_executor(session, None)
+        executor.broker = _BookBroker(["PENDING"])
+        commits = _count_commits(session)
+
+        summary = await executor.sync_executing_orders("acc")
+
+        assert summary == {"synced": 3, "updates": 2}
+        assert executor.broker.book_calls == 1
+        # 只有订单簿里缺失的订单才逐笔查询
+        assert executor.broker.calls == [None]
+        assert commits["n"] == 1
+
+        rows = (await session.execute(
+            select(TradingSignal).execution_options(populate_existing=True)
+        )).scalars().all()
+        by_id = {row.signal_id: row for row in rows}
+        assert (by_id["s1"].status, by_id["s1"].executed_price) == (SignalStatus.EXECUTED, 10.0)
+        assert (by_id["s2"].status, by_id["s2"].order_id) == (SignalStatus.VALIDATED, None)
+        assert by_id["s3"].status == SignalStatus.EXECUTING
+
+        journals = (await session.execute(
+            select(TradeJournal).execution_options(populate_existing=True)
+        )).scalars().all()
+        by_signal = {j.signal_id: j for j in journals}
+        assert by_signal["s1"].journal_status == "COMPLETED"
+        assert by_signal["s2"].journal_status == "FAILED"
+        assert by_signal["s2"].lesson_learned == "交易执行失败: no cash"
+
+
+def test_bound_executor_rebuilds_session_scoped_services():
+    executor = OrderExecutor.__new__(OrderExecutor)
+    executor.session = object()
+
+    journal_svc = executor._journal_svc
+    assert executor._journal_svc is journal_svc
+
+    other_session = object()
+    worker = executor._bind_session(other_session)
+
+    assert worker._journal_svc.session is other_session
+    assert executor._journal_svc is journal_svc
+
+
+@pytest.mark.asyncio
+async def test_execute_signal_batch_prefetches_market_data_once(tmp_path):
+    factory = await _session_factory(tmp_path)
+    async with factory() as session:
+        priced = _signal("s1", "AAPL")
+        priced.suggested_price = 99.0
+        session.add_all([priced, _signal("s2", "00700.HK"), _signal("s3", "MSFT")])
+        await session.commit()
+
+        received = {}
+
+        async def execute_single(signal, account_equity, trade_mode=None, **market):
+            received[signal.symbol] = market
+            return {"success": True, "signal_id": signal.signal_id}
+
+        executor = _make_executor(session, execute_single)
+
+        await executor.execute_signal_batch("acc", max_orders=5)
+
+        provider = executor.market_provider
+        # 已有建议价的信号不查价；只有港股查一手股数；每类只请求一次
+        assert len(provider.price_calls) == 1
+        assert sorted(provider.price_calls[0]) == ["00700.HK", "MSFT"]
+        assert provider.lot_calls == [["00700.HK"]]
+        assert received["00700.HK"] == {"current_price": 10.0, "lot_size": 500}
+        assert received["AAPL"] == {"current_price": None, "lot_size": None}
+
+
+@pytest.mark.asyncio
+async def test_calculate_order_params_uses_prefetched_market_data():
+    class _NoFetchProvider:
+        async def get_current_price(self, symbol):
+            raise AssertionError("prefetched price should be used")
+
+        async def get_lot_size(self, symbol):
+            raise AssertionError("prefetched lot size should be used")
+
+    executor = OrderExecutor.__new__(OrderExecutor)
+    executor.market_provider = _NoFetchProvider()
+    signal = _signal("s1", "00700.HK")
+    signal.suggested_quantity = 0.1
+
+    params = await executor._calculate_order_params(signal, 100000.0, current_price=10.0, lot_size=500)
+
+    assert params["quantity"] == 1000
+
+
+def test_executor_reuses_app_session_factory_for_app_engine(monkeypatch):
+    monkeypatch.setattr(order_executor_module, "make_option_broker_client", lambda: None)
+    monkeypatch.setattr(order_executor_module, "AccountService", lambda session, broker: None)
+    monkeypatch.setattr(order_executor_module, "MarketDataProvider", lambda: None)
+
+    app_executor = OrderExecutor(order_executor_module.SessionLocal())
+    assert app_executor._session_factory is order_executor_module.SessionLocal
+
+    custom = async_sessionmaker(create_async_engine("sqlite+aiosqlite://"))
+    assert OrderExecutor(custom(), session_factory=custom)._session_factory is custom
@@ -0,0 +1,262 @@
+import asyncio
+import time
+
+import orjson
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import RedisCache
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    async def execute(self):
+        for key, value, ex in self.commands:
+            self.store[key] = (value, ex)
+        return [True] * len(self.commands)
+
+
+class _FakeRedis:
+    """只实现 RedisCache 用到的命令"""
+
+    def __init__(self):
+        self.store = {}
+        self.mget_calls = 0
+        self.delete_calls = 0
+        self.unlink_calls = []
+
+    async def get(self, key):
+        entry = self.store.get(key)
+        return entry[0] if entry else None
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.store[k][0] if k in self.store else None for k in keys]
+
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = (value, ex if px is None else px / 1000)
+        return True
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def delete(self, *keys):
+        self.delete_calls += 1
+        return sum(self.store.pop(k, None) is not None for k in keys)
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.store):
+            if key.startswith(prefix):
+                yield key
+
+    async def unlink(self, *keys):
+        self.unlink_calls.append(len(keys))
+        return sum(self.store.pop(k, None) is not None for k in keys)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(cache_module, "redis_client", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_mset_then_mget_round_trip(fake_redis):
+    cache = RedisCache(prefix="t:")
+
+    assert await cache.mset({"a": {"x": 1}, "b": "名称"}, expire=60)
+    values = await cache.mget(["a", "missing", "b"])
+
+    assert values == [{"x": 1}, None, "名称"]
+    assert fake_redis.mget_calls == 1
+    assert fake_redis.store["t:a"][1] == 60
+
+
+@pytest.mark.asyncio
+async def test_batch_ops_without_redis(monkeypatch):
+    monkeypatch.setattr(cache_module, "redis_client", None)
+    cache = RedisCache()
+
+    assert await cache.mget(["a", "b"]) == [None, None]
+    assert await cache.mset({"a": 1}) is False
+
+
+@pytest.mark.asyncio
+async def test_delete_many_uses_single_command(fake_redis):
+    cache = RedisCache(prefix="t:")
+    await cache.mset({"a": 1, "b": 2})
+
+    assert await cache.delete_many(["a", "b", "c"]) == 2
+    assert fake_redis.delete_calls == 1
+    assert fake_redis.store == {}
+    assert await cache.delete_many([]) == 0
+
+
+@pytest.mark.asyncio
+async def test_json_values_round_trip_with_orjson(fake_redis):
+    cache = RedisCache(prefix="t:")
+
+    await cache.set("k", {1: "a", "nested": [1.5, None, "中文"]})
+
+    assert await cache.get("k") == {"1": "a", "nested": [1.5, None, "中文"]}
+    fake_redis.store["t:raw"] = ("not json", None)
+    assert await cache.get("raw") == "not json"
+
+
+@pytest.mark.asyncio
+async def test_flush_all_unlinks_prefixed_keys_in_batches(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_module, "_FLUSH_BATCH_SIZE", 2)
+    cache = RedisCache(prefix="t:")
+    await cache.mset({"a": 1, "b": 2, "c": 3})
+    fake_redis.store["other:x"] = ("1", None)
+
+    assert await cache.flush_all()
+
+    assert fake_redis.unlink_calls == [2, 1]
+    assert list(fake_redis.store) == ["other:x"]
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_loads_once_for_concurrent_misses(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_module, "_LOCK_POLL_INTERVAL", 0.001)
+    cache = RedisCache(prefix="t:")
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    results = await asyncio.gather(*(cache.get_or_set("k", loader, expire=60) for _ in range(5)))
+
+    assert calls == 1
+    assert results == [{"n": 1}] * 5
+    assert "t:lock:k" not in fake_redis.store
+    # 物理 TTL 包含 stale 窗口
+    assert fake_redis.store["t:k"][1] >= 120
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_serves_stale_while_another_caller_refreshes(fake_redis):
+    cache = RedisCache(prefix="t:")
+    fake_redis.store["t:k"] = (orjson.dumps({"v": "old", "t": time.time() - 1}).decode(), 120)
+    fake_redis.store["t:lock:k"] = ("someone-else", 5)
+
+    async def loader():
+        raise AssertionError("should not reload while another caller holds the lock")
+
+    assert await cache.get_or_set("k", loader, expire=60) == "old"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_does_not_cache_loader_errors(fake_redis):
+    cache = RedisCache(prefix="t:")
+
+    async def loader():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_set("k", loader, expire=60)
+    assert fake_redis.store == {}
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_poll_ignores_foreign_values(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_module, "_LOCK_POLL_INTERVAL", 0.001)
+    cache = RedisCache(prefix="t:")
+    # 其他调用方持锁期间，key 被写入了非 get_or_set 格式的值
+    fake_redis.store["t:lock:k"] = ("someone-else", 5)
+    fake_redis.store["t:k"] = ("[1, 2]", None)
+
+    async def loader():
+        return "fresh"
+
+    assert await cache.get_or_set("k", loader, expire=60, lock_timeout=0.02) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_falls_back_to_loader_on_redis_errors(fake_redis, monkeypatch):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    cache = RedisCache(prefix="t:")
+
+    async def broken_set(*args, **kwargs):
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "set", broken_set)
+
+    async def loader():
+        return 42
+
+    assert await cache.get_or_set("k", loader, expire=60) == 42
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_waiters_move_on_when_lock_holder_fails(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_module, "_LOCK_POLL_INTERVAL", 0.001)
+    cache = RedisCache(prefix="t:")
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        cache.get_or_set("k", loader, expire=60, lock_timeout=5.0),
+        cache.get_or_set("k", loader, expire=60, lock_timeout=5.0),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == "ok"
+    # 等待方在持锁方失败后立即自行回源，而不是等满 lock_timeout
+    assert time.monotonic() - started < 1.0
+    assert "t:lock:k" not in fake_redis.store
+
+
+@pytest.mark.asyncio
+async def test_app_redis_client_disconnects_its_pool_on_close(monkeypatch):
+    import redis.asyncio as redis
+
+    from app.models import db
+
+    client = db.redis_client
+    if client is None:
+        pytest.skip("REDIS_ENABLED is off")
+    assert isinstance(client.connection_pool, redis.BlockingConnectionPool)
+    assert client.auto_close_connection_pool
+
+    disconnected = []
+
+    async def disconnect(*args, **kwargs):
+        disconnected.append(True)
+
+    monkeypatch.setattr(client.connection_pool, "disconnect", disconnect)
+    await client.aclose()
+
+    assert disconnected == [True]
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.db import Base
+from app.models.strategy import Strategy, StrategyRun
+from app.services.strategy_service import StrategyRunService
+
+
+@pytest.mark.asyncio
+async def test_list_runs_keyset_pagination_covers_all_rows():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add(Strategy(id="s1", name="demo", owner_id="u1", default_params={}, version=1))
+        base = datetime(2024, 1, 1)
+        # 每两条记录共享同一个 created_at，验证 id 作为次级排序键
+        for i in range(7):
+            session.add(StrategyRun(
+                id=f"run{i}",
+                strategy_id="s1",
+                strategy_version=1,
+                user_id="u1",
+                account_id="acc",
+                status="COMPLETED",
+                created_at=base + timedelta(minutes=i // 2),
+            ))
+        await session.commit()
+
+        svc = StrategyRunService(session)
+        page = await svc.list_runs(limit=3)
+        seen = [r.id for r in page]
+        while len(page) == 3:
+            page = await svc.list_runs(
+                limit=3,
+                after_created_at=page[-1].created_at,
+                after_id=page[-1].id,
+            )
+            seen.extend(r.id for r in page)
+
+    await engine.dispose()
+    assert seen == [f"run{i}" for i in reversed(range(7))]
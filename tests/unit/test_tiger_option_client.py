@@ -0,0 +1,811 @@
+import asyncio
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from app.broker import tiger_option_client
+from app.broker.tiger_option_client import TigerOptionClient
+
+
+# 所有用例都使用 conftest 中的内存缓存，不连接真实 Redis
+pytestmark = pytest.mark.usefixtures("fake_cache")
+
+
+def _make_client(trade_client=None, quote_client=None) -> TigerOptionClient:
+    """绕过 SDK 配置，直接注入假的 trade/quote client"""
+    client = TigerOptionClient.__new__(TigerOptionClient)
+    client.account = "TEST"
+    client.trade_client = trade_client
+    client.quote_client = quote_client
+    client._ttl_cache = {}
+    client._ttl_locks = {}
+    client._brief_cache = OrderedDict()
+    client._account_id_cache = None
+    client._hk_name_local = OrderedDict()
+    client._contract_cache = OrderedDict()
+    client._last_option_symbols = {}
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fetch_option_briefs_chunks_and_merges(monkeypatch):
+    calls = []
+
+    def get_option_briefs(chunk):
+        calls.append(list(chunk))
+        if "BAD" in chunk:
+            raise RuntimeError("rate limit")
+        return [SimpleNamespace(identifier=s, delta=0.5) for s in chunk]
+
+    monkeypatch.setattr(TigerOptionClient, "OPTION_BRIEF_CHUNK_SIZE", 2)
+    client = _make_client(quote_client=SimpleNamespace(get_option_briefs=get_option_briefs))
+
+    briefs = await client._fetch_option_briefs(["A", "B", "C", "BAD", "E"])
+
+    assert sorted(len(c) for c in calls) == [1, 2, 2]
+    # 失败批次只影响自身
+    assert set(briefs) == {"A", "B", "E"}
+
+
+@pytest.mark.asyncio
+async def test_cached_single_flight_and_invalidate():
+    client = _make_client()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["pos"]
+
+    results = await asyncio.gather(*(
+        client._cached("underlying_positions:ACC", 15, loader) for _ in range(5)
+    ))
+    assert calls == 1
+    assert all(r == ["pos"] for r in results)
+
+    await client.invalidate("ACC")
+    await client._cached("underlying_positions:ACC", 15, loader)
+    assert calls == 2
+
+
+def _stock_position(symbol: str, quantity: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        contract=SimpleNamespace(symbol=symbol, currency="USD"),
+        quantity=quantity,
+        average_cost=100.0,
+        market_price=110.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_underlying_positions_keeps_every_position():
+    us_positions = [_stock_position("AAPL", 10), _stock_position("MSFT", 5), _stock_position("NVDA", 1)]
+
+    def get_positions(sec_type=None, market=None, account=None):
+        return us_positions if market.name == "US" else []
+
+    client = _make_client(trade_client=SimpleNamespace(get_positions=get_positions))
+
+    results = await client.list_underlying_positions("ACC")
+
+    assert len(results) == 3
+    assert [p.symbol for p in results] == ["AAPL", "MSFT", "NVDA"]
+
+
+@pytest.mark.asyncio
+async def test_close_clears_caches_but_keeps_shared_sdk_clients():
+    closed = []
+    client = _make_client(trade_client=SimpleNamespace(close=lambda: closed.append("trade")))
+    client._ttl_cache["k"] = (0.0, ["pos"])
+    client._brief_cache["A"] = (0.0, object())
+
+    await client.close()
+
+    # SDK 客户端为进程内共享，不能由单个实例关闭
+    assert closed == []
+    assert client._ttl_cache == {} and client._brief_cache == {}
+
+
+def test_sdk_clients_shared_per_credentials(monkeypatch):
+    monkeypatch.setattr(tiger_option_client, "_SDK_CLIENTS", {})
+    monkeypatch.setattr(tiger_option_client, "_sdk_http_pool_ready", True)
+    monkeypatch.setattr("tigeropen.tiger_open_config.get_client_config", lambda **kwargs: SimpleNamespace(**kwargs))
+    monkeypatch.setattr("tigeropen.trade.trade_client.TradeClient", lambda config: SimpleNamespace(config=config))
+    monkeypatch.setattr("tigeropen.quote.quote_client.QuoteClient", lambda config: SimpleNamespace(config=config))
+
+    a = TigerOptionClient("key.pem", "tiger-1", "ACC1")
+    b = TigerOptionClient("key.pem", "tiger-1", "ACC2")
+    c = TigerOptionClient("key.pem", "tiger-2", "ACC3")
+
+    assert a.trade_client is b.trade_client and a.quote_client is b.quote_client
+    assert c.trade_client is not a.trade_client
+    assert (a.account, b.account) == ("ACC1", "ACC2")
+
+
+def test_sdk_http_pool_keeps_concurrent_connections(monkeypatch):
+    from tigeropen.common.util import web_utils
+
+    monkeypatch.setattr(tiger_option_client, "_sdk_http_pool_ready", False)
+    monkeypatch.setattr(web_utils, "http_pool", web_utils.http_pool)
+
+    tiger_option_client.ensure_sdk_http_pool()
+    pool = web_utils.http_pool
+    tiger_option_client.ensure_sdk_http_pool()
+
+    assert web_utils.http_pool is pool
+    assert pool.connection_pool_kw["maxsize"] == tiger_option_client._SDK_HTTP_POOL_MAXSIZE
+
+
+@pytest.mark.asyncio
+async def test_list_option_positions_skips_malformed_rows():
+    def option(symbol: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            contract=SimpleNamespace(
+                symbol=symbol, underlying_symbol="AAPL", put_call="CALL", strike=100,
+                expiry="2030-01-18", multiplier=100, currency="USD",
+            ),
+            quantity=1,
+            average_cost=1.0,
+            market_price=1.5,
+        )
+
+    positions = [option("GOOD1"), option("BAD"), option("GOOD2")]
+    briefs = [
+        SimpleNamespace(identifier="GOOD1", delta=0.5, gamma=0.01, vega=0.1, theta=-0.05),
+        SimpleNamespace(identifier="BAD", delta="N/A", gamma=0.01, vega=0.1, theta=-0.05),
+    ]
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=lambda **kwargs: positions),
+        quote_client=SimpleNamespace(get_option_briefs=lambda chunk: briefs),
+    )
+
+    results = await client.list_option_positions("ACC")
+
+    assert [p.contract.broker_symbol for p in results] == ["GOOD1", "GOOD2"]
+    assert results[0].greeks.delta == 0.5
+
+
+@pytest.mark.asyncio
+async def test_list_underlying_positions_keeps_us_when_hk_fails():
+    def get_positions(sec_type=None, market=None, account=None):
+        if market.name == "HK":
+            raise RuntimeError("hk down")
+        return [_stock_position("AAPL", 10)]
+
+    client = _make_client(trade_client=SimpleNamespace(get_positions=get_positions))
+
+    results = await client.list_underlying_positions("ACC")
+
+    assert [p.symbol for p in results] == ["AAPL"]
+    # 不完整的结果不缓存，下次调用重新回源
+    assert "underlying_positions:ACC" not in client._ttl_cache
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method,key", [
+    ("list_underlying_positions", "underlying_positions:ACC"),
+    ("list_option_positions", "option_positions:ACC"),
+])
+async def test_position_loader_failure_is_not_cached(fake_cache, method, key):
+    calls = 0
+
+    def get_positions(sec_type=None, market=None, account=None):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("tiger down")
+
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=get_positions),
+        quote_client=SimpleNamespace(get_option_briefs=lambda chunk: []),
+    )
+
+    assert await getattr(client, method)("ACC") == []
+    assert key not in client._ttl_cache
+    assert f"tiger:{key}" not in fake_cache.data
+
+    first_calls = calls
+    assert await getattr(client, method)("ACC") == []
+    assert calls > first_calls
+
+
+@pytest.mark.asyncio
+async def test_empty_position_book_is_cached(fake_cache):
+    calls = 0
+
+    def get_positions(sec_type=None, market=None, account=None):
+        nonlocal calls
+        calls += 1
+        return []
+
+    client = _make_client(trade_client=SimpleNamespace(get_positions=get_positions))
+
+    assert await client.list_underlying_positions("ACC") == []
+    assert await client.list_underlying_positions("ACC") == []
+    assert calls == 2  # US + HK 各一次，第二次命中缓存
+    assert "tiger:underlying_positions:ACC" in fake_cache.data
+
+
+@pytest.mark.asyncio
+async def test_dummy_snapshot_matches_individual_calls():
+    from app.broker.dummy_option_client import DummyOptionClient
+
+    broker = DummyOptionClient()
+    underlyings, options, equity = await broker.snapshot("ACC")
+
+    assert underlyings == await broker.list_underlying_positions("ACC")
+    assert options == await broker.list_option_positions("ACC")
+    assert equity == await broker.get_account_equity("ACC")
+
+
+@pytest.mark.asyncio
+async def test_account_id_memoized_until_invalidated():
+    calls = 0
+
+    def get_assets(account=None):
+        nonlocal calls
+        calls += 1
+        return SimpleNamespace(account="REAL123")
+
+    client = _make_client(trade_client=SimpleNamespace(get_assets=get_assets))
+
+    assert await client.get_account_id() == "REAL123"
+    assert await client.get_account_id() == "REAL123"
+    assert calls == 1
+
+    client.invalidate_account_id()
+    assert await client.get_account_id() == "REAL123"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_account_id_fallback_not_cached(fake_cache):
+    calls = 0
+
+    def get_assets(account=None):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("transient")
+        return SimpleNamespace(account="REAL123")
+
+    client = _make_client(trade_client=SimpleNamespace(get_assets=get_assets))
+
+    # 首次失败返回配置的账户名，但不缓存，下次调用立即重试
+    assert await client.get_account_id() == "TEST"
+    assert await client.get_account_id() == "REAL123"
+    assert await client.get_account_id() == "REAL123"
+    assert calls == 2
+    assert "account_id" not in client._ttl_cache and fake_cache.data == {}
+
+
+@pytest.mark.asyncio
+async def test_option_positions_shared_cache_round_trip(fake_cache):
+    positions = [SimpleNamespace(
+        contract=SimpleNamespace(
+            symbol="AAPL 250117C00100000", underlying="AAPL", right="CALL", strike=100,
+            expiry="2030-01-18", multiplier=100, currency="USD",
+        ),
+        quantity=2,
+        average_cost=1.0,
+        market_price=1.5,
+    )]
+    calls = 0
+
+    def get_positions(**kwargs):
+        nonlocal calls
+        calls += 1
+        return positions
+
+    quote_client = SimpleNamespace(get_option_briefs=lambda chunk: [])
+    first = _make_client(trade_client=SimpleNamespace(get_positions=get_positions), quote_client=quote_client)
+    loaded = await first.list_option_positions("ACC")
+
+    # 另一个进程内实例命中 Redis 共享层，结果与回源一致
+    second = _make_client(trade_client=SimpleNamespace(get_positions=get_positions), quote_client=quote_client)
+    assert await second.list_option_positions("ACC") == loaded
+    assert calls == 1
+
+    await second.list_option_positions("ACC", force_refresh=True)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hk_stock_name_cache_round_trip(fake_cache):
+    client = _make_client()
+
+    await client._set_hk_stock_names_to_cache({"00700": "腾讯控股", "09988": ""})
+    names = await client._get_hk_stock_names_from_cache(["00700", "09988", "03690"])
+
+    assert names == {"00700": "腾讯控股"}
+
+
+@pytest.mark.asyncio
+async def test_account_equity_prefers_summary_net_liquidation():
+    assets = [SimpleNamespace(summary=SimpleNamespace(net_liquidation=123456.0), equity_with_loan=1.0)]
+    client = _make_client(trade_client=SimpleNamespace(get_assets=lambda account=None: assets))
+
+    assert await client.get_account_equity("ACC") == 123456.0
+
+
+@pytest.mark.asyncio
+async def test_account_equity_falls_back_when_summary_missing():
+    assets = [SimpleNamespace(net_liquidation=float("inf"), equity_with_loan=99.0)]
+    client = _make_client(trade_client=SimpleNamespace(get_assets=lambda account=None: assets))
+
+    assert await client.get_account_equity("ACC") == 99.0
+
+
+@pytest.mark.asyncio
+async def test_fetch_hk_stock_names_falls_back_across_columns():
+    import pandas as pd
+
+    briefs = pd.DataFrame({
+        "symbol": ["00700", "09988", "03690", ""],
+        "nameCN": ["腾讯控股", "", None, "X"],
+        "name": ["TENCENT", "BABA-SW", None, "Y"],
+    })
+    client = _make_client(quote_client=SimpleNamespace(get_stock_briefs=lambda symbols: briefs))
+
+    names = await client._fetch_hk_stock_names(["00700", "09988", "03690"])
+
+    assert names == {"00700": "腾讯控股", "09988": "BABA-SW"}
+
+
+@pytest.mark.asyncio
+async def test_hk_stock_names_served_from_local_lru(fake_cache, monkeypatch):
+    monkeypatch.setattr(TigerOptionClient, "HK_NAME_LOCAL_CACHE_SIZE", 2)
+    client = _make_client()
+    fake_cache.data["hk_stock_name:00700"] = "腾讯控股"
+
+    assert await client._get_hk_stock_names_from_cache(["00700"]) == {"00700": "腾讯控股"}
+    # Redis 中的值被清掉后仍可从进程内 LRU 命中
+    fake_cache.data.clear()
+    assert await client._get_hk_stock_names_from_cache(["00700"]) == {"00700": "腾讯控股"}
+
+    await client._set_hk_stock_names_to_cache({"09988": "阿里巴巴", "03690": "美团"})
+    assert list(client._hk_name_local) == ["09988", "03690"]
+
+
+@pytest.mark.asyncio
+async def test_list_underlying_positions_hk_names_and_zero_quantity(fake_cache):
+    fake_cache.data["hk_stock_name:00700"] = "腾讯控股"
+    hk_positions = [
+        SimpleNamespace(
+            contract=SimpleNamespace(symbol="00700", currency="HKD", name=None, local_symbol=None),
+            quantity=100, average_cost=300.0, market_price=350.0,
+        ),
+        SimpleNamespace(
+            contract=SimpleNamespace(symbol="09988", currency="HKD", name=None, local_symbol=None),
+            quantity=0, average_cost=80.0, market_price=90.0,
+        ),
+    ]
+
+    def get_positions(sec_type=None, market=None, account=None):
+        return hk_positions if market.name == "HK" else []
+
+    client = _make_client(trade_client=SimpleNamespace(get_positions=get_positions))
+
+    results = await client.list_underlying_positions("ACC")
+
+    assert [(p.symbol, p.quantity, p.name) for p in results] == [("00700", 100, "腾讯控股")]
+
+
+@pytest.mark.asyncio
+async def test_hk_symbols_remembered_for_name_prefetch(fake_cache):
+    fake_cache.data["hk_stock_name:00700"] = "腾讯控股"
+    hk_positions = [SimpleNamespace(
+        contract=SimpleNamespace(symbol="00700", currency="HKD", name=None, local_symbol=None),
+        quantity=100, average_cost=300.0, market_price=350.0,
+    )]
+
+    def get_positions(sec_type=None, market=None, account=None):
+        return hk_positions if market.name == "HK" else []
+
+    client = _make_client(trade_client=SimpleNamespace(get_positions=get_positions))
+    await client.list_underlying_positions("ACC")
+    # 代码集合在后台写入
+    await asyncio.gather(*tiger_option_client._BACKGROUND_WRITES)
+
+    assert fake_cache.data["hk_last_symbols:ACC"] == ["00700"]
+    last_symbols, names = await client._prefetch_hk_stock_names("ACC")
+    assert last_symbols == ["00700"]
+    assert names == {"00700": "腾讯控股"}
+
+
+@pytest.mark.asyncio
+async def test_option_brief_request_deduplicates_symbols():
+    def option(symbol: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            contract=SimpleNamespace(
+                symbol=symbol, underlying="AAPL", right="CALL", strike=100,
+                expiry="2030-01-18", multiplier=100, currency="USD",
+            ),
+            quantity=1, average_cost=1.0, market_price=1.5,
+        )
+
+    requested = []
+
+    def get_option_briefs(chunk):
+        requested.extend(chunk)
+        return [SimpleNamespace(identifier=s, delta=0.5, gamma=0.0, vega=0.0, theta=0.0) for s in chunk]
+
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=lambda **kwargs: [option("A"), option("B"), option("A")]),
+        quote_client=SimpleNamespace(get_option_briefs=get_option_briefs),
+    )
+
+    results = await client.list_option_positions("ACC")
+
+    assert requested == ["A", "B"]
+    assert [p.greeks.delta for p in results] == [0.5, 0.5, 0.5]
+
+
+@pytest.mark.asyncio
+async def test_option_briefs_parsed_from_sdk_dataframe(monkeypatch):
+    import pandas as pd
+
+    def option(symbol: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            contract=SimpleNamespace(
+                symbol=symbol, underlying="AAPL", right="CALL", strike=100,
+                expiry="2030-01-18", multiplier=100, currency="USD",
+            ),
+            quantity=1, average_cost=1.0, market_price=1.5,
+        )
+
+    def get_option_briefs(chunk):
+        # tigeropen 返回 DataFrame；EMPTY 批次无数据，ODD 批次返回无法解析的结果
+        if chunk == ["EMPTY"]:
+            return pd.DataFrame()
+        if chunk == ["ODD"]:
+            return object()
+        return pd.DataFrame({
+            "identifier": chunk, "delta": [0.4] * len(chunk), "gamma": [0.02] * len(chunk),
+            "vega": [0.1] * len(chunk), "theta": [-0.05] * len(chunk),
+            "underlying_price": [190.0] * len(chunk), "latest_price": [2.5] * len(chunk),
+        })
+
+    monkeypatch.setattr(TigerOptionClient, "OPTION_BRIEF_CHUNK_SIZE", 1)
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=lambda **kwargs: [option("A"), option("EMPTY"), option("ODD")]),
+        quote_client=SimpleNamespace(get_option_briefs=get_option_briefs),
+    )
+
+    results = await client.list_option_positions("ACC")
+
+    # 空批次 / 解析失败的批次降级为默认 Greeks，不影响持仓本身
+    assert [p.contract.broker_symbol for p in results] == ["A", "EMPTY", "ODD"]
+    assert (results[0].greeks.delta, results[0].underlying_price, results[0].last_price) == (0.4, 190.0, 2.5)
+    assert results[1].greeks.delta == results[2].greeks.delta == 0
+
+
+@pytest.mark.asyncio
+async def test_option_brief_cache_evicts_stale_and_bounds_size(monkeypatch):
+    def get_option_briefs(chunk):
+        return [SimpleNamespace(identifier=s, delta=0.5) for s in chunk]
+
+    client = _make_client(quote_client=SimpleNamespace(get_option_briefs=get_option_briefs))
+    monkeypatch.setattr(TigerOptionClient, "OPTION_BRIEF_CACHE_SIZE", 3)
+    client._brief_cache["EXPIRED"] = (time.monotonic() - TigerOptionClient.OPTION_BRIEF_CACHE_TTL - 1, object())
+
+    await client._fetch_option_briefs(["A", "B"])
+    await client._fetch_option_briefs(["EXPIRED"])
+    assert "EXPIRED" in client._brief_cache and client._brief_cache["EXPIRED"][0] > time.monotonic() - 1
+
+    # A 命中后变为最近使用，超出容量时淘汰最久未用的 B
+    await client._fetch_option_briefs(["A"])
+    await client._fetch_option_briefs(["C", "D"])
+    assert list(client._brief_cache) == ["A", "C", "D"]
+
+
+@pytest.mark.asyncio
+async def test_expired_brief_dropped_when_refetch_fails():
+    def get_option_briefs(chunk):
+        raise RuntimeError("boom")
+
+    client = _make_client(quote_client=SimpleNamespace(get_option_briefs=get_option_briefs))
+    client._brief_cache["A"] = (time.monotonic() - TigerOptionClient.OPTION_BRIEF_CACHE_TTL - 1, object())
+
+    assert await client._fetch_option_briefs(["A"]) == {}
+    assert client._brief_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_hk_names_from_api_written_in_background(fake_cache):
+    import pandas as pd
+
+    hk_positions = [SimpleNamespace(
+        contract=SimpleNamespace(symbol="03690", currency="HKD", name=None, local_symbol=None),
+        quantity=10, average_cost=100.0, market_price=120.0,
+    )]
+
+    def get_positions(sec_type=None, market=None, account=None):
+        return hk_positions if market.name == "HK" else []
+
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=get_positions),
+        quote_client=SimpleNamespace(
+            get_stock_briefs=lambda symbols: pd.DataFrame({"symbol": ["03690"], "nameCN": ["美团"]})
+        ),
+    )
+
+    results = await client.list_underlying_positions("ACC")
+    assert results[0].name == "美团"
+
+    await asyncio.gather(*tiger_option_client._BACKGROUND_WRITES)
+    assert fake_cache.data["hk_stock_name:03690"] == "美团"
+
+
+@pytest.mark.asyncio
+async def test_place_order_reuses_cached_contract():
+    lookups = []
+
+    def get_contracts(symbol, sec_type):
+        lookups.append(symbol)
+        return [SimpleNamespace(symbol=symbol, tick_size=0.01)]
+
+    client = _make_client(trade_client=SimpleNamespace(
+        get_contracts=get_contracts,
+        place_order=lambda order: 123,
+    ))
+    params = {"symbol": "AAPL", "direction": "LONG", "quantity": 1, "price": 100.0}
+
+    first = await client.place_order("ACC", params)
+    second = await client.place_order("ACC", params)
+
+    assert first["success"] and second["success"]
+    assert lookups == ["AAPL"]
+
+
+@pytest.mark.asyncio
+async def test_unresolved_hk_names_cached_as_missing(fake_cache):
+    import pandas as pd
+
+    hk_positions = [SimpleNamespace(
+        contract=SimpleNamespace(symbol="08888", currency="HKD", name=None, local_symbol=None),
+        quantity=10, average_cost=1.0, market_price=1.0,
+    )]
+    brief_calls = []
+
+    def get_stock_briefs(symbols):
+        brief_calls.append(list(symbols))
+        return pd.DataFrame({"symbol": [], "nameCN": []})
+
+    def get_positions(sec_type=None, market=None, account=None):
+        return hk_positions if market.name == "HK" else []
+
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=get_positions),
+        quote_client=SimpleNamespace(get_stock_briefs=get_stock_briefs),
+    )
+
+    first = await client.list_underlying_positions("ACC")
+    await asyncio.gather(*tiger_option_client._BACKGROUND_WRITES)
+    second = await client.list_underlying_positions("ACC", force_refresh=True)
+
+    assert first[0].name is None and second[0].name is None
+    assert brief_calls == [["08888"]]
+
+
+@pytest.mark.asyncio
+async def test_option_briefs_prefetched_from_last_symbols():
+    positions = [SimpleNamespace(
+        contract=SimpleNamespace(
+            symbol="OPT1", underlying_symbol="AAPL", put_call="CALL", strike=100,
+            expiry="2030-01-18", multiplier=100, currency="USD",
+        ),
+        quantity=1, average_cost=1.0, market_price=1.5,
+    )]
+    brief_calls = []
+
+    def get_option_briefs(chunk):
+        brief_calls.append(list(chunk))
+        return [SimpleNamespace(identifier="OPT1", delta=0.5, gamma=0.01, vega=0.1, theta=-0.05)]
+
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=lambda **kwargs: positions),
+        quote_client=SimpleNamespace(get_option_briefs=get_option_briefs),
+    )
+
+    await client.list_option_positions("ACC")
+    assert brief_calls == [["OPT1"]]
+
+    # Greeks 缓存过期后刷新：预取与持仓请求并发，合约未变时不再单独请求
+    client._brief_cache.clear()
+    results = await client.list_option_positions("ACC", force_refresh=True)
+
+    assert brief_calls == [["OPT1"], ["OPT1"]]
+    assert results[0].greeks.delta == 0.5
+
+
+@pytest.mark.asyncio
+async def test_option_brief_prefetch_failure_does_not_fail_positions(fake_cache):
+    positions = [SimpleNamespace(
+        contract=SimpleNamespace(
+            symbol="OPT1", underlying_symbol="AAPL", put_call="CALL", strike=100,
+            expiry="2030-01-18", multiplier=100, currency="USD",
+        ),
+        quantity=1, average_cost=1.0, market_price=1.5,
+    )]
+    client = _make_client(
+        trade_client=SimpleNamespace(get_positions=lambda **kwargs: positions),
+        quote_client=SimpleNamespace(get_option_briefs=lambda chunk: [
+            SimpleNamespace(identifier="OPT1", delta=0.5, gamma=0.01, vega=0.1, theta=-0.05),
+        ]),
+    )
+    client._last_option_symbols["ACC"] = ["STALE"]
+    fetch = client._fetch_option_briefs
+
+    async def fetch_option_briefs(symbols):
+        if symbols == ["STALE"]:
+            raise RuntimeError("prefetch boom")
+        return await fetch(symbols)
+
+    client._fetch_option_briefs = fetch_option_briefs
+
+    results = await client.list_option_positions("ACC")
+
+    assert [p.contract.broker_symbol for p in results] == ["OPT1"]
+    assert results[0].greeks.delta == 0.5
+
+
+def test_extract_greeks_reads_prices_and_falls_back():
+    full = SimpleNamespace(delta=0.5, gamma=0.1, vega=0.2, theta=-0.1, underlying_price=150, latest_price=3.2)
+    greeks, underlying_price, last_price = tiger_option_client._extract_greeks(full, 1.0)
+    assert (greeks.delta, underlying_price, last_price) == (0.5, 150.0, 3.2)
+
+    partial = SimpleNamespace(delta=0.5, gamma=0.1, vega=0.2)
+    greeks, underlying_price, last_price = tiger_option_client._extract_greeks(partial, 1.0)
+    assert (greeks.theta, underlying_price, last_price) == (0.0, 0.0, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_place_order_aligns_limit_price_to_contract_tick():
+    submitted = []
+
+    def place_order(order):
+        submitted.append(order.limit_price)
+        return 1
+
+    client = _make_client(trade_client=SimpleNamespace(
+        get_contracts=lambda symbol, sec_type: [SimpleNamespace(symbol=symbol, min_tick="0.05")],
+        place_order=place_order,
+    ))
+
+    await client.place_order("ACC", {"symbol": "X", "direction": "LONG", "quantity": 1, "price": 10.07})
+    await client.place_order("ACC", {"symbol": "X", "direction": "SHORT", "quantity": 1, "price": 10.07})
+
+    assert submitted == [10.05, 10.1]
+
+
+@pytest.mark.asyncio
+async def test_get_order_status_matches_either_id_and_passes_since_ts():
+    from tigeropen.common.consts import OrderStatus
+
+    calls = []
+
+    def get_orders(**kwargs):
+        calls.append(kwargs)
+        return [
+            SimpleNamespace(id=1, order_id=11, status=OrderStatus.NEW),
+            SimpleNamespace(id=2, order_id=22, status=OrderStatus.FILLED, filled_quantity=5, avg_fill_price=9.5),
+        ]
+
+    client = _make_client(trade_client=SimpleNamespace(get_orders=get_orders))
+
+    by_id = await client.get_order_status("ACC", "2", since_ts=1700000000000)
+    by_order_id = await client.get_order_status("ACC", "22")
+    missing = await client.get_order_status("ACC", "3")
+
+    assert (by_id["status"], by_id["filled_quantity"]) == ("FILLED", 5.0)
+    assert by_order_id["status"] == "FILLED"
+    assert missing["status"] == "NOT_FOUND"
+    assert [c["start_time"] for c in calls] == [1700000000000, None, None]
+
+
+@pytest.mark.asyncio
+async def test_get_order_status_prefers_single_order_query():
+    from tigeropen.common.consts import OrderStatus
+
+    single_calls = []
+
+    def get_order(**kwargs):
+        single_calls.append(kwargs)
+        return SimpleNamespace(id=kwargs["id"], status=OrderStatus.REJECTED, reason="资金不足")
+
+    def get_orders(**kwargs):
+        raise AssertionError("should not list orders when the single-order query succeeds")
+
+    client = _make_client(trade_client=SimpleNamespace(get_order=get_order, get_orders=get_orders))
+
+    resp = await client.get_order_status("ACC", "123")
+
+    assert (resp["status"], resp["message"]) == ("REJECTED", "资金不足")
+    assert single_calls == [{"account": "ACC", "id": 123}]
+
+
+@pytest.mark.asyncio
+async def test_get_order_status_map_indexes_both_ids_with_one_request():
+    from tigeropen.common.consts import OrderStatus
+
+    calls = []
+
+    def get_orders(**kwargs):
+        calls.append(kwargs)
+        return [
+            SimpleNamespace(id=1, order_id=11, status=OrderStatus.NEW),
+            SimpleNamespace(id=2, order_id=None, status=OrderStatus.FILLED, filled_quantity=5, avg_fill_price=9.5),
+        ]
+
+    client = _make_client(trade_client=SimpleNamespace(get_orders=get_orders))
+
+    book = await client.get_order_status_map("ACC")
+
+    assert set(book) == {"1", "11", "2"}
+    assert book["11"]["status"] == "PENDING"
+    assert book["2"]["avg_fill_price"] == 9.5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_account_equity_skips_non_finite_values():
+    assets = [SimpleNamespace(
+        summary=SimpleNamespace(net_liquidation=float("nan")),
+        net_liquidation=float("-inf"), equity_with_loan=0, total_cash_balance=42.0,
+    )]
+    client = _make_client(trade_client=SimpleNamespace(get_assets=lambda account=None: assets))
+
+    assert await client.get_account_equity("ACC") == 42.0
+
+
+def test_align_to_tick_keeps_aligned_prices_and_rounds_others():
+    info = tiger_option_client._contract_info([SimpleNamespace(tick_size=0.01)])
+    align = tiger_option_client._align_to_tick
+
+    assert align(10.07, info, True) == 10.07
+    assert align(100, info, False) == 100.0
+    assert align(10.075, info, True) == 10.07
+    assert align(10.075, info, False) == 10.08
+    assert align(0.001, info, True) == 0.01
+
+
+@pytest.mark.asyncio
+async def test_place_order_uses_single_executor_hop(monkeypatch):
+    placed = []
+    client = _make_client(trade_client=SimpleNamespace(
+        get_contracts=lambda symbol, sec_type: [SimpleNamespace(symbol=symbol)] if symbol == "AAPL" else [],
+        place_order=lambda order: placed.append(order) or 7,
+    ))
+    hops = []
+    run = client._run_in_executor
+
+    async def counting_run(func, *args, **kwargs):
+        hops.append(func)
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(client, "_run_in_executor", counting_run)
+
+    ok = await client.place_order("ACC", {"symbol": "AAPL", "direction": "LONG", "quantity": 1, "price": 1.0})
+    missing = await client.place_order("ACC", {"symbol": "NOPE", "direction": "LONG", "quantity": 1, "price": 1.0})
+
+    assert ok["success"] and not missing["success"]
+    assert len(hops) == 2 and len(placed) == 1
+    assert list(client._contract_cache) == ["AAPL"]
+
+
+def test_index_option_briefs_detects_key_field():
+    import pandas as pd
+
+    by_symbol = pd.DataFrame({"symbol": ["A", None, "B"], "delta": [0.1, 0.2, 0.3]})
+    by_identifier = pd.DataFrame({"identifier": ["X"], "symbol": ["AAPL"], "delta": [0.5]})
+    objects = [SimpleNamespace(symbol="S1", delta=0.1), SimpleNamespace(symbol="", delta=0.2)]
+
+    assert {k: r.delta for k, r in tiger_option_client._index_option_briefs(by_symbol).items()} == {"A": 0.1, "B": 0.3}
+    # 同时存在两列时优先使用 identifier
+    assert list(tiger_option_client._index_option_briefs(by_identifier)) == ["X"]
+    assert list(tiger_option_client._index_option_briefs(objects)) == ["S1"]
+    assert tiger_option_client._index_option_briefs(pd.DataFrame({"delta": [0.1]})) == {}
+    assert tiger_option_client._index_option_briefs([]) == {}
@@ -0,0 +1,305 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.broker.dummy_trade_history_client import DummyTradeHistoryClient
+from app.broker.history_models import TradeRecord
+from app.broker.tiger_trade_history_client import TigerTradeHistoryClient
+
+
+# 所有用例都使用 conftest 中的内存缓存，不连接真实 Redis
+pytestmark = pytest.mark.usefixtures("fake_cache")
+
+
+@pytest.mark.asyncio
+async def test_dummy_stream_is_empty():
+    client = DummyTradeHistoryClient()
+    start = datetime(2024, 1, 1)
+    assert [t async for t in client.list_trades_stream("ACC", start, start + timedelta(days=30))] == []
+
+
+@pytest.mark.asyncio
+async def test_tiger_stream_pages_by_time_window():
+    windows = []
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            return []
+        windows.append((start_time, end_time))
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"),
+            action="BUY",
+            order_time=start_time,
+            filled=1,
+            avg_fill_price=100.0,
+            id=len(windows),
+        )]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    start = datetime(2024, 1, 1)
+    trades = [t async for t in client.list_trades_stream("ACC", start, start + timedelta(days=20))]
+
+    # 20 天按 7 天窗口切分为 3 次请求，窗口之间不重叠
+    assert len(windows) == 3
+    assert all(prev[1] < nxt[0] for prev, nxt in zip(windows, windows[1:]))
+    assert [t.order_id for t in trades] == ["1", "2", "3"]
+    assert trades == sorted(trades, key=lambda t: t.timestamp)
+
+
+@pytest.mark.asyncio
+async def test_tiger_stream_windows_are_aligned_and_cached(fake_cache):
+    windows = []
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            return []
+        windows.append((start_time, end_time))
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"), action="BUY", order_time=start_time,
+            filled=1, avg_fill_price=1.0, id=start_time,
+        )]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    start = datetime(2024, 1, 3, 9, 30)
+    first = [t async for t in client.list_trades_stream("ACC", start, start + timedelta(days=10))]
+    shifted = [t async for t in client.list_trades_stream(
+        "ACC", start + timedelta(days=1, hours=2), start + timedelta(days=11),
+    )]
+
+    # 窗口对齐到固定网格（2024-01-01 起每 7 天），起止时间平移后复用相同的缓存键
+    assert list(fake_cache.data) == [
+        "tiger_trades:ACC:2024-01-01:2024-01-07",
+        "tiger_trades:ACC:2024-01-08:2024-01-14",
+    ]
+    assert len(windows) == 2
+    # 网格起点早于查询起点的成交被裁剪掉
+    assert [t.timestamp for t in first] == [datetime(2024, 1, 8)]
+    assert shifted == first
+
+
+@pytest.mark.asyncio
+async def test_tiger_list_trades_merges_stock_and_option_fills():
+    def order(symbol, order_time, order_id):
+        return SimpleNamespace(
+            contract=SimpleNamespace(symbol=symbol), action="BUY", order_time=order_time,
+            filled=1, avg_fill_price=1.0, id=order_id,
+        )
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            return [order("AAPL 240119C00100000", start_time + 2, 2)]
+        return [order("AAPL", start_time + 3, 3), order("MSFT", start_time + 1, 1)]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    start = datetime(2024, 1, 1)
+    trades = await client.list_trades("ACC", start, start + timedelta(days=1))
+
+    assert [t.order_id for t in trades] == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_tiger_list_trades_keeps_stock_fills_when_option_query_fails():
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            raise RuntimeError("permission denied")
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"), action="SELL", order_time=start_time,
+            filled=2, avg_fill_price=10.0, id=9,
+        )]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    start = datetime(2024, 1, 1)
+    trades = await client.list_trades("ACC", start, start + timedelta(days=1))
+
+    assert [(t.symbol, t.side) for t in trades] == [("AAPL", "SELL")]
+
+
+@pytest.mark.asyncio
+async def test_tiger_list_trades_served_from_cache(fake_cache):
+    calls = []
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        calls.append(sec_type.name)
+        if sec_type.name == "OPT":
+            return []
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"), action="BUY", order_time=start_time,
+            filled=1, avg_fill_price=100.0, id=1, realized_pnl=2.5,
+        )]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    start = datetime(2024, 1, 1)
+    first = await client.list_trades("ACC", start, start + timedelta(days=1))
+    second = await client.list_trades("ACC", start, start + timedelta(days=1))
+
+    assert second == first and first[0].realized_pnl == 2.5
+    assert len(calls) == 2
+    # 已结束的区间按一天缓存
+    assert list(fake_cache.expires.values()) == [24 * 3600]
+
+
+def test_to_trade_record_filters_unfilled_and_reads_all_fields():
+    full = SimpleNamespace(
+        contract=SimpleNamespace(symbol="AAPL"), action="sell", order_time=1704067200000,
+        filled=3, avg_fill_price=10.0, realized_pnl=1, id=42,
+    )
+    unfilled = SimpleNamespace(contract=SimpleNamespace(symbol="AAPL"), filled=0, avg_fill_price=10.0)
+    no_contract = SimpleNamespace(contract=None, filled=1, avg_fill_price=1.0)
+
+    tr = TigerTradeHistoryClient._to_trade_record(full)
+
+    assert (tr.side, tr.quantity, tr.realized_pnl, tr.order_id) == ("SELL", 3.0, 1.0, "42")
+    assert tr.timestamp == datetime.fromtimestamp(1704067200)
+    assert TigerTradeHistoryClient._to_trade_record(unfilled) is None
+    assert TigerTradeHistoryClient._to_trade_record(no_contract) is None
+
+
+@pytest.mark.asyncio
+async def test_tiger_list_trades_only_refetches_today_for_rolling_window(fake_cache):
+    windows = []
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "STK":
+            windows.append((start_time, end_time))
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol=sec_type.name), action="BUY", order_time=start_time,
+            filled=1, avg_fill_price=1.0, id=start_time,
+        )] if sec_type.name == "STK" else []
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    start = today - timedelta(days=3)
+    first = await client.list_trades("ACC", start, today + timedelta(hours=1))
+    second = await client.list_trades("ACC", start, today + timedelta(hours=2))
+
+    today_ms = int(today.timestamp() * 1000)
+    # 今天之前的部分只查询一次；今天的部分使用固定键 + 短 TTL，轮询期间不换键；两段不重叠
+    assert [w for w in windows if w[0] < today_ms] == [(int(start.timestamp() * 1000), today_ms - 1)]
+    assert len([w for w in windows if w[0] == today_ms]) == 1
+    assert sorted(fake_cache.expires.values()) == [60, 24 * 3600]
+    assert [t.timestamp for t in second] == sorted(t.timestamp for t in second)
+    assert len(first) == len(second) == 2
+
+
+@pytest.mark.asyncio
+async def test_tiger_list_trades_cache_key_ignores_time_of_day(fake_cache):
+    windows = []
+
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            return []
+        windows.append((start_time, end_time))
+        day = datetime(2024, 1, 1)
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"), action="BUY",
+            order_time=int((day + timedelta(hours=h)).timestamp() * 1000),
+            filled=1, avg_fill_price=1.0, id=h,
+        ) for h in (1, 12, 47)]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    first = await client.list_trades("ACC", datetime(2024, 1, 1, 9, 30), datetime(2024, 1, 2, 23, 0))
+    second = await client.list_trades("ACC", datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 2, 10, 15, 7))
+
+    # 同一组自然日只回源一次，回源区间对齐到整天，结果按各自的 [start, end] 裁剪
+    assert list(fake_cache.data) == ["tiger_trades:ACC:2024-01-01:2024-01-02"]
+    assert windows == [(
+        int(datetime(2024, 1, 1).timestamp() * 1000),
+        int(datetime(2024, 1, 3).timestamp() * 1000) - 1,
+    )]
+    assert [t.order_id for t in first] == ["12", "47"]
+    assert [t.order_id for t in second] == ["1", "12"]
+
+
+@pytest.mark.asyncio
+async def test_tiger_stream_raises_when_a_window_fails():
+    def get_filled_orders(account, sec_type, market, start_time, end_time):
+        if sec_type.name == "OPT":
+            return []
+        if start_time > int(datetime(2024, 1, 7).timestamp() * 1000):
+            raise RuntimeError("window boom")
+        return [SimpleNamespace(
+            contract=SimpleNamespace(symbol="AAPL"), action="BUY", order_time=start_time,
+            filled=1, avg_fill_price=1.0, id=1,
+        )]
+
+    client = TigerTradeHistoryClient.__new__(TigerTradeHistoryClient)
+    client.trade_client = SimpleNamespace(get_filled_orders=get_filled_orders)
+
+    received = []
+    with pytest.raises(RuntimeError, match="window boom"):
+        async for tr in client.list_trades_stream("ACC", datetime(2024, 1, 1), datetime(2024, 1, 20)):
+            received.append(tr)
+    # 失败前的窗口已产出，但失败不会被静默吞掉
+    assert [t.order_id for t in received] == ["1"]
+
+
+class _StreamingHistoryClient:
+    def __init__(self, trades, error=None):
+        self.trades = trades
+        self.error = error
+
+    async def list_trades(self, account_id, start, end):
+        raise AssertionError("aggregating callers should consume the stream")
+
+    async def list_trades_stream(self, account_id, start, end):
+        for tr in self.trades:
+            yield tr
+        if self.error is not None:
+            raise self.error
+
+
+def _behavior_service(history_client):
+    from app.services.behavior_scoring_service import BehaviorScoringService
+
+    service = BehaviorScoringService.__new__(BehaviorScoringService)
+    service.history_client = history_client
+    service.session = SimpleNamespace(commits=0)
+
+    async def commit():
+        service.session.commits += 1
+
+    service.session.commit = commit
+    service.upserted = []
+
+    async def upsert(account_id, window_days, metrics):
+        service.upserted.append(metrics.symbol)
+
+    service._upsert_stats_row = upsert
+    return service
+
+
+def _trade(symbol, day, side="BUY"):
+    return TradeRecord(symbol, side, 1.0, 100.0, datetime(2024, 1, day), None, f"{symbol}{day}")
+
+
+@pytest.mark.asyncio
+async def test_behavior_scoring_consumes_trade_stream():
+    service = _behavior_service(_StreamingHistoryClient([_trade("AAPL", 1), _trade("MSFT", 2), _trade("AAPL", 3, "SELL")]))
+
+    metrics = await service.run_for_account("ACC", as_of=datetime(2024, 1, 10))
+
+    assert {s: m.trade_count for s, m in metrics.items()} == {"AAPL": 2, "MSFT": 1}
+    assert service.upserted == ["AAPL", "MSFT"] and service.session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_behavior_scoring_skips_persisting_truncated_stream():
+    service = _behavior_service(_StreamingHistoryClient([_trade("AAPL", 1)], error=RuntimeError("boom")))
+
+    assert await service.run_for_account("ACC", as_of=datetime(2024, 1, 10)) == {}
+    assert service.upserted == [] and service.session.commits == 0